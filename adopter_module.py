@@ -39,7 +39,7 @@ class AdopterListWidget(BaseListWidget):
             "    background-color: #d3d3d3;"
             "    color: #a9a9a9;"
             "}"
-            "QTableWidget {"
+            "QTableView {"
             "    gridline-color: transparent;"
             "    background-color: #fffefe;"  # Cor de fundo da tabela
             "    border: 2px solid #eef1f6;"
@@ -122,63 +122,34 @@ class AdopterListWidget(BaseListWidget):
     def get_column_mapping(self):
         return self.column_mapping_local
 
-    def build_record_query(self, count_only=False):
-        base = "SELECT "
-        if count_only:
-            base += "COUNT(*)"
-        else:
-            base += "adopters.id, persons.name, persons.phone, persons.cpf, adopters.created_at"
-        base += " FROM adopters JOIN persons ON adopters.person_id = persons.id"
-
-        conditions = []
-        if self.filter_field and self.filter_value:
-            field = self.filter_field
-            value = self.filter_value
-            if field == "adopters.id":
-                if value.isdigit():
-                    conditions.append("adopters.id = {}".format(int(value)))
-                else:
-                    conditions.append("CAST(adopters.id AS TEXT) LIKE '%{}%'".format(value))
-            else:
-                conditions.append(f"{field} LIKE '%{value}%'")
+    def get_text_search_sources(self):
+        # Nome e endereço da pessoa
+        return [("persons_fts", "persons.id")]
 
-        if conditions:
-            base += " WHERE " + " AND ".join(conditions)
+    def get_count_table(self):
+        # Todo adotante tem sua pessoa (pessoas nunca são excluídas)
+        return "adopters"
+
+    def build_record_query(self, count_only=False):
+        query = self.new_query(
+            "adopters.id, persons.name, persons.phone, persons.cpf, adopters.created_at"
+            # Indica se há adoções associadas (habilita/desabilita o Deletar sem consultas por linha)
+            ", EXISTS (SELECT 1 FROM adoptions WHERE adoptions.adopter_id = adopters.id)",
+            "adopters JOIN persons ON adopters.person_id = persons.id")
+        self.apply_search_filter(query)
 
         if not count_only:
             if self.order_by_column is None:
                 self.order_by_column = "adopters.id"
-            base += f" ORDER BY {self.order_by_column} {self.order_direction}"
-            base += f" LIMIT {self.page_size} OFFSET {self.current_page * self.page_size}"
-
-        return base
-
-    def add_actions_to_row(self, row_idx, row_data):
-        adopter_id = row_data[0]
-
-        details_button = QPushButton("Detalhes")
-        details_button.clicked.connect(lambda checked, aid=adopter_id: self.show_details(aid))
-        self.table.setCellWidget(row_idx, 5, details_button)
-
-        edit_button = QPushButton("Editar")
-        edit_button.clicked.connect(lambda checked, aid=adopter_id: self.edit_record(aid))
-        self.table.setCellWidget(row_idx, 6, edit_button)
-
-        delete_button = QPushButton("Deletar")
-        delete_button.clicked.connect(lambda checked, aid=adopter_id: self.delete_action(aid))
-        self.table.setCellWidget(row_idx, 7, delete_button)
-
-        # Verificar se o adotante possui adoções associadas
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM adoptions WHERE adopter_id = ?', (adopter_id,))
-        count = cursor.fetchone()[0]
-        conn.close()
+            self.apply_page(query)
 
-        # Se houver adoções associadas, desabilita o botão Deletar
-        if count > 0:
-            delete_button.setEnabled(False)
+        return query.build(count_only)
 
+    def get_row_actions(self, row_data):
+        # row_data[5] indica se o adotante possui adoções associadas;
+        # se houver, desabilita o botão Deletar
+        has_adoptions = row_data[5]
+        return [("Detalhes", True), ("Editar", True), ("Deletar", not has_adoptions)]
 
     def delete_action(self, record_id):
         reply = QMessageBox.question(
@@ -211,7 +182,7 @@ class AdopterListWidget(BaseListWidget):
 
             conn.commit()
             conn.close()
-            self.load_data()
+            self.records_changed()
         
     def initFormFields(self, form_layout):
         self.person_locked = False
@@ -531,7 +502,6 @@ class AdopterListWidget(BaseListWidget):
 
         conn.commit()
         conn.close()
-        self.load_data()
         self.stacked_layout.setCurrentWidget(self.table_widget)
 
     def update_record(self, record_id, data):
@@ -571,7 +541,6 @@ class AdopterListWidget(BaseListWidget):
         conn.commit()
         conn.close()
 
-        self.load_data()
         self.stacked_layout.setCurrentWidget(self.table_widget)
 
     def load_record(self, record_id):
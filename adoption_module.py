@@ -36,7 +36,7 @@ class AdoptionListWidget(BaseListWidget):
             "    background-color: #d3d3d3;"
             "    color: #a9a9a9;"
             "}"
-            "QTableWidget {"
+            "QTableView {"
             "    gridline-color: transparent;"
             "    background-color: #fffefe;"  # Cor de fundo da tabela
             "    border: 2px solid #eef1f6;"
@@ -128,61 +128,27 @@ class AdoptionListWidget(BaseListWidget):
         }
     
     def build_record_query(self, count_only=False):
-        base = "SELECT "
-        if count_only:
-            base += "COUNT(*)"
-        else:
-            base += "adoptions.id, persons.name, animals.name, adoptions.date, adoptions.status, adoptions.created_at, animals.id"
-        base += " FROM adoptions"
-        base += " JOIN adopters ON adoptions.adopter_id = adopters.id"
-        base += " JOIN persons ON adopters.person_id = persons.id"
-        base += " JOIN animals ON adoptions.animal_id = animals.id"
-
-        conditions = []
-        if self.filter_field and self.filter_value:
-            field = self.filter_field
-            value = self.filter_value
-            
-            if field == "adoptions.id":
-                if value.isdigit():
-                    conditions.append("adoptions.id = {}".format(int(value)))
-                else:
-                    conditions.append("CAST(adoptions.id AS TEXT) LIKE '%{}%'".format(value))
-            elif field == "adoptions.status":
-                conditions.append("adoptions.status LIKE '%{}%'".format(value))
-            elif field == "adoptions.date":
-                conditions.append("adoptions.date LIKE '%{}%'".format(value))
-            elif field == "adopters.name":
-                field = "persons.name"
-            elif field == "animals.name":
-                conditions.append("animals.name LIKE '%{}%'".format(value))
-
-        if conditions:
-            base += " WHERE " + " AND ".join(conditions)
+        query = self.new_query(
+            "adoptions.id, persons.name, animals.name, adoptions.date, adoptions.status, adoptions.created_at, animals.id",
+            "adoptions"
+            " JOIN adopters ON adoptions.adopter_id = adopters.id"
+            " JOIN persons ON adopters.person_id = persons.id"
+            " JOIN animals ON adoptions.animal_id = animals.id")
+        self.apply_search_filter(query)
 
         if not count_only:
             if self.order_by_column is None:
                 self.order_by_column = "adoptions.id"
-            base += f" ORDER BY {self.order_by_column} {self.order_direction}"
-            base += f" LIMIT {self.page_size} OFFSET {self.current_page * self.page_size}"
-
-        return base
-
-    def add_actions_to_row(self, row_idx, row_data):
-        adoption_id = row_data[0]
-        animal_id = row_data[6]
-        details_button = QPushButton("Detalhes")
-        details_button.clicked.connect(lambda checked, aid=adoption_id: self.show_details(aid))
-        self.table.setCellWidget(row_idx, 6, details_button)
+            self.apply_page(query)
 
-        edit_button = QPushButton("Editar")
-        edit_button.clicked.connect(lambda checked, aid=adoption_id: self.edit_record(aid))
-        self.table.setCellWidget(row_idx, 7, edit_button)
-
-        delete_button = QPushButton("Deletar")
-        delete_button.clicked.connect(lambda checked, aid=adoption_id, anid=animal_id: self.delete_action(aid, anid))
-        self.table.setCellWidget(row_idx, 8, delete_button)
+        return query.build(count_only)
 
+    def run_row_action(self, action, row_data):
+        if action == "Deletar":
+            # A exclusão também precisa do animal (row_data[6]) para liberá-lo
+            self.delete_action(row_data[0], row_data[6])
+        else:
+            super().run_row_action(action, row_data)
 
     def delete_action(self, adoption_id, animal_id):
         reply = QMessageBox.question(
@@ -192,7 +158,7 @@ class AdoptionListWidget(BaseListWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.delete_record((adoption_id, animal_id))
-            self.load_data()
+            self.records_changed()
 
     def initFormFields(self, form_layout):
         self.adopter_input = QLineEdit()
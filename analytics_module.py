@@ -5,13 +5,31 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QDate
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from database import create_connection
+from database import rollup_totals, time_series
+from query_worker import QueryRunner
+from base_list_widget import duration_stats
+from collections import deque
 from datetime import datetime
+import time
 import matplotlib.dates as mdates
 
+# Granularidade -> (rótulo, rótulo do eixo X, largura da barra em dias, formato das datas no eixo)
+GRANULARITIES = {
+    "day": ("Dia", "Dia", 0.8, "%Y-%m-%d"),
+    "week": ("Semana", "Semana", 5, "%Y-%m-%d"),
+    "month": ("Mês", "Mês", 20, "%Y-%m"),
+    "year": ("Ano", "Ano", 300, "%Y"),
+}
+
+# Tempos de desenho do gráfico mantidos para a tela de diagnóstico
+DRAW_TIME_SAMPLES = 100
+
 class AnalyticsWidget(QWidget):
     def __init__(self):
         super().__init__()
+        # As consultas dos gráficos rodam fora da thread da interface; uma nova análise cancela a anterior
+        self.query_runner = QueryRunner(self)
+        self.draw_times = deque(maxlen=DRAW_TIME_SAMPLES)  # segundos de cada canvas.draw()
         self.initUI()
         self.set_styles()
 
@@ -138,6 +156,14 @@ class AnalyticsWidget(QWidget):
         self.end_date_edit.setDisplayFormat("yyyy-MM-dd")
         self.date_filter_layout.addWidget(self.end_date_edit)
 
+        self.date_filter_layout.addWidget(QLabel("Agrupar por:"))
+        self.granularity_combo = QComboBox()
+        for key, (label, _, _, _) in GRANULARITIES.items():
+            self.granularity_combo.addItem(label, key)
+        self.granularity_combo.setCurrentIndex(self.granularity_combo.findData("month"))
+        self.granularity_combo.currentIndexChanged.connect(self.refresh_current_analysis)
+        self.date_filter_layout.addWidget(self.granularity_combo)
+
         self.apply_date_filter_button = QPushButton("Aplicar Filtro")
         self.apply_date_filter_button.clicked.connect(self.refresh_current_analysis)
         self.date_filter_layout.addWidget(self.apply_date_filter_button)
@@ -187,7 +213,7 @@ class AnalyticsWidget(QWidget):
 
     def update_analysis(self, index):
         self.figure.clear()
-        self.canvas.draw()
+        self.draw_canvas()
         self.stats_label.setText("")
 
         # Resetar visibilidade dos filtros
@@ -257,115 +283,101 @@ class AnalyticsWidget(QWidget):
         elif index == 5:
             self.show_new_volunteers()
         else:
+            self.query_runner.cancel()
             self.figure.clear()
-            self.canvas.draw()
+            self.draw_canvas()
             self.stats_label.setText("")
 
-    def show_adoptions_over_time(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+    def draw_canvas(self):
+        started = time.perf_counter()
+        self.canvas.draw()
+        self.draw_times.append(time.perf_counter() - started)
+
+    def draw_time_stats(self):
+        """Tempo de desenho do gráfico pelo matplotlib, em milissegundos."""
+        return duration_stats(self.draw_times)
 
+    def run_query(self, job, render):
+        """Executa job(conn) no QThreadPool e chama render(resultado) na thread da interface."""
+        self.stats_label.setText("Carregando...")
+        self.query_runner.submit(job, render, self.show_query_error)
+
+    def show_query_error(self, message):
+        self.stats_label.setText("")
+        QMessageBox.critical(self, "Erro", f"Erro ao carregar a análise: {message}")
+
+    def show_time_series(self, metric, render):
+        """Consulta a série agregada por período (uma linha por período); mês e ano vêm dos agregados mensais."""
         start_date, end_date = self.get_date_range()
+        granularity = self.granularity_combo.currentData()
+        self.run_query(lambda conn: time_series(conn.cursor(), metric, granularity, start_date, end_date),
+                       lambda rows: render(rows, granularity))
 
-        conn = create_connection()
-        cursor = conn.cursor()
-        query = 'SELECT date FROM adoptions'
-        params = []
-        if start_date and end_date:
-            query += ' WHERE date BETWEEN ? AND ?'
-            params = [start_date, end_date]
-        print(f"Executing Query for Adoptions: {query} with params {params}")  # Debug
-        cursor.execute(query, params)
-        dates = cursor.fetchall()
-        conn.close()
-
-        print(f"Number of Adoptions Fetched: {len(dates)}")  # Debug
-
-        if not dates:
-            ax.text(0.5, 0.5, "Nenhuma adoção encontrada no período selecionado", ha='center', va='center', fontsize=12)
-            self.canvas.draw()
-            self.stats_label.setText("Total de Adoções: 0")
+    def render_time_series(self, rows, granularity, title, ylabel, color, empty_message, line=False):
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+
+        if not rows:
+            ax.text(0.5, 0.5, empty_message, ha='center', va='center', fontsize=12)
+            self.draw_canvas()
             return
 
-        date_counts = {}
-        for date_tuple in dates:
-            date_str = date_tuple[0]
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
-                # Tentar outro formato se necessário
-                print(f"Invalid date format for Adoptions: {date_str}")  # Debug
-                continue
-            # Usar o primeiro dia do mês para representar o mês
-            month_dt = datetime(date_obj.year, date_obj.month, 1)
-            date_counts[month_dt] = date_counts.get(month_dt, 0) + 1
-
-        months = sorted(date_counts.keys())
-        counts = [date_counts[month] for month in months]
+        _, xlabel, bar_width, date_format = GRANULARITIES[granularity]
+        periods = [datetime.strptime(bucket, "%Y-%m-%d") for bucket, _ in rows]
+        values = [value for _, value in rows]
 
         # Converter datas para números para o matplotlib
-        months_num = mdates.date2num(months)
+        periods_num = mdates.date2num(periods)
 
-        ax.bar(months_num, counts, width=20, color='skyblue')  # width=20 dias para cada barra
-        ax.set_title("Adoções ao longo do tempo")
-        ax.set_xlabel("Mês")
-        ax.set_ylabel("Número de Adoções")
+        if line:
+            ax.plot(periods_num, values, marker='o', linestyle='-', color=color)
+        else:
+            ax.bar(periods_num, values, width=bar_width, color=color)  # largura em dias
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
         ax.tick_params(axis='x', rotation=45)
 
         # Melhorar o formato do eixo X para datas
         ax.xaxis_date()
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter(date_format))
 
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.draw_canvas()
+
+    def show_adoptions_over_time(self):
+        self.show_time_series("adoptions", self.render_adoptions_over_time)
 
-        total_adoptions = sum(counts)
+    def render_adoptions_over_time(self, rows, granularity):
+        self.render_time_series(rows, granularity, "Adoções ao longo do tempo", "Número de Adoções", 'skyblue',
+                                "Nenhuma adoção encontrada no período selecionado")
+        total_adoptions = sum(count for _, count in rows)
         self.stats_label.setText(f"Total de Adoções: {total_adoptions}")
 
     def show_animals_in_shelter(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-
         filter_type = self.extra_filter_combo.currentText() if self.extra_filter_widget.isVisible() else "Todos"
         status_filter = self.status_filter_combo.currentText() if self.status_filter_widget.isVisible() else "Não Adotado"
         start_date, end_date = self.get_date_range()
 
-        conn = create_connection()
-        cursor = conn.cursor()
-        params = []
-        query = '''
-            SELECT type, COUNT(*) as c FROM animals
-            WHERE 1=1
-        '''
-
-        # Aplicar filtro de status
-        if status_filter != "Todos":
-            query += ' AND status = ?'
-            params.append(status_filter)
-        else:
-            # Se "Todos", incluir ambos adotados e não adotados
-            pass  # Nenhum filtro aplicado
-
-        # Aplicar filtro de tipo de animal
-        if filter_type != "Todos":
-            query += ' AND type = ?'
-            params.append(filter_type)
+        # "Todos" não filtra; os demais valores filtram pela coluna correspondente
+        type_value = None if filter_type == "Todos" else filter_type
+        status_value = None if status_filter == "Todos" else status_filter
 
-        # Aplicar filtro de data usando DATE(created_at)
-        if start_date and end_date:
-            query += ' AND DATE(created_at) BETWEEN ? AND ?'
-            params.extend([start_date, end_date])
+        def job(conn):
+            totals = rollup_totals(conn.cursor(), "animals", start_date, end_date, group_by="type",
+                                   type=type_value, status=status_value)
+            # (tipo, quantidade) em ordem decrescente de quantidade, mais o total com o filtro aplicado
+            data = sorted(((animal_type, count) for animal_type, (count, _) in totals.items()),
+                          key=lambda row: row[1], reverse=True)
+            return data, sum(count for _, count in data)
 
-        query += '''
-            GROUP BY type
-            ORDER BY c DESC
-        '''
-        print(f"Executing Query for Animals in Shelter: {query} with params {params}")  # Debug
-        cursor.execute(query, params)
-        data = cursor.fetchall()
+        self.run_query(job, lambda result: self.render_animals_in_shelter(result, status_filter))
 
-        print(f"Number of Animals Fetched: {len(data)}")  # Debug
+    def render_animals_in_shelter(self, result, status_filter):
+        data, total_animals = result
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
 
         if len(data) == 0:
             ax.text(0.5, 0.5, "Nenhum animal encontrado para esse filtro", ha='center', va='center', fontsize=12)
@@ -381,238 +393,33 @@ class AnalyticsWidget(QWidget):
             ax.tick_params(axis='x', rotation=45)
 
         self.figure.tight_layout()
-        self.canvas.draw()
-
-        # Total de animais com o filtro aplicado
-        query_total = 'SELECT COUNT(*) FROM animals WHERE 1=1'
-        params_total = []
-
-        if status_filter != "Todos":
-            query_total += ' AND status = ?'
-            params_total.append(status_filter)
-
-        if filter_type != "Todos":
-            query_total += ' AND type = ?'
-            params_total.append(filter_type)
-
-        if start_date and end_date:
-            query_total += ' AND DATE(created_at) BETWEEN ? AND ?'
-            params_total.extend([start_date, end_date])
-
-        print(f"Executing Query for Total Animals: {query_total} with params {params_total}")  # Debug
-        cursor.execute(query_total, params_total)
-        total_animals = cursor.fetchone()[0]
-        conn.close()
-
-        print(f"Total Animals in Shelter: {total_animals}")  # Debug
+        self.draw_canvas()
 
         self.stats_label.setText(f"Total de Animais no Abrigo ({status_filter}): {total_animals}")
 
     def show_donations_over_time(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-
-        start_date, end_date = self.get_date_range()
-
-        conn = create_connection()
-        cursor = conn.cursor()
-        query = 'SELECT date, amount FROM donations'
-        params = []
-        if start_date and end_date:
-            query += ' WHERE DATE(date) BETWEEN ? AND ?'
-            params = [start_date, end_date]
-        print(f"Executing Query for Donations: {query} with params {params}")  # Debug
-        cursor.execute(query, params)
-        data = cursor.fetchall()
-        conn.close()
-
-        print(f"Number of Donations Fetched: {len(data)}")  # Debug
-
-        if not data:
-            ax.text(0.5, 0.5, "Nenhuma doação encontrada no período selecionado", ha='center', va='center', fontsize=12)
-            self.canvas.draw()
-            self.stats_label.setText("Total de Doações: R$ 0.00")
-            return
-
-        date_sums = {}
-        for date_str, amount in data:
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
-                # Tentar outro formato se necessário
-                print(f"Invalid date format for Donations: {date_str}")  # Debug
-                continue
-            # Usar o primeiro dia do mês para representar o mês
-            month_dt = datetime(date_obj.year, date_obj.month, 1)
-            date_sums[month_dt] = date_sums.get(month_dt, 0) + amount
-
-        months = sorted(date_sums.keys())
-        sums = [date_sums[month] for month in months]
-
-        # Converter datas para números para o matplotlib
-        months_num = mdates.date2num(months)
-
-        ax.plot(months_num, sums, marker='o', linestyle='-', color='green')
-        ax.set_title("Doações ao longo do tempo")
-        ax.set_xlabel("Mês")
-        ax.set_ylabel("Valor das Doações (R$)")
-        ax.tick_params(axis='x', rotation=45)
-
-        # Melhorar o formato do eixo X para datas
-        ax.xaxis_date()
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
+        self.show_time_series("donations", self.render_donations_over_time)
 
-        self.figure.tight_layout()
-        self.canvas.draw()
-
-        total_donations = sum(sums)
+    def render_donations_over_time(self, rows, granularity):
+        self.render_time_series(rows, granularity, "Doações ao longo do tempo", "Valor das Doações (R$)", 'green',
+                                "Nenhuma doação encontrada no período selecionado", line=True)
+        total_donations = sum(amount or 0 for _, amount in rows)
         self.stats_label.setText(f"Total de Doações: R$ {total_donations:.2f}")
 
     def show_new_adopters(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        self.show_time_series("adopters", self.render_new_adopters)
 
-        start_date, end_date = self.get_date_range()
-
-        conn = create_connection()
-        cursor = conn.cursor()
-        
-        # Query para novos adotantes usando a tabela 'adopters'
-        query_adopters = '''
-            SELECT created_at FROM adopters
-        '''
-        params_adopters = []
-        if start_date and end_date:
-            query_adopters += ' WHERE DATE(created_at) BETWEEN ? AND ?'
-            params_adopters = [start_date, end_date]
-        print(f"Executing Query for New Adopters: {query_adopters} with params {params_adopters}")  # Debug
-        cursor.execute(query_adopters, params_adopters)
-        adopters_dates = cursor.fetchall()
-        conn.close()
-
-        print(f"Number of New Adopters Fetched: {len(adopters_dates)}")  # Debug
-
-        # Prepare data para plotagem
-        date_counts_adopters = {}
-        for date_tuple in adopters_dates:
-            date_str = date_tuple[0]
-            if not date_str:
-                continue
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                except ValueError:
-                    print(f"Invalid date format for Adopters: {date_str}")  # Debug
-                    continue  # Ignorar datas mal formatadas
-            # Usar o primeiro dia do mês para representar o mês
-            month_dt = datetime(date_obj.year, date_obj.month, 1)
-            date_counts_adopters[month_dt] = date_counts_adopters.get(month_dt, 0) + 1
-
-        months = sorted(date_counts_adopters.keys())
-        adopters_counts = [date_counts_adopters[month] for month in months]
-
-        print(f"Months with New Adopters: {months}")  # Debug
-        print(f"Counts of New Adopters per Month: {adopters_counts}")  # Debug
-
-        if not months:
-            ax.text(0.5, 0.5, "Nenhum novo adotante encontrado no período selecionado", ha='center', va='center', fontsize=12)
-            self.canvas.draw()
-            self.stats_label.setText("Total de Novos Adotantes: 0")
-            return
-
-        # Converter datas para números para o matplotlib
-        months_num = mdates.date2num(months)
-
-        ax.bar(months_num, adopters_counts, width=20, color='blue')  # width=20 dias para cada barra
-        ax.set_title("Novos Adotantes ao longo do tempo")
-        ax.set_xlabel("Mês")
-        ax.set_ylabel("Número de Adotantes")
-        ax.tick_params(axis='x', rotation=45)
-
-        # Melhorar o formato do eixo X para datas
-        ax.xaxis_date()
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-
-        self.figure.tight_layout()
-        self.canvas.draw()
-
-        total_adopters = sum(adopters_counts)
+    def render_new_adopters(self, rows, granularity):
+        self.render_time_series(rows, granularity, "Novos Adotantes ao longo do tempo", "Número de Adotantes", 'blue',
+                                "Nenhum novo adotante encontrado no período selecionado")
+        total_adopters = sum(count for _, count in rows)
         self.stats_label.setText(f"Total de Novos Adotantes: {total_adopters}")
 
     def show_new_volunteers(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-
-        start_date, end_date = self.get_date_range()
-
-        conn = create_connection()
-        cursor = conn.cursor()
-        
-        # Query para novos voluntários usando a tabela 'volunteers'
-        query_volunteers = '''
-            SELECT created_at FROM volunteers
-        '''
-        params_volunteers = []
-        if start_date and end_date:
-            query_volunteers += ' WHERE DATE(created_at) BETWEEN ? AND ?'
-            params_volunteers = [start_date, end_date]
-        print(f"Executing Query for New Volunteers: {query_volunteers} with params {params_volunteers}")  # Debug
-        cursor.execute(query_volunteers, params_volunteers)
-        volunteers_dates = cursor.fetchall()
-        conn.close()
-
-        print(f"Number of New Volunteers Fetched: {len(volunteers_dates)}")  # Debug
-
-        # Prepare data para plotagem
-        date_counts_volunteers = {}
-        for date_tuple in volunteers_dates:
-            date_str = date_tuple[0]
-            if not date_str:
-                continue
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                except ValueError:
-                    print(f"Invalid date format for Volunteers: {date_str}")  # Debug
-                    continue  # Ignorar datas mal formatadas
-            # Usar o primeiro dia do mês para representar o mês
-            month_dt = datetime(date_obj.year, date_obj.month, 1)
-            date_counts_volunteers[month_dt] = date_counts_volunteers.get(month_dt, 0) + 1
-
-        months = sorted(date_counts_volunteers.keys())
-        volunteers_counts = [date_counts_volunteers[month] for month in months]
-
-        print(f"Months with New Volunteers: {months}")  # Debug
-        print(f"Counts of New Volunteers per Month: {volunteers_counts}")  # Debug
-
-        if not months:
-            ax.text(0.5, 0.5, "Nenhum novo voluntário encontrado no período selecionado", ha='center', va='center', fontsize=12)
-            self.canvas.draw()
-            self.stats_label.setText("Total de Novos Voluntários: 0")
-            return
-
-        # Converter datas para números para o matplotlib
-        months_num = mdates.date2num(months)
-
-        ax.bar(months_num, volunteers_counts, width=20, color='green')  # width=20 dias para cada barra
-        ax.set_title("Novos Voluntários ao longo do tempo")
-        ax.set_xlabel("Mês")
-        ax.set_ylabel("Número de Voluntários")
-        ax.tick_params(axis='x', rotation=45)
-
-        # Melhorar o formato do eixo X para datas
-        ax.xaxis_date()
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
-
-        self.figure.tight_layout()
-        self.canvas.draw()
+        self.show_time_series("volunteers", self.render_new_volunteers)
 
-        total_volunteers = sum(volunteers_counts)
+    def render_new_volunteers(self, rows, granularity):
+        self.render_time_series(rows, granularity, "Novos Voluntários ao longo do tempo", "Número de Voluntários", 'green',
+                                "Nenhum novo voluntário encontrado no período selecionado")
+        total_volunteers = sum(count for _, count in rows)
         self.stats_label.setText(f"Total de Novos Voluntários: {total_volunteers}")
@@ -1,6 +1,5 @@
-from math import ceil
 from base_list_widget import BaseListWidget
-from PyQt6.QtWidgets import QLineEdit, QCheckBox, QTextEdit, QComboBox, QPushButton, QMessageBox, QWidget, QVBoxLayout, QFormLayout, QTableWidgetItem
+from PyQt6.QtWidgets import QLineEdit, QCheckBox, QTextEdit, QComboBox, QPushButton, QMessageBox, QWidget, QVBoxLayout, QFormLayout
 from PyQt6.QtCore import Qt
 from datetime import datetime
 from database import create_connection
@@ -19,6 +18,7 @@ class AnimalListWidget(BaseListWidget):
         }
         super().__init__()
         self.order_by_column = "animals.id"
+        self.column_alignment = {0: Qt.AlignmentFlag.AlignCenter}
         self.initDetailsUI()
         self.set_styles()
 
@@ -42,7 +42,7 @@ class AnimalListWidget(BaseListWidget):
             "    background-color: #d3d3d3;"
             "    color: #a9a9a9;"
             "}"
-            "QTableWidget {"
+            "QTableView {"
             "    gridline-color: transparent;"
             "    background-color: #fffefe;"  # Cor de fundo da tabela
             "    border: 2px solid #eef1f6;"
@@ -123,6 +123,13 @@ class AnimalListWidget(BaseListWidget):
     def get_column_mapping(self):
         return self.column_mapping_local
 
+    def get_text_search_sources(self):
+        # Nome, raça e descrição
+        return [("animals_fts", "animals.id")]
+
+    def get_count_table(self):
+        return "animals"
+
     def init_search_fields(self):
         self.search_field_combo.addItem("ID", "animals.id")
         self.search_field_combo.addItem("Nome", "animals.name")
@@ -131,106 +138,27 @@ class AnimalListWidget(BaseListWidget):
         self.search_field_combo.addItem("Status", "animals.status")
 
     def build_record_query(self, count_only=False):
-        base = "SELECT "
-        if count_only:
-            base += "COUNT(*)"
-        else:
-            base += "animals.id, animals.name, animals.type, animals.breed, animals.vaccinated, animals.neutered, animals.status, animals.created_at"
-        base += " FROM animals"
-
-        conditions = []
-        if self.filter_field and self.filter_value:
-            field = self.filter_field
-            value = self.filter_value
-            if field == "animals.id":
-                if value.isdigit():
-                    conditions.append("animals.id = {}".format(int(value)))
-                else:
-                    conditions.append("CAST(animals.id AS TEXT) LIKE '%{}%'".format(value))
-            else:
-                conditions.append(f"{field} LIKE '%{value}%'")
-
-        if conditions:
-            base += " WHERE " + " AND ".join(conditions)
+        query = self.new_query(
+            "animals.id, animals.name, animals.type, animals.breed, animals.vaccinated, animals.neutered, animals.status, animals.created_at",
+            "animals")
+        self.apply_search_filter(query)
 
         if not count_only:
             if self.order_by_column is None:
                 self.order_by_column = "animals.id"
-            base += f" ORDER BY {self.order_by_column} {self.order_direction}"
-            base += f" LIMIT {self.page_size} OFFSET {self.current_page * self.page_size}"
+            self.apply_page(query)
 
-        return base
-
-    def load_data(self):
-        conn = create_connection()
-        cursor = conn.cursor()
-
-        # Consulta para contar o total de registros
-        count_query = self.build_record_query(count_only=True)
-        cursor.execute(count_query)
-        total_records = cursor.fetchone()[0]
-
-        if total_records == 0:
-            self.total_pages = 0
-        else:
-            self.total_pages = ceil(total_records / self.page_size)
-
-        if self.total_pages == 0:
-            # Sem registros
-            self.table.setRowCount(0)
-            self.update_pagination_bar()
-            self.update_current_page_label()
-            conn.close()
-            return
+        return query.build(count_only)
 
-        if self.current_page >= self.total_pages:
-            self.current_page = self.total_pages - 1
+    def format_cell(self, row_data, column):
+        # Convertendo vacinado/castrado para "Sim/Não"
+        if column in (4, 5):
+            return "Sim" if row_data[column] else "Não"
+        return str(row_data[column])
 
-        # Consulta para obter os registros da página atual
-        query = self.build_record_query(count_only=False)
-        cursor.execute(query)
-        records = cursor.fetchall()
-        conn.close()
-
-        self.table.setRowCount(len(records))
-        for row_idx, row_data in enumerate(records):
-            # Convertendo vacinado/castrado para "Sim/Não"
-            row_list = list(row_data)
-            row_list[4] = "Sim" if row_data[4] else "Não"
-            row_list[5] = "Sim" if row_data[5] else "Não"
-
-            for col_idx, value in enumerate(row_list):
-                if col_idx < 8:  # Apenas as colunas de dados, antes dos botões
-                    item = QTableWidgetItem(str(value))
-                    if col_idx == 0:
-                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.table.setItem(row_idx, col_idx, item)
-
-            # Adiciona os botões de ação
-            self.add_actions_to_row(row_idx, row_list)
-
-        self.update_pagination_bar()
-        self.update_current_page_label()
-
-    def add_actions_to_row(self, row_idx, row_data):
-        # row_data agora já é transformado, com row_data[0] = id do animal
-        animal_id = row_data[0]
+    def get_row_actions(self, row_data):
         animal_status = row_data[6]  # status está no index 6
-
-        details_button = QPushButton("Detalhes")
-        details_button.clicked.connect(lambda checked, aid=animal_id: self.show_details(aid))
-        self.table.setCellWidget(row_idx, 8, details_button)
-
-        edit_button = QPushButton("Editar")
-        edit_button.clicked.connect(lambda checked, aid=animal_id: self.edit_record(aid))
-        self.table.setCellWidget(row_idx, 9, edit_button)
-
-        delete_button = QPushButton("Deletar")
-        delete_button.clicked.connect(lambda checked, aid=animal_id: self.delete_action(aid))
-        self.table.setCellWidget(row_idx, 10, delete_button)
-
-        if animal_status == 'Adotado':
-            delete_button.setEnabled(False)
+        return [("Detalhes", True), ("Editar", True), ("Deletar", animal_status != 'Adotado')]
 
     def delete_action(self, record_id):
         reply = QMessageBox.question(
@@ -240,7 +168,7 @@ class AnimalListWidget(BaseListWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.delete_record(record_id)
-            self.load_data()
+            self.records_changed()
 
     def initFormFields(self, form_layout):
         self.name_input = QLineEdit()
@@ -347,7 +275,6 @@ class AnimalListWidget(BaseListWidget):
         conn.commit()
         conn.close()
 
-        self.load_data()
         self.stacked_layout.setCurrentWidget(self.table_widget)
 
     def update_record(self, record_id, data):
@@ -366,7 +293,6 @@ class AnimalListWidget(BaseListWidget):
         conn.commit()
         conn.close()
 
-        self.load_data()
         self.stacked_layout.setCurrentWidget(self.table_widget)
 
     def delete_record(self, record_id):
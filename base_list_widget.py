@@ -1,10 +1,430 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton,
-    QTableWidget, QTableWidgetItem, QMessageBox, QStackedLayout, QFormLayout, QSizePolicy
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QCheckBox,
+    QTableView, QMessageBox, QStackedLayout, QFormLayout, QSizePolicy,
+    QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QTimer
+from collections import OrderedDict, deque
 from math import ceil
-from database import create_connection
+import re
+import string
+import sys
+import time
+from database import data_generation, fts_available, indexed_columns, not_null_columns, table_count
+from query_worker import QueryRunner, fetch_all, fetch_count
+
+ROW_ACTIONS = ("Detalhes", "Editar", "Deletar")
+ActionEnabledRole = Qt.ItemDataRole.UserRole + 1
+
+def escape_like(value):
+    """Escapa %, _ e \\ para que o termo digitado seja buscado literalmente no LIKE."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def like_contains(text, term):
+    """Equivalente em Python de text LIKE '%term%' com o termo escapado por escape_like():
+    como no SQLite, só as letras ASCII ignoram maiúsculas/minúsculas."""
+    return term.translate(_ASCII_LOWER) in text.translate(_ASCII_LOWER)
+
+def fts_query(text):
+    """Converte o texto digitado em consulta FTS5: cada palavra vira um prefixo ("gat"*),
+    todas obrigatórias. Retorna None se não houver palavras."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+class QueryBuilder:
+    """Monta as consultas das listagens com marcadores (?) e a lista de parâmetros.
+
+    O texto do SQL só depende da forma da consulta (filtro, ordenação, tipo de página),
+    nunca dos valores digitados, então o cache de statements do sqlite3 reaproveita o plano
+    entre as páginas. Colunas de filtro e ordenação precisam estar em allowed_columns."""
+
+    def __init__(self, select, source, allowed_columns):
+        self.select = select
+        self.source = source
+        self.allowed_columns = set(allowed_columns)
+        self.conditions = []
+        self.params = []
+        self.order = []
+        self.order_params = []
+        self.limit_params = []
+        self.limit_clause = ""
+        self.count_limit = None  # Se definido, a contagem para em count_limit linhas
+        self.seek_condition = None  # (condição, parâmetros) da busca pela chave da página
+        self.continuation = None  # (condição, parâmetros) das linhas lidas depois das do seek
+
+    def column(self, name):
+        if name not in self.allowed_columns:
+            raise ValueError(f"Coluna não permitida na consulta: {name}")
+        return name
+
+    def where(self, condition, *params):
+        self.conditions.append(condition)
+        self.params.extend(params)
+        return self
+
+    def where_equals(self, column, value):
+        return self.where(f"{self.column(column)} = ?", value)
+
+    def where_like(self, column, value, cast_text=False):
+        expression = self.column(column)
+        if cast_text:
+            expression = f"CAST({expression} AS TEXT)"
+        return self.where(f"{expression} LIKE ? ESCAPE '\\'", f"%{escape_like(value)}%")
+
+    def order_by(self, column, direction="ASC"):
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"Direção de ordenação inválida: {direction}")
+        self.order.append(f"{self.column(column)} {direction}")
+        return self
+
+    def order_by_expression(self, expression, *params):
+        # Expressões montadas internamente (ex.: relevância da busca textual), fora da lista de colunas
+        self.order.append(expression)
+        self.order_params.extend(params)
+        return self
+
+    def seek(self, condition, params, continuation=None):
+        """Condição de busca pela chave da página (ignorada na contagem).
+
+        continuation=(condição, parâmetros) descreve as linhas que, na ordenação, vêm depois
+        de todas as que satisfazem condition (p.ex. os NULLs, que o SQLite ordena antes de
+        qualquer valor). A página lê primeiro as linhas de condition e completa o LIMIT com
+        as de continuation; cada parte continua uma busca por índice."""
+        self.seek_condition = (condition, list(params))
+        self.continuation = continuation
+        return self
+
+    def limit(self, limit, offset=None):
+        if offset is None:
+            self.limit_clause = " LIMIT ?"
+            self.limit_params = [limit]
+        else:
+            self.limit_clause = " LIMIT ? OFFSET ?"
+            self.limit_params = [limit, offset]
+        return self
+
+    def build(self, count_only=False):
+        """Retorna (sql, parâmetros). Na contagem, ordenação, busca pela chave e LIMIT são ignorados."""
+        if not count_only and self.seek_condition is not None:
+            if self.continuation is None:
+                return self.build_part(self.seek_condition)
+            # UNION ALL devolve as linhas da primeira parte antes das da segunda; o LIMIT
+            # externo para a leitura assim que a página fica completa
+            head, head_params = self.build_part(self.seek_condition)
+            tail, tail_params = self.build_part(self.continuation)
+            return (f"SELECT * FROM ({head}) UNION ALL SELECT * FROM ({tail}){self.limit_clause}",
+                    head_params + tail_params + list(self.limit_params))
+        return self.build_part(None, count_only)
+
+    def build_part(self, extra_condition, count_only=False):
+        sql = "SELECT " + ("COUNT(*)" if count_only else self.select) + " FROM " + self.source
+        conditions = list(self.conditions)
+        params = list(self.params)
+        if extra_condition is not None:
+            conditions.append(extra_condition[0])
+            params.extend(extra_condition[1])
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if count_only and self.count_limit is not None:
+            # Contagem limitada: lê no máximo count_limit linhas
+            sql = f"SELECT COUNT(*) FROM (SELECT 1 FROM {self.source}"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " LIMIT ?)"
+            params.append(self.count_limit)
+        if not count_only:
+            if self.order:
+                sql += " ORDER BY " + ", ".join(self.order)
+                params.extend(self.order_params)
+            sql += self.limit_clause
+            params.extend(self.limit_params)
+        return sql, params
+
+# Memória máxima (estimada) das páginas guardadas pelo cache compartilhado das listagens
+PAGE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+class PageCache:
+    """Cache LRU das páginas das listagens, compartilhado entre as telas.
+
+    A chave identifica listagem, filtro, ordenação e página; cada entrada guarda a geração
+    dos dados (database.data_generation) em que foi lida, o total de registros e as linhas.
+    Entradas de outra geração são descartadas na leitura. O tamanho é estimado com
+    sys.getsizeof e as páginas menos usadas saem quando max_bytes é ultrapassado."""
+
+    def __init__(self, max_bytes=PAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # chave -> (geração, total de registros, linhas, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evictions = 0
+
+    @staticmethod
+    def estimate_size(records):
+        return sys.getsizeof(records) + sum(
+            sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record) for record in records)
+
+    def get(self, key, generation):
+        """(total de registros, linhas) da página, ou None se não estiver no cache para esta geração."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], list(entry[2])
+
+    def contains(self, key, generation):
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] == generation
+
+    def put(self, key, generation, total_records, records, prefetched=False):
+        size = self.estimate_size(records)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (generation, total_records, tuple(records), size)
+        self.bytes += size
+        if prefetched:
+            self.prefetched += 1
+        self.evict()
+
+    def evict(self):
+        while self.bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def invalidate(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry[3]
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "prefetched": self.prefetched,
+            "evictions": self.evictions,
+        }
+
+shared_page_cache = PageCache()
+
+class CountCache:
+    """Totais de registros por listagem e filtro, válidos enquanto a geração dos dados não mudar."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # chave -> (geração, total)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, generation):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, generation, total):
+        self._entries[key] = (generation, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+shared_count_cache = CountCache()
+
+# Páginas além da atual lidas pela contagem limitada: com mais registros que isso, a barra de
+# paginação mostra "pelo menos N páginas" até a contagem exata terminar em segundo plano
+COUNT_ESTIMATE_PAGES = 5
+
+# Busca instantânea: espera após a última tecla antes de consultar, maior resultado guardado
+# inteiro em memória (para paginar e refinar sem o banco) e amostras de latência mantidas
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_RESULT_LIMIT = 1000
+SEARCH_LATENCY_SAMPLES = 200
+# Tempos de fill_table mantidos para a tela de diagnóstico
+RENDER_TIME_SAMPLES = 200
+
+def duration_stats(samples):
+    """Resumo de durações em segundos: {samples, mean_ms, p95_ms, max_ms}."""
+    samples = sorted(samples)
+    if not samples:
+        return {"samples": 0}
+    return {
+        "samples": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+class RecordTableModel(QAbstractTableModel):
+    """Modelo das listagens: guarda apenas as tuplas vindas do banco e busca mais
+    linhas sob demanda (canFetchMore/fetchMore) quando a rolagem contínua está ativa.
+    As colunas de ação não têm widgets; são desenhadas pelo ActionButtonDelegate."""
+
+    def __init__(self, owner, headers, data_column_count):
+        super().__init__(owner)
+        self.owner = owner
+        self.headers = headers
+        self.data_column_count = data_column_count
+        self.records = []
+        self.row_actions = []  # por linha: [(texto, habilitado)]
+        self.has_more = False
+        self.fetching = False  # Bloco seguinte já pedido ao QueryRunner
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column < self.data_column_count:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self.owner.format_cell(self.records[row], column)
+            if role == Qt.ItemDataRole.TextAlignmentRole and column in self.owner.column_alignment:
+                return self.owner.column_alignment[column]
+            return None
+
+        actions = self.row_actions[row]
+        action_index = column - self.data_column_count
+        if action_index >= len(actions):
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return actions[action_index][0]
+        if role == ActionEnabledRole:
+            return actions[action_index][1]
+        return None
+
+    def set_records(self, records, has_more=False):
+        self.beginResetModel()
+        self.records = list(records)
+        self.row_actions = [self.owner.get_row_actions(record) for record in self.records]
+        self.has_more = has_more
+        self.fetching = False
+        self.endResetModel()
+
+    def clear(self):
+        self.set_records([])
+
+    def last_record(self):
+        return self.records[-1] if self.records else None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.fetching:
+            return
+        # As linhas chegam depois, em append_records()
+        self.fetching = True
+        self.owner.fetch_next_batch()
+
+    def append_records(self, records, has_more):
+        self.fetching = False
+        self.has_more = has_more
+        if not records:
+            return
+        first = len(self.records)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.records.extend(records)
+        self.row_actions.extend(self.owner.get_row_actions(record) for record in records)
+        self.endInsertRows()
+
+    def trigger_action(self, row, column):
+        if row >= len(self.records):
+            return
+        actions = self.row_actions[row]
+        action_index = column - self.data_column_count
+        if 0 <= action_index < len(actions) and actions[action_index][1]:
+            self.owner.run_row_action(actions[action_index][0], self.records[row])
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Desenha os botões Detalhes/Editar/Deletar de todas as linhas com um único delegate."""
+
+    def __init__(self, data_column_count, parent=None):
+        super().__init__(parent)
+        self.data_column_count = data_column_count
+
+    def paint(self, painter, option, index):
+        if index.column() < self.data_column_count:
+            super().paint(painter, option, index)
+            return
+        text = index.data()
+        if not text:
+            return
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 2, -4, -2)
+        button.text = text
+        button.state = QStyle.StateFlag.State_Raised
+        enabled = bool(index.data(ActionEnabledRole))
+        if enabled:
+            button.state |= QStyle.StateFlag.State_Enabled
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        painter.save()
+        if not enabled:
+            # A folha de estilo não distingue o estado do botão desenhado; esmaece manualmente
+            painter.setOpacity(0.35)
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if index.column() >= self.data_column_count:
+            if (event.type() == QEvent.Type.MouseButtonRelease
+                    and event.button() == Qt.MouseButton.LeftButton
+                    and option.rect.contains(event.position().toPoint())):
+                row, column = index.row(), index.column()
+                # Executa fora do tratamento do evento: a ação pode recarregar o modelo
+                QTimer.singleShot(0, lambda: model.trigger_action(row, column))
+            return True
+        return super().editorEvent(event, model, option, index)
+
 
 class BaseListWidget(QWidget):
     def __init__(self):
@@ -15,7 +435,48 @@ class BaseListWidget(QWidget):
         self.order_direction = "ASC"
         self.filter_field = None
         self.filter_value = None
+        # Busca textual (FTS5): filter_value é procurado em todos os campos de texto,
+        # ordenando por relevância até que o usuário escolha uma coluna
+        self.text_search = False
+        self.rank_order = False
         self.total_pages = 0
+        self.total_records = 0
+        # Paginação "keyset" busca a página a partir da chave (ordenação, id) da página vizinha;
+        # "offset" mantém o LIMIT/OFFSET tradicional.
+        self.pagination_mode = "keyset"
+        self.page_bounds = {}  # página -> ((valor, id) da primeira linha, (valor, id) da última linha)
+        self.page_bounds_signature = None
+        self.seek = None
+        self.continuous_scroll = False
+        self.column_alignment = {}  # coluna -> Qt.AlignmentFlag
+        # Geração dos dados (database.data_generation) da carga em andamento e da exibida na
+        # tabela; refresh_if_stale() só consulta o banco se a geração mudou desde então
+        self.loading_generation = None
+        self.loaded_generation = None
+        self.restore_scroll = None  # Posição da rolagem a recuperar após uma atualização
+        # Consultas da listagem rodam no QThreadPool; query_runner.asynchronous = False as executa na hora
+        self.query_runner = QueryRunner(self)
+        # Páginas já lidas (de qualquer listagem) e busca antecipada das páginas vizinhas,
+        # com um executor próprio para não cancelar a carga da página exibida
+        self.page_cache = shared_page_cache
+        self.prefetch_pages = True
+        self.prefetch_runner = QueryRunner(self)
+        # Totais por filtro; sem total conhecido, uma contagem limitada libera a página e a
+        # exata roda em count_runner. total_is_estimate indica que total_records é um mínimo
+        self.count_cache = shared_count_cache
+        self.count_runner = QueryRunner(self)
+        self.count_limit = None
+        self.total_is_estimate = False
+        # Busca instantânea: cada tecla reinicia search_timer e a busca roda quando a digitação
+        # para. search_results guarda (chave, linhas) do último resultado completo, refinado em
+        # memória enquanto o termo só cresce. search_latencies: segundos de cada tecla até a
+        # exibição do resultado que a inclui
+        self.incremental_search = False
+        self.search_results = None
+        self.pending_keystrokes = []
+        self.searching_keystrokes = []
+        self.search_latencies = deque(maxlen=SEARCH_LATENCY_SAMPLES)
+        self.render_times = deque(maxlen=RENDER_TIME_SAMPLES)  # segundos de cada fill_table
         self.initUI()
         self.set_styles()
 
@@ -39,7 +500,7 @@ class BaseListWidget(QWidget):
             "    background-color: #d3d3d3;"
             "    color: #a9a9a9;"
             "}"
-            "QTableWidget {"
+            "QTableView {"
             "    gridline-color: transparent;"
             "    background-color: #fffefe;"  # Cor de fundo da tabela
             "    border: 2px solid #eef1f6;"
@@ -141,6 +602,7 @@ class BaseListWidget(QWidget):
         raise NotImplementedError("Subclasse deve implementar initEditFormFields().")
 
     def build_record_query(self, count_only=False):
+        # Deve retornar (sql, parâmetros), normalmente via QueryBuilder.build()
         raise NotImplementedError("Subclasse deve implementar build_record_query().")
 
     def save_record(self, data):
@@ -155,6 +617,11 @@ class BaseListWidget(QWidget):
     def load_record(self, record_id):
         raise NotImplementedError("Subclasse deve implementar load_record().")
 
+    def get_text_search_sources(self):
+        """[(tabela FTS, coluna cujo valor é o rowid na tabela FTS)] usadas pela busca textual.
+        Lista vazia (padrão) esconde a opção."""
+        return []
+
     def validate_data(self, data):
         # Pode ser sobrescrito, se não sobrescrever, considera sempre válido
         return True, ""
@@ -180,6 +647,25 @@ class BaseListWidget(QWidget):
         self.search_input.setPlaceholderText("Digite o termo de pesquisa...")
         top_layout.addWidget(self.search_input)
 
+        self.text_search_checkbox = QCheckBox("Busca textual")
+        self.text_search_checkbox.setToolTip("Procura as palavras em todos os campos de texto, por relevância")
+        self.text_search_checkbox.toggled.connect(self.search_field_combo.setDisabled)
+        self.text_search_checkbox.setVisible(bool(self.get_text_search_sources()) and fts_available())
+        top_layout.addWidget(self.text_search_checkbox)
+
+        self.incremental_checkbox = QCheckBox("Busca instantânea")
+        self.incremental_checkbox.setToolTip("Filtra enquanto você digita")
+        self.incremental_checkbox.toggled.connect(self.set_incremental_search)
+        top_layout.addWidget(self.incremental_checkbox)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_incremental_search)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        self.search_field_combo.currentIndexChanged.connect(self.on_search_options_changed)
+        self.text_search_checkbox.toggled.connect(self.on_search_options_changed)
+
         search_button = QPushButton("Buscar")
         search_button.clicked.connect(self.apply_filter)
         top_layout.addWidget(search_button)
@@ -192,10 +678,12 @@ class BaseListWidget(QWidget):
         main_layout.addLayout(top_layout)
 
         # Tabela
-        self.table = QTableWidget()
+        self.table = QTableView()
         headers = self.get_table_headers()
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        data_column_count = len(self.get_column_mapping())
+        self.model = RecordTableModel(self, headers, data_column_count)
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(ActionButtonDelegate(data_column_count, self.table))
         header = self.table.horizontalHeader()
         header.sectionClicked.connect(self.header_clicked)
         main_layout.addWidget(self.table)
@@ -248,6 +736,10 @@ class BaseListWidget(QWidget):
         goto_button.setMaximumWidth(50)
         goto_layout.addWidget(goto_button)
 
+        self.scroll_checkbox = QCheckBox("Rolagem contínua")
+        self.scroll_checkbox.toggled.connect(self.set_continuous_scroll)
+        goto_layout.addWidget(self.scroll_checkbox)
+
         main_layout.addLayout(goto_layout)
 
         # Página atual
@@ -255,8 +747,18 @@ class BaseListWidget(QWidget):
         current_page_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.current_page_label = QLabel("Página atual: 0 de 0")
         current_page_layout.addWidget(self.current_page_label)
+        self.loading_label = QLabel("Carregando...")
+        self.loading_label.setStyleSheet("color: #9ba3b2;")
+        self.loading_label.setVisible(False)
+        current_page_layout.addWidget(self.loading_label)
         main_layout.addLayout(current_page_layout)
 
+        self.loading_timer = QTimer(self)
+        self.loading_timer.setSingleShot(True)
+        self.loading_timer.setInterval(150)
+        self.loading_timer.timeout.connect(lambda: self.loading_label.setVisible(True))
+        self.query_runner.busy_changed.connect(self.set_loading)
+
         # Botão Novo Cadastro
         self.new_button = QPushButton(self.get_new_button_text())
         self.new_button.setStyleSheet("font-weight: bold; background-color: #ADD8E6; padding: 5px; margin-top: 10px;")
@@ -315,56 +817,565 @@ class BaseListWidget(QWidget):
         layout.addLayout(button_layout)
         self.edit_form_widget.setLayout(layout)
 
+    def refresh_if_stale(self):
+        """Recarrega a listagem só se os dados mudaram desde a última carga, mantendo página,
+        ordenação, filtro e rolagem. Retorna True se uma nova carga foi iniciada."""
+        generation = data_generation()
+        if self.query_runner.is_busy() and self.loading_generation == generation:
+            return False  # A carga em andamento já reflete os dados atuais
+        if not self.query_runner.is_busy() and self.loaded_generation == generation:
+            return False
+        self.restore_scroll = self.table.verticalScrollBar().value()
+        # Os limites guardados das páginas são da geração anterior
+        self.reset_page_bounds()
+        self.load_data()
+        return True
+
     def load_data(self):
-        conn = create_connection()
-        cursor = conn.cursor()
-        # Conta total de registros
-        count_query = self.build_record_query(count_only=True)
-        cursor.execute(count_query)
-        total_records = cursor.fetchone()[0]
+        # Lida antes das consultas: uma escrita concorrente deixa a carga marcada como antiga
+        self.loading_generation = data_generation()
+        self.loaded_generation = None
+        self.prefetch_runner.cancel()
+        self.count_runner.cancel()
+        if self.continuous_scroll:
+            self.load_scroll_data()
+            return
+
+        if self.search_results is not None and self.search_results[0] == self.search_results_key():
+            # Resultado da busca instantânea em memória: pagina sem consultar o banco
+            self.query_runner.cancel()
+            self.show_search_results()
+            return
 
+        cached = self.page_cache.get(self.page_cache_key(), self.loading_generation)
+        if cached is not None:
+            self.query_runner.cancel()
+            total_records, records = cached
+            self.total_is_estimate = False
+            self.set_total_records(total_records)
+            self.show_page(records)
+            return
+
+        # Total já conhecido para este filtro: busca só a página
+        total_records = self.count_cache.get(self.count_cache_key(), self.loading_generation)
+        if total_records is not None:
+            self.query_runner.cancel()
+            self.on_count_loaded(total_records)
+            return
+
+        count_query, count_params = self.build_record_query(count_only=True)
+        count_table = self.get_count_table()
+        if count_table is not None and not self.filter_value:
+            # Sem filtro: total mantido pelos gatilhos em table_counts, sem percorrer a tabela
+            def job(conn):
+                cursor = conn.cursor()
+                total = table_count(cursor, count_table)
+                if total is None:
+                    cursor.execute(count_query, count_params)
+                    total = cursor.fetchone()[0]
+                return total
+            self.query_runner.submit(job, self.on_count_loaded, self.on_query_error)
+            return
+
+        # Contagem limitada a algumas páginas além da atual; se bater no limite, a página é
+        # exibida com o mínimo de páginas e a contagem exata segue em segundo plano
+        limit = (self.current_page + 1 + COUNT_ESTIMATE_PAGES) * self.page_size
+        self.count_limit = limit
+        try:
+            limited_query, limited_params = self.build_record_query(count_only=True)
+        finally:
+            self.count_limit = None
+        self.query_runner.submit(
+            fetch_count(limited_query, limited_params),
+            lambda total: self.on_count_loaded(total, estimated=total >= limit), self.on_query_error)
+
+    def count_cache_key(self):
+        return (type(self).__name__, self.filter_field, self.filter_value, self.text_search)
+
+    def get_count_table(self):
+        """Tabela cujo contador (table_counts) é o total da listagem sem filtro, ou None.
+        Só vale se toda linha da tabela aparecer exatamente uma vez na listagem."""
+        return None
+
+    def page_cache_key(self, page=None):
+        """Chave da página no cache: listagem, filtro, ordenação, tamanho e número da página."""
+        return (type(self).__name__, self.filter_field, self.filter_value, self.text_search, self.rank_order,
+                self.order_by_column, self.order_direction, self.page_size,
+                self.current_page if page is None else page)
+
+    def set_total_records(self, total_records):
+        self.total_records = total_records
         if total_records == 0:
             self.total_pages = 0
         else:
             self.total_pages = ceil(total_records / self.page_size)
 
+    def on_count_loaded(self, total_records, estimated=False):
+        self.total_is_estimate = estimated
+        if not estimated:
+            self.count_cache.put(self.count_cache_key(), self.loading_generation, total_records)
+        self.set_total_records(total_records)
+
         if self.total_pages == 0:
             # Sem registros
-            self.table.setRowCount(0)
+            self.model.clear()
             self.update_pagination_bar()
             self.update_current_page_label()
-            conn.close()
+            self.data_loaded()
             return
 
         if self.current_page >= self.total_pages:
             self.current_page = self.total_pages - 1
 
-        query = self.build_record_query(count_only=False)
-        cursor.execute(query)
-        records = cursor.fetchall()
-        self.table.setRowCount(len(records))
+        self.seek = self.plan_page_seek()
+        query, params = self.build_record_query(count_only=False)
+        seek, self.seek = self.seek, None
+        self.query_runner.submit(fetch_all(query, params), lambda records: self.on_page_loaded(records, seek),
+                                 self.on_query_error)
+        if estimated:
+            self.start_exact_count()
+
+    def on_page_loaded(self, records, seek):
+        if seek is not None and seek[0] in ("before", "last"):
+            # Páginas buscadas de trás para frente voltam invertidas
+            records.reverse()
+        if not self.total_is_estimate:
+            self.page_cache.put(self.page_cache_key(), self.loading_generation, self.total_records, records)
+        self.show_page(records)
+
+    def start_exact_count(self):
+        key = self.count_cache_key()
+        generation = self.loading_generation
+        count_query, count_params = self.build_record_query(count_only=True)
+        self.count_runner.submit(fetch_count(count_query, count_params),
+                                 lambda total: self.on_exact_count_loaded(key, generation, total))
+
+    def on_exact_count_loaded(self, key, generation, total_records):
+        self.count_cache.put(key, generation, total_records)
+        if key != self.count_cache_key() or generation != self.loading_generation or not self.total_is_estimate:
+            return
+        self.total_is_estimate = False
+        self.set_total_records(total_records)
+        self.update_pagination_bar()
+        self.update_current_page_label()
+        if self.loaded_generation == generation:
+            # A página exibida só entra no cache com o total exato
+            self.page_cache.put(self.page_cache_key(), generation, total_records, self.model.records)
+            self.prefetch_neighbours()
+
+    def show_page(self, records):
+        self.remember_page_bounds(records)
 
         self.fill_table(records)
-        conn.close()
 
         self.update_pagination_bar()
         self.update_current_page_label()
+        self.data_loaded()
+        self.prefetch_neighbours()
+
+    def prefetch_neighbours(self):
+        """Busca em segundo plano as páginas vizinhas que ainda não estão no cache."""
+        generation = self.loaded_generation
+        if not self.prefetch_pages or generation is None or self.total_is_estimate:
+            return
+        if self.search_results is not None and self.search_results[0] == self.search_results_key():
+            return
+        pages = [page for page in (self.current_page + 1, self.current_page - 1)
+                 if 0 <= page < self.total_pages and not self.page_cache.contains(self.page_cache_key(page), generation)]
+        if not pages:
+            return
+
+        # build_record_query() lê current_page e seek: monta cada página e restaura o estado
+        requests = []
+        current_page = self.current_page
+        try:
+            for page in pages:
+                self.current_page = page
+                self.seek = self.plan_page_seek()
+                query, params = self.build_record_query(count_only=False)
+                reverse = self.seek is not None and self.seek[0] in ("before", "last")
+                requests.append((self.page_cache_key(), query, params, reverse))
+        finally:
+            self.current_page = current_page
+            self.seek = None
+        total_records = self.total_records
+
+        def job(conn):
+            job_generation = data_generation()
+            cursor = conn.cursor()
+            fetched = []
+            for key, query, params, reverse in requests:
+                cursor.execute(query, params)
+                records = cursor.fetchall()
+                if reverse:
+                    records.reverse()
+                fetched.append((key, records))
+            return job_generation, fetched
+
+        def store(result):
+            job_generation, fetched = result
+            if job_generation != generation:
+                return  # Houve escrita desde a contagem: as páginas podem não bater com o total
+            for key, records in fetched:
+                self.page_cache.put(key, generation, total_records, records, prefetched=True)
+
+        self.prefetch_runner.submit(job, store)
+
+    def records_changed(self):
+        """Chamado após salvar, editar ou excluir: páginas e limites guardados deixam de valer
+        e a lista é recarregada (uma única vez)."""
+        self.reset_page_bounds()
+        self.page_cache.invalidate()
+        self.count_cache.invalidate()
+        self.search_results = None
+        self.load_data()
+
+    def data_loaded(self):
+        """Marca a carga como concluída e devolve a rolagem salva por refresh_if_stale()."""
+        self.loaded_generation = self.loading_generation
+        if self.restore_scroll is not None:
+            self.table.verticalScrollBar().setValue(self.restore_scroll)
+            self.restore_scroll = None
+        if self.searching_keystrokes:
+            now = time.perf_counter()
+            self.search_latencies.extend(now - pressed for pressed in self.searching_keystrokes)
+            self.searching_keystrokes = []
+
+    def on_query_error(self, message):
+        self.restore_scroll = None
+        self.searching_keystrokes = []
+        QMessageBox.critical(self, "Erro", f"Erro ao carregar os dados: {message}")
+
+    def set_loading(self, loading):
+        """Mostra o aviso de carregamento só se a consulta demorar, para não piscar em consultas rápidas."""
+        if loading:
+            self.loading_timer.start()
+        else:
+            self.loading_timer.stop()
+            self.loading_label.setVisible(False)
+
+    def get_key_column(self):
+        # A coluna 0 de todas as listagens é o id da tabela principal
+        return self.get_column_mapping()[0]
+
+    def order_column_index(self):
+        if self.text_search and self.rank_order:
+            return None  # A relevância não é uma coluna da listagem: pagina por OFFSET
+        for index, column in self.get_column_mapping().items():
+            if column == self.order_by_column:
+                return index
+        return None
+
+    def reset_page_bounds(self):
+        self.page_bounds = {}
+        self.page_bounds_signature = None
+
+    def plan_page_seek(self):
+        """Decide como buscar a página atual: a partir de uma página vizinha já conhecida,
+        de trás para frente (última página) ou, sem referência, via OFFSET (retorna None)."""
+        # Com a geração dos dados: uma edição que não muda o total ainda muda os limites das páginas
+        signature = (self.order_by_column, self.order_direction, self.filter_field, self.filter_value,
+                     self.text_search, self.rank_order, self.page_size, self.total_records, self.loading_generation)
+        if signature != self.page_bounds_signature:
+            self.page_bounds = {}
+            self.page_bounds_signature = signature
+
+        if self.pagination_mode != "keyset" or self.current_page == 0 or self.order_column_index() is None:
+            return None
+
+        page = self.current_page
+        previous_bounds = self.page_bounds.get(page - 1)
+        if previous_bounds is not None:
+            return ("after", previous_bounds[1])
+        next_bounds = self.page_bounds.get(page + 1)
+        if next_bounds is not None:
+            return ("before", next_bounds[0])
+        if page == self.total_pages - 1 and not self.total_is_estimate:
+            return ("last", self.total_records - page * self.page_size)
+        return None
+
+    def remember_page_bounds(self, records):
+        index = self.order_column_index()
+        if self.pagination_mode != "keyset" or index is None or not records:
+            return
+        first, last = records[0], records[-1]
+        self.page_bounds[self.current_page] = ((first[index], first[0]), (last[index], last[0]))
+
+    def new_query(self, select, source):
+        """QueryBuilder com as colunas da listagem (get_column_mapping) liberadas para filtro e ordenação."""
+        query = QueryBuilder(select, source, self.get_column_mapping().values())
+        query.count_limit = self.count_limit
+        return query
+
+    def apply_search_filter(self, query):
+        """Filtro padrão da barra de busca: id exato (ou parcial) e LIKE nas demais colunas."""
+        if self.text_search and self.filter_value:
+            self.apply_text_search(query)
+            return
+        if not (self.filter_field and self.filter_value):
+            return
+        field = self.filter_field
+        value = self.filter_value
+        if field == self.get_key_column():
+            if value.isdigit():
+                query.where_equals(field, int(value))
+            else:
+                query.where_like(field, value, cast_text=True)
+        else:
+            query.where_like(field, value)
+
+    def apply_text_search(self, query):
+        """Filtra por MATCH nas tabelas FTS da listagem (a ordenação por relevância fica em apply_page)."""
+        match = fts_query(self.filter_value)
+        if match is None:
+            query.where("0")
+            return
+        sources = self.get_text_search_sources()
+        conditions = [f"{column} IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)" for fts, column in sources]
+        if len(conditions) == 1:
+            query.where(conditions[0], match)
+        else:
+            # Um OR entre tabelas diferentes força varrer a listagem; a união dos ids de cada
+            # tabela FTS mantém a busca pelo índice invertido
+            key_column = self.get_key_column()
+            union = " UNION ".join(f"SELECT {key_column} FROM {query.source} WHERE {condition}" for condition in conditions)
+            query.where(f"{key_column} IN ({union})", *[match] * len(conditions))
+
+    def text_search_rank(self):
+        """(expressão, parâmetros) da relevância da busca textual, ou None se não ordenar por ela."""
+        if not (self.text_search and self.rank_order and self.filter_value):
+            return None
+        match = fts_query(self.filter_value)
+        if match is None:
+            return None
+        sources = self.get_text_search_sources()
+        expression = " + ".join(
+            f"COALESCE((SELECT rank FROM {fts} WHERE {fts} MATCH ? AND rowid = {column}), 0)"
+            for fts, column in sources)
+        return expression, [match] * len(sources)
+
+    def apply_page(self, query):
+        """Condição de busca por chave da página planejada em self.seek, ORDER BY (com o id
+        como desempate) e LIMIT/OFFSET da página atual."""
+        key_column = self.get_key_column()
+        rank = self.text_search_rank()
+        if rank is not None:
+            expression, params = rank
+            query.order_by_expression(expression, *params)
+            query.order_by(key_column)
+            query.limit(self.page_size, self.current_page * self.page_size)
+            return
+
+        direction = self.order_direction
+        if self.seek is not None and self.seek[0] in ("before", "last"):
+            direction = "DESC" if direction == "ASC" else "ASC"
+
+        if self.seek is not None and self.seek[0] != "last":
+            kind, (value, key) = self.seek
+            # Direção em que a consulta percorre a ordenação (invertida ao buscar para trás)
+            ascending = (kind == "after") == (self.order_direction == "ASC")
+            if self.order_by_column == key_column:
+                query.seek(f"{query.column(key_column)} {'>' if ascending else '<'} ?", [key])
+            else:
+                self.apply_seek(query, ascending, value, key)
+
+        query.order_by(self.order_by_column, direction)
+        if self.order_by_column != key_column:
+            query.order_by(key_column, direction)
+
+        if self.seek is None:
+            query.limit(self.page_size, self.current_page * self.page_size)
+        elif self.seek[0] == "last":
+            query.limit(self.seek[1])
+        else:
+            query.limit(self.page_size)
+
+    def apply_seek(self, query, ascending, value, key):
+        """Linhas depois de (value, key) na direção da consulta. O SQLite ordena NULL antes de
+        qualquer valor, e a comparação (coluna, id) > (?, ?) nunca é verdadeira com NULL: os
+        NULLs vêm numa parte à parte, no início da ordem crescente e no fim da decrescente."""
+        column = query.column(self.order_by_column)
+        key_column = self.get_key_column()
+        if self.order_by_column in not_null_columns():
+            query.seek(f"({column}, {key_column}) {'>' if ascending else '<'} (?, ?)", [value, key])
+        elif ascending:
+            if value is None:
+                # Restante dos NULLs e, depois deles, todos os valores
+                query.seek(f"{column} IS NULL AND {key_column} > ?", [key], (f"{column} IS NOT NULL", []))
+            else:
+                query.seek(f"({column}, {key_column}) > (?, ?)", [value, key])
+        else:
+            if value is None:
+                query.seek(f"{column} IS NULL AND {key_column} < ?", [key])
+            else:
+                # Valores menores e, depois deles, os NULLs
+                query.seek(f"({column}, {key_column}) < (?, ?)", [value, key], (f"{column} IS NULL", []))
+
+    def query_plan_probes(self):
+        """Consultas que a listagem executa, geradas por build_record_query() nas formas
+        principais: sem filtro, filtrada por cada campo, ordenada por cada coluna e buscando a
+        página pela chave. Retorna [(rótulo, sql, parâmetros, permite SCAN externo)] para
+        database.check_query_plans(). O SCAN externo só é aceito onde é inerente à forma
+        (varrer a ordenação, LIKE com curinga inicial, busca pela chave numa coluna sem índice
+        ou de uma tabela ligada por JOIN, cujo plano depende do planejador)."""
+        state_names = ("current_page", "order_by_column", "order_direction", "filter_field", "filter_value",
+                       "text_search", "rank_order", "pagination_mode", "seek", "count_limit")
+        saved = {name: getattr(self, name) for name in state_names}
+        title = self.get_title()
+        key_column = self.get_key_column()
+        # Colunas indexadas da tabela principal: a busca pela chave tem de usar o índice
+        main_table = key_column.split(".")[0] + "."
+        seekable_columns = {column for column in indexed_columns() if column.startswith(main_table)} | {key_column}
+        probes = []
+
+        def probe(label, allow_outer_scan, count_only=False):
+            query, params = self.build_record_query(count_only=count_only)
+            if " UNION ALL " in query:
+                # Busca com a parte dos NULLs: o plano dessa parte segue as estatísticas da coluna
+                allow_outer_scan = True
+            probes.append((f"{title}: {label}", query, tuple(params), allow_outer_scan))
+
+        try:
+            self.pagination_mode = "offset"
+            self.current_page = 1
+            probe("página", True)
+            probe("contagem", True, count_only=True)
+            self.count_limit = 10 * self.page_size
+            probe("contagem limitada", True, count_only=True)
+            self.count_limit = None
+
+            for index in range(self.search_field_combo.count()):
+                self.filter_field = self.search_field_combo.itemData(index)
+                exact = self.filter_field == key_column
+                self.filter_value = "1" if exact else "a"
+                probe(f"filtro {self.filter_field}", not exact)
+                probe(f"contagem com filtro {self.filter_field}", not exact, count_only=True)
+            self.filter_field = self.filter_value = None
+
+            if self.get_text_search_sources() and fts_available():
+                self.text_search = True
+                self.filter_value = "a"
+                for rank_order in (True, False):
+                    self.rank_order = rank_order
+                    probe("busca textual" + (" por relevância" if rank_order else ""), not rank_order)
+                probe("contagem da busca textual", False, count_only=True)
+                self.text_search = self.rank_order = False
+                self.filter_value = None
+
+            self.pagination_mode = "keyset"
+            for column in self.get_column_mapping().values():
+                self.order_by_column = column
+                for direction in ("ASC", "DESC"):
+                    self.order_direction = direction
+                    self.seek = None
+                    probe(f"ordem {column} {direction}", True)
+                    for kind in ("after", "before"):
+                        self.seek = (kind, (1 if column == key_column else "a", 1))
+                        probe(f"ordem {column} {direction}, página {kind}", column not in seekable_columns)
+                        if column not in not_null_columns():
+                            # Limite da página vizinha numa linha com a coluna NULL
+                            self.seek = (kind, (None, 1))
+                            probe(f"ordem {column} {direction}, página {kind} de NULL", column not in seekable_columns)
+        finally:
+            for name, value in saved.items():
+                setattr(self, name, value)
+        return probes
+
+    def load_scroll_data(self):
+        """Rolagem contínua: carrega o primeiro bloco; os seguintes vêm do fetchMore do modelo."""
+        self.current_page = 0
+        self.seek = None
+        count_query, count_params = self.build_record_query(count_only=True)
+        query, params = self.build_record_query(count_only=False)
+
+        def job(conn):
+            cursor = conn.cursor()
+            cursor.execute(count_query, count_params)
+            total_records = cursor.fetchone()[0]
+            cursor.execute(query, params)
+            return total_records, cursor.fetchall()
+
+        self.query_runner.submit(job, self.on_scroll_data_loaded, self.on_query_error)
+
+    def on_scroll_data_loaded(self, result):
+        self.total_records, records = result
+        self.model.set_records(records, has_more=len(records) == self.page_size)
+        self.current_page_label.setText(f"Total de registros: {self.total_records}")
+        self.data_loaded()
+
+    def fetch_next_batch(self):
+        """Pede o bloco seguinte à última linha carregada, pela chave quando possível.
+        O resultado é entregue ao modelo em append_records()."""
+        last = self.model.last_record()
+        if last is None:
+            self.model.append_records([], False)
+            return
+        index = self.order_column_index()
+        if self.pagination_mode == "keyset" and index is not None:
+            self.seek = ("after", (last[index], last[0]))
+        else:
+            self.seek = None
+            self.current_page = self.model.rowCount() // self.page_size
+
+        query, params = self.build_record_query(count_only=False)
+        self.seek = None
+        self.query_runner.submit(
+            fetch_all(query, params),
+            lambda records: self.model.append_records(records, len(records) == self.page_size),
+            self.on_batch_error)
+
+    def on_batch_error(self, message):
+        self.model.append_records([], False)
+        self.on_query_error(message)
+
+    def set_continuous_scroll(self, enabled):
+        self.continuous_scroll = enabled
+        for button in [self.first_button, self.prev_button, self.next_button, self.last_button] + self.page_buttons:
+            button.setVisible(not enabled)
+        self.goto_page_input.setEnabled(not enabled)
+        # Blocos maiores na rolagem contínua; páginas de 25 na paginação
+        self.page_size = 100 if enabled else 25
+        self.current_page = 0
+        self.reset_page_bounds()
+        self.load_data()
 
     def fill_table(self, records):
-        """Preenche a tabela com os registros. Deve ser sobrescrito se precisar de lógica extra."""
-        for row_idx, row_data in enumerate(records):
-            for col_idx, col_data in enumerate(row_data):
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(col_data)))
-            self.add_actions_to_row(row_idx, row_data)
-    
-    def add_actions_to_row(self, row_idx, row_data):
-        raise NotImplementedError("Subclasse deve implementar add_actions_to_row().")
+        """Entrega os registros ao modelo da tabela. A formatação de cada célula fica em format_cell()."""
+        started = time.perf_counter()
+        self.model.set_records(records)
+        self.render_times.append(time.perf_counter() - started)
+
+    def format_cell(self, row_data, column):
+        return str(row_data[column])
+
+    def get_row_actions(self, row_data):
+        """Retorna [(texto, habilitado)] das colunas de ação da linha. Pode ser sobrescrito."""
+        return [(action, True) for action in ROW_ACTIONS]
+
+    def run_row_action(self, action, row_data):
+        record_id = row_data[0]
+        if action == "Detalhes":
+            self.show_details(record_id)
+        elif action == "Editar":
+            self.edit_record(record_id)
+        elif action == "Deletar":
+            self.delete_action(record_id)
+
+    def show_details(self, record_id):
+        raise NotImplementedError("Subclasse deve implementar show_details().")
+
+    def delete_action(self, record_id):
+        raise NotImplementedError("Subclasse deve implementar delete_action().")
 
     def update_current_page_label(self):
         if self.total_pages == 0:
             self.current_page_label.setText("Página atual: 0 de 0")
         else:
-            self.current_page_label.setText(f"Página atual: {self.current_page + 1} de {self.total_pages}")
+            if self.total_is_estimate:
+                self.current_page_label.setText(
+                    f"Página atual: {self.current_page + 1} de pelo menos {self.total_pages}")
+            else:
+                self.current_page_label.setText(f"Página atual: {self.current_page + 1} de {self.total_pages}")
 
     def update_pagination_bar(self):
         current_page_1 = self.current_page + 1
@@ -372,7 +1383,9 @@ class BaseListWidget(QWidget):
         self.first_button.setEnabled(self.total_pages > 1 and current_page_1 > 1)
         self.prev_button.setEnabled(self.total_pages > 1 and current_page_1 > 1)
         self.next_button.setEnabled(self.total_pages > 1 and current_page_1 < self.total_pages)
-        self.last_button.setEnabled(self.total_pages > 1 and current_page_1 < self.total_pages)
+        # Com o total estimado, a última página ainda não é conhecida
+        self.last_button.setEnabled(self.total_pages > 1 and current_page_1 < self.total_pages
+                                    and not self.total_is_estimate)
 
         if self.total_pages <= 1:
             # Apenas 1 ou 0 páginas
@@ -441,10 +1454,21 @@ class BaseListWidget(QWidget):
             else:
                 self.order_by_column = column_name
                 self.order_direction = "ASC"
+            self.rank_order = False
             self.current_page = 0
             self.load_data()
 
     def apply_filter(self):
+        if self.incremental_search:
+            # Buscar com a busca instantânea ligada só antecipa a espera
+            self.search_timer.stop()
+            self.run_incremental_search()
+            return
+        self.read_search_filter()
+        self.load_data()
+
+    def read_search_filter(self):
+        """Lê campo, termo e tipo de busca da barra de busca e volta à primeira página."""
         field = self.search_field_combo.currentData()
         value = self.search_input.text().strip()
         if value:
@@ -453,13 +1477,145 @@ class BaseListWidget(QWidget):
         else:
             self.filter_field = None
             self.filter_value = None
+        self.text_search = bool(value) and self.text_search_checkbox.isChecked()
+        self.rank_order = self.text_search
         self.current_page = 0
-        self.load_data()
+
+    def set_incremental_search(self, enabled):
+        self.incremental_search = enabled
+        self.pending_keystrokes = []
+        self.searching_keystrokes = []
+        if enabled:
+            self.search_timer.start()  # Aplica o que já está digitado
+        else:
+            self.search_timer.stop()
+            self.search_results = None
+
+    def on_search_text_changed(self, text):
+        if not self.incremental_search:
+            return
+        self.pending_keystrokes.append(time.perf_counter())
+        self.search_timer.start()  # Reinicia a espera a cada tecla
+
+    def on_search_options_changed(self, *args):
+        if self.incremental_search and self.search_input.text().strip():
+            self.search_timer.start()
+
+    def run_incremental_search(self):
+        """Busca instantânea: refina em memória o resultado anterior quando possível; senão
+        consulta o banco (a consulta nova cancela a que estiver em andamento)."""
+        # As teclas ainda sem resultado passam a ser atendidas por esta busca
+        self.searching_keystrokes += self.pending_keystrokes
+        self.pending_keystrokes = []
+        previous = self.search_results
+        self.read_search_filter()
+        if self.continuous_scroll or not self.filter_value:
+            self.search_results = None
+            self.load_data()
+            return
+
+        generation = data_generation()
+        rows = self.refine_search_results(previous, generation)
+        if rows is not None:
+            self.search_results = (self.search_results_key(generation), rows)
+            self.load_data()
+            return
+        self.load_search_results()
+
+    def search_results_key(self, generation=None):
+        return (self.filter_field, self.filter_value, self.text_search, self.rank_order,
+                self.order_by_column, self.order_direction,
+                self.loading_generation if generation is None else generation)
+
+    def refine_search_results(self, previous, generation):
+        """Linhas do resultado anterior que contêm o termo atual, ou None se for preciso consultar.
+        Vale para o LIKE de uma coluna da listagem, com a mesma ordenação e dados, quando o termo
+        novo contém o anterior: o resultado novo é um subconjunto do anterior, na mesma ordem."""
+        if previous is None or self.text_search:
+            return None
+        (field, value, text_search, _, order_column, direction, previous_generation), rows = previous
+        if (text_search or field != self.filter_field or not value or value not in self.filter_value
+                or (order_column, direction) != (self.order_by_column, self.order_direction)
+                or previous_generation != generation or field == self.get_key_column()):
+            return None
+        index = next((index for index, column in self.get_column_mapping().items() if column == field), None)
+        if index is None:
+            return None
+        term = self.filter_value
+        refined = []
+        for row in rows:
+            text = row[index]
+            if text is None:
+                continue
+            if not isinstance(text, str):
+                return None  # LIKE sobre números depende da conversão do SQLite
+            if like_contains(text, term):
+                refined.append(row)
+        return refined
+
+    def load_search_results(self):
+        """Lê até SEARCH_RESULT_LIMIT linhas do filtro numa só consulta, sem contagem à parte.
+        Se couberem, paginação e refinamentos seguintes usam as linhas em memória."""
+        self.loading_generation = data_generation()
+        self.loaded_generation = None
+        self.prefetch_runner.cancel()
+        self.count_runner.cancel()
+        self.seek = None
+        page_size = self.page_size
+        self.page_size = SEARCH_RESULT_LIMIT + 1
+        try:
+            query, params = self.build_record_query(count_only=False)
+        finally:
+            self.page_size = page_size
+        key = self.search_results_key()
+        self.query_runner.submit(fetch_all(query, params),
+                                 lambda records: self.on_search_results_loaded(key, records), self.on_query_error)
+
+    def on_search_results_loaded(self, key, records):
+        if len(records) > SEARCH_RESULT_LIMIT:
+            # Grande demais para guardar: primeira página com o total mínimo, contagem em segundo plano
+            self.search_results = None
+            self.total_is_estimate = True
+            self.set_total_records(len(records))
+            self.show_page(records[:self.page_size])
+            self.start_exact_count()
+            return
+        self.search_results = (key, records)
+        self.count_cache.put(self.count_cache_key(), self.loading_generation, len(records))
+        self.show_search_results()
+
+    def show_search_results(self):
+        records = self.search_results[1]
+        self.total_is_estimate = False
+        self.set_total_records(len(records))
+        if self.total_pages == 0:
+            self.model.clear()
+            self.update_pagination_bar()
+            self.update_current_page_label()
+            self.data_loaded()
+            return
+        if self.current_page >= self.total_pages:
+            self.current_page = self.total_pages - 1
+        start = self.current_page * self.page_size
+        self.show_page(records[start:start + self.page_size])
+
+    def search_latency_stats(self):
+        """Latência da busca instantânea (tecla até o resultado na tela), em milissegundos."""
+        return duration_stats(self.search_latencies)
+
+    def render_time_stats(self):
+        """Tempo de fill_table (entrega da página ao modelo e reajuste da tabela), em milissegundos."""
+        return duration_stats(self.render_times)
 
     def clear_filter(self):
         self.filter_field = None
         self.filter_value = None
+        self.text_search = False
+        self.rank_order = False
         self.search_input.clear()
+        self.search_timer.stop()
+        self.pending_keystrokes = []
+        self.search_results = None
         self.current_page = 0
         self.load_data()
 
@@ -493,7 +1649,7 @@ class BaseListWidget(QWidget):
             return
         self.save_record(data)
         self.stacked_layout.setCurrentWidget(self.table_widget)
-        self.load_data()
+        self.records_changed()
 
     def update_record_action(self):
         data = self.collect_edit_form_data()
@@ -503,7 +1659,7 @@ class BaseListWidget(QWidget):
             return
         self.update_record(self.edit_id, data)
         self.stacked_layout.setCurrentWidget(self.table_widget)
-        self.load_data()
+        self.records_changed()
 
 
     def clear_form(self):
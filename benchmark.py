@@ -0,0 +1,335 @@
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Conjuntos de dados gerados por populate_data, um por faixa, reaproveitados entre execuções
+BENCHMARK_DIR = "benchmarks"
+BENCHMARK_SEED = 42
+DEFAULT_TIERS = ("1k",)
+DEFAULT_REPEAT = 5
+# Aumento da mediana acima do qual a comparação aponta regressão
+DEFAULT_THRESHOLD = 0.10
+
+# Listagens medidas: (rótulo, módulo, classe)
+LIST_WIDGETS = (
+    ("animais", "animal_module", "AnimalListWidget"),
+    ("adotantes", "adopter_module", "AdopterListWidget"),
+    ("voluntarios", "volunteer_module", "VolunteerListWidget"),
+    ("adocoes", "adoption_module", "AdoptionListWidget"),
+    ("doacoes", "donation_module", "DonationsListWidget"),
+)
+LIST_FILTER_TERM = "ma"
+
+# Análises: (rótulo, índice em analysis_combo, usa granularidade)
+ANALYSES = (
+    ("adocoes", 1, True),
+    ("animais", 2, False),
+    ("doacoes", 3, True),
+    ("adotantes", 4, True),
+    ("voluntarios", 5, True),
+)
+
+# Abre a janela principal num processo novo e sai após a primeira pintura
+STARTUP_SCRIPT = """
+import sys
+import database
+database.set_database_path(sys.argv[1])
+import main
+from PyQt6.QtWidgets import QApplication
+main.create_tables()
+app = QApplication(sys.argv[:1])
+window = main.MainWindow(prewarm=False)
+window.show()
+app.processEvents()
+"""
+
+
+def measure(func, repeat=DEFAULT_REPEAT, warmup=1):
+    """Executa func warmup + repeat vezes e resume os tempos das repetições, em segundos."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {
+        "rounds": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+    }
+
+
+def dataset_path(tier):
+    return os.path.join(BENCHMARK_DIR, f"dados_{tier}.db")
+
+
+def ensure_dataset(tier, workers=None):
+    """Gera (uma vez) o banco da faixa com a semente fixa. Retorna o caminho."""
+    import database
+    import populate_data
+
+    path = dataset_path(tier)
+    if os.path.exists(path):
+        return path
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    total_persons, total_animals = populate_data.TIERS[tier]
+    print(f"Gerando o banco da faixa {tier} ({total_persons} pessoas, {total_animals} animais)...", flush=True)
+    database.set_database_path(path)
+    database.create_tables()
+    database.close_pool()
+    conn = sqlite3.connect(path)
+    try:
+        populate_data.generate_dataset(conn, total_persons, total_animals, BENCHMARK_SEED,
+                                       workers or populate_data.default_workers())
+    except BaseException:
+        conn.close()
+        os.remove(path)
+        raise
+    conn.close()
+    return path
+
+
+def list_filter_field(widget):
+    """Primeiro campo de busca da listagem que não é o id."""
+    key_column = widget.get_key_column()
+    for index in range(widget.search_field_combo.count()):
+        field = widget.search_field_combo.itemData(index)
+        if field != key_column:
+            return field
+    return None
+
+
+def list_load(widget, conn, page, filtered):
+    """Carga sem cache de uma página: contagem e página via build_record_query, como load_data()."""
+    def run():
+        widget.reset_page_bounds()
+        widget.filter_field = list_filter_field(widget) if filtered else None
+        widget.filter_value = LIST_FILTER_TERM if filtered else None
+        widget.total_is_estimate = False
+        cursor = conn.cursor()
+        count_query, count_params = widget.build_record_query(count_only=True)
+        cursor.execute(count_query, count_params)
+        widget.set_total_records(cursor.fetchone()[0])
+        last_page = max(widget.total_pages - 1, 0)
+        widget.current_page = {"primeira": 0, "meio": last_page // 2, "ultima": last_page}[page]
+        widget.seek = widget.plan_page_seek()
+        try:
+            query, params = widget.build_record_query(count_only=False)
+        finally:
+            widget.seek = None
+        cursor.execute(query, params)
+        cursor.fetchall()
+    return run
+
+
+def bench_lists(results, repeat):
+    import importlib
+    from database import create_connection
+
+    conn = create_connection()
+    try:
+        for label, module_name, class_name in LIST_WIDGETS:
+            widget = getattr(importlib.import_module(module_name), class_name)()
+            for filtered in (False, True):
+                for page in ("primeira", "meio", "ultima"):
+                    name = f"lista/{label}/{page}" + ("/filtro" if filtered else "")
+                    results[name] = measure(list_load(widget, conn, page, filtered), repeat)
+            widget.deleteLater()
+    finally:
+        conn.close()
+
+
+def bench_analytics(results, repeat):
+    from PyQt6.QtCore import QDate
+    from analytics_module import AnalyticsWidget, GRANULARITIES
+
+    widget = AnalyticsWidget()
+    widget.query_runner.asynchronous = False
+    # Período padrão da tela (6 meses) e todo o período dos dados
+    ranges = (("6m", QDate.currentDate().addMonths(-6)), ("tudo", QDate(2000, 1, 1)))
+    for label, index, uses_granularity in ANALYSES:
+        widget.analysis_combo.setCurrentIndex(index)
+        for range_label, start in ranges:
+            widget.start_date_edit.setDate(start)
+            widget.end_date_edit.setDate(QDate.currentDate())
+            for granularity in (GRANULARITIES if uses_granularity else (None,)):
+                if granularity is not None:
+                    widget.granularity_combo.blockSignals(True)
+                    widget.granularity_combo.setCurrentIndex(widget.granularity_combo.findData(granularity))
+                    widget.granularity_combo.blockSignals(False)
+                name = "/".join(part for part in ("analise", label, granularity, range_label) if part)
+                results[name] = measure(widget.refresh_current_analysis, repeat)
+    widget.deleteLater()
+
+
+def bench_reports(results, repeat):
+    from PyQt6.QtCore import QDate
+    from database import create_connection
+    from report_export import export_report_pdf, pdf_available
+    from report_module import ReportWidget
+
+    widget = ReportWidget()
+    widget.query_runner.asynchronous = False
+    today = QDate.currentDate()
+    periods = (("mes", today.addMonths(-1)), ("ano", today.addYears(-1)), ("tudo", QDate(2000, 1, 1)))
+
+    def generate():
+        widget.report_cache.clear()  # Mede a montagem, não o cache
+        widget.generate_report()
+
+    for label, start in periods:
+        widget.start_date.setDate(start)
+        widget.end_date.setDate(today)
+        results[f"relatorio/gerar/{label}"] = measure(generate, repeat)
+
+    if not pdf_available():
+        print("reportlab não instalado: exportação de PDF não medida.")
+        widget.deleteLater()
+        return
+
+    # O mesmo trabalho do export_pdf() da tela, sem o diálogo de arquivo
+    widget.start_date.setDate(today.addMonths(-1))
+    widget.end_date.setDate(today)
+    generate()
+    result = widget.report_result
+    conn = create_connection()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "relatorio.pdf")
+        try:
+            results["relatorio/pdf/resumo"] = measure(lambda: export_report_pdf(filename, result), repeat)
+            results["relatorio/pdf/detalhado"] = measure(lambda: export_report_pdf(filename, result, conn), repeat)
+        finally:
+            conn.close()
+    widget.deleteLater()
+
+
+def bench_startup(results, repeat, path):
+    """Abertura a frio da janela principal: processo novo até a primeira pintura."""
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    command = [sys.executable, "-c", STARTUP_SCRIPT, path]
+    results["inicializacao/janela"] = measure(
+        lambda: subprocess.run(command, env=environment, check=True), repeat)
+
+
+def run_tier(tier, repeat, workers=None):
+    import database
+
+    path = ensure_dataset(tier, workers)
+    database.set_database_path(path)
+    database.create_tables()
+    results = {}
+    try:
+        for label, suite in (("listagens", bench_lists), ("análises", bench_analytics), ("relatórios", bench_reports)):
+            print(f"[{tier}] {label}...", flush=True)
+            suite(results, repeat)
+        print(f"[{tier}] inicialização...", flush=True)
+        bench_startup(results, repeat, path)
+    finally:
+        database.close_pool()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(tiers, repeat=DEFAULT_REPEAT, workers=None):
+    """Executa todas as medições em cada faixa. Retorna o documento gravado em JSON."""
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": {tier: run_tier(tier, repeat, workers) for tier in tiers},
+    }
+
+
+def compare(base, current, threshold=DEFAULT_THRESHOLD):
+    """[(faixa, medição, mediana base, mediana atual, razão, regressão)] das medições presentes
+    nos dois. regressão é True quando a razão passa de 1 + threshold."""
+    rows = []
+    for tier, measurements in current["results"].items():
+        base_measurements = base["results"].get(tier, {})
+        for name, stats in measurements.items():
+            if name in base_measurements:
+                before = base_measurements[name]["median"]
+                after = stats["median"]
+                ratio = after / before if before > 0 else float("inf")
+                rows.append((tier, name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_results(document):
+    lines = []
+    for tier, measurements in document["results"].items():
+        lines.append(f"== {tier}")
+        for name, stats in measurements.items():
+            lines.append(f"{name:<40} {stats['median'] * 1000:10.2f} ms  (mín {stats['min'] * 1000:.2f})")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    from populate_data import TIERS
+
+    parser = argparse.ArgumentParser(
+        description="Mede listagens, análises, relatórios e a abertura da janela em bancos gerados de vários tamanhos.")
+    parser.add_argument("--tiers", default=",".join(DEFAULT_TIERS),
+                        help=f"faixas de populate_data separadas por vírgula ({', '.join(TIERS)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="repetições de cada medição")
+    parser.add_argument("--workers", type=int, default=None, help="processos para gerar os bancos")
+    parser.add_argument("--output", help="arquivo JSON dos resultados (padrão: benchmarks/resultado_<data>.json)")
+    parser.add_argument("--input", help="usa um JSON já gravado em vez de medir (para --compare)")
+    parser.add_argument("--compare", metavar="BASE", help="compara as medianas com um JSON anterior")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="aumento relativo da mediana considerado regressão (padrão: 0.10)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as file:
+            document = json.load(file)
+    else:
+        tiers = [tier.strip() for tier in args.tiers.split(",") if tier.strip()]
+        unknown = [tier for tier in tiers if tier not in TIERS]
+        if unknown:
+            parser.error(f"Faixas desconhecidas: {', '.join(unknown)}")
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        document = run_benchmarks(tiers, args.repeat, args.workers)
+        output = args.output or os.path.join(BENCHMARK_DIR, f"resultado_{datetime.now():%Y%m%d_%H%M%S}.json")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+        print(format_results(document))
+        print(f"Resultados gravados em {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            base = json.load(file)
+        regressions = 0
+        for tier, name, before, after, ratio, regressed in compare(base, document, args.threshold):
+            mark = "  <- mais lento" if regressed else ""
+            regressions += regressed
+            print(f"[{tier}] {name:<40} {before * 1000:10.2f} -> {after * 1000:10.2f} ms  x{ratio:.2f}{mark}")
+        if regressions:
+            print(f"{regressions} medições mais lentas que a base (limite: +{args.threshold:.0%}).")
+            sys.exit(1)
+        print("Nenhuma regressão em relação à base.")
@@ -1,8 +1,982 @@
+import re
 import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+DB_PATH = 'animal_shelter.db'
+
+# PRAGMAs aplicados uma única vez, quando a conexão física é aberta
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+)
+
+
+# Registro das consultas: consultas a partir deste tempo entram no log de lentas
+SLOW_QUERY_SECONDS = 0.1
+# Linhas lidas de uma vez quando o cursor instrumentado é percorrido com for
+CURSOR_ITERATION_BATCH = 256
+# Limites (ms) das faixas do histograma de cada forma de consulta; a última faixa é "acima de 1 s"
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """Forma da consulta: literais viram ? e os espaços são compactados."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+_query_context = threading.local()
+
+@contextmanager
+def query_context(name):
+    """Identifica quem executa as consultas na thread atual (p.ex. a tela), para o registro."""
+    previous = getattr(_query_context, "name", None)
+    _query_context.name = name
+    try:
+        yield
+    finally:
+        _query_context.name = previous
+
+def current_query_context():
+    return getattr(_query_context, "name", None)
+
+
+class QueryLog:
+    """Registro das consultas feitas pelas conexões do pool.
+
+    Guarda as últimas execuções (hora, contexto, forma, parâmetros, segundos, linhas), e por
+    forma de consulta o total e as durações das últimas shape_window execuções, de onde sai o
+    histograma. Consultas a partir de slow_threshold vão para slow e, se slow_log_path estiver
+    definido, para o arquivo; com explain_slow, acompanhadas do EXPLAIN QUERY PLAN."""
+
+    def __init__(self, slow_threshold=SLOW_QUERY_SECONDS, slow_log_path=None, explain_slow=False,
+                 max_recent=500, shape_window=200):
+        self.enabled = True
+        self.slow_threshold = slow_threshold
+        self.slow_log_path = slow_log_path
+        self.explain_slow = explain_slow
+        self.shape_window = shape_window
+        self.recent = deque(maxlen=max_recent)
+        self.slow = deque(maxlen=max_recent)  # entradas de recent mais o plano (ou None)
+        self._shapes = {}  # forma -> [execuções, segundos, deque das durações recentes]
+        self._lock = threading.Lock()
+
+    def record(self, sql, params, seconds, rows, database=None):
+        shape = normalize_sql(sql)
+        entry = (time.time(), current_query_context(), shape, params, seconds, rows)
+        with self._lock:
+            self.recent.append(entry)
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = [0, 0.0, deque(maxlen=self.shape_window)]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2].append(seconds)
+        if seconds >= self.slow_threshold:
+            self.log_slow(entry, sql, database)
+
+    def log_slow(self, entry, sql, database):
+        plan = None
+        if self.explain_slow and database is not None:
+            plan = explain_plan_lines(database, sql, entry[3])
+        with self._lock:
+            self.slow.append(entry + (plan,))
+            if self.slow_log_path:
+                moment, context, shape, params, seconds, rows = entry
+                with open(self.slow_log_path, "a", encoding="utf-8") as log_file:
+                    log_file.write(f"{datetime.fromtimestamp(moment):%Y-%m-%d %H:%M:%S} {seconds * 1000:.1f} ms "
+                                   f"{rows} linhas [{context or '-'}] {shape} -- {params!r}\n")
+                    for line in plan or ():
+                        log_file.write(f"    {line}\n")
+
+    def histogram(self, durations):
+        """Quantidade de durações em cada faixa de HISTOGRAM_BOUNDS_MS (mais a faixa acima)."""
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for seconds in durations:
+            counts[bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+        return counts
+
+    def shape_stats(self):
+        """[(forma, execuções, segundos, média das recentes, histograma das recentes)], da forma
+        que mais tempo consumiu para a que menos consumiu."""
+        with self._lock:
+            shapes = [(shape, count, total, list(recent)) for shape, (count, total, recent) in self._shapes.items()]
+        shapes.sort(key=lambda item: item[2], reverse=True)
+        return [(shape, count, total, sum(recent) / len(recent), self.histogram(recent))
+                for shape, count, total, recent in shapes]
+
+    def recent_by_context(self, limit=20):
+        """{contexto: [entradas mais recentes primeiro]} com até limit entradas por contexto."""
+        with self._lock:
+            entries = list(self.recent)
+        grouped = {}
+        for entry in reversed(entries):
+            bucket = grouped.setdefault(entry[1] or "-", [])
+            if len(bucket) < limit:
+                bucket.append(entry)
+        return grouped
+
+    def clear(self):
+        with self._lock:
+            self.recent.clear()
+            self.slow.clear()
+            self._shapes.clear()
+
+query_log = QueryLog()
+
+def explain_plan_lines(database, sql, params):
+    """Linhas do EXPLAIN QUERY PLAN de sql, numa conexão somente leitura à parte."""
+    try:
+        conn = create_read_only_connection(database)
+        try:
+            return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return [f"(plano indisponível: {e})"]
+
+
+class InstrumentedCursor:
+    """Cursor que mede cada comando (execução e leitura das linhas) e o registra no QueryLog.
+
+    O registro acontece quando as linhas se esgotam, no próximo comando ou quando o cursor
+    é fechado ou descartado. Percorrido com for, lê as linhas em blocos de
+    CURSOR_ITERATION_BATCH para não medir linha a linha."""
+
+    _raw = None
+    _pending = None  # [sql, parâmetros, segundos, linhas]
+    _batch = ()  # Linhas já lidas e ainda não entregues pelo for
+
+    def __init__(self, log, raw, database):
+        self._log = log
+        self._raw = raw
+        self._database = database
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._batch:
+            self._batch = self.fetchmany(CURSOR_ITERATION_BATCH)
+            if not self._batch:
+                raise StopIteration
+            self._batch.reverse()
+        return self._batch.pop()
+
+    def _take_batch(self, limit=None):
+        """Linhas lidas pelo for e ainda não entregues, em ordem (até limit)."""
+        if not self._batch:
+            return []
+        count = len(self._batch) if limit is None else min(limit, len(self._batch))
+        rows = self._batch[-count:]
+        del self._batch[-count:]
+        rows.reverse()
+        return rows
+
+    def __del__(self):
+        self._finish()
+
+    def execute(self, sql, params=()):
+        self._finish()
+        self._batch = ()
+        started = time.perf_counter()
+        self._raw.execute(sql, params)
+        self._pending = [sql, params, time.perf_counter() - started, 0]
+        if self._raw.description is None:
+            # Sem linhas para ler (INSERT, UPDATE, DDL...): registra já, com as linhas afetadas
+            self._pending[3] = max(self._raw.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._finish()
+        self._batch = ()
+        started = time.perf_counter()
+        self._raw.executemany(sql, seq_of_params)
+        self._log.record(sql, "(executemany)", time.perf_counter() - started, max(self._raw.rowcount, 0),
+                         self._database)
+        return self
+
+    def fetchone(self):
+        if self._batch:
+            return self._take_batch(1)[0]
+        started = time.perf_counter()
+        row = self._raw.fetchone()
+        self._add(started, 0 if row is None else 1)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        size = self._raw.arraysize if size is None else size
+        buffered = self._take_batch(size)
+        if len(buffered) == size:
+            return buffered
+        started = time.perf_counter()
+        rows = self._raw.fetchmany(size - len(buffered))
+        self._add(started, len(rows))
+        if len(rows) < size - len(buffered):
+            self._finish()
+        return buffered + rows
+
+    def fetchall(self):
+        buffered = self._take_batch()
+        started = time.perf_counter()
+        rows = self._raw.fetchall()
+        self._add(started, len(rows))
+        self._finish()
+        return buffered + rows
+
+    def close(self):
+        self._finish()
+        self._raw.close()
+
+    def _add(self, started, rows):
+        if self._pending is not None:
+            self._pending[2] += time.perf_counter() - started
+            self._pending[3] += rows
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._log.record(*pending, self._database)
+
+
+class PooledConnection:
+    """Conexão emprestada do pool. close() devolve a conexão ao pool em vez de fechá-la."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        # total_changes no último commit: sem linhas alteradas desde então, o commit não
+        # muda a geração de escrita (e não invalida os caches que dependem dela)
+        self._committed_changes = raw.total_changes
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._raw, name)
+
+    def cursor(self):
+        if self._raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        if not query_log.enabled:
+            return self._raw.cursor()
+        return InstrumentedCursor(query_log, self._raw.cursor(), self._pool.database)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def commit(self):
+        if self._raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        changes = self._raw.total_changes
+        self._raw.commit()
+        if changes != self._committed_changes:
+            self._committed_changes = changes
+            self._pool.bump_write_generation()
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+
+class ConnectionPool:
+    """Mantém conexões SQLite abertas e as reaproveita entre as telas."""
+
+    def __init__(self, database=None, max_idle=4, pragmas=CONNECTION_PRAGMAS):
+        self.database = database or DB_PATH
+        self.max_idle = max_idle
+        self.pragmas = pragmas
+        self._idle = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.in_use = 0
+        # Geração de escrita: incrementada a cada commit que alterou linhas, feito por conexões do pool
+        self.write_generation = 0
+        # Conexão só de leitura do PRAGMA data_version; nunca escreve, então enxerga
+        # os commits de todas as outras conexões, inclusive de outros processos
+        self._version_conn = None
+        self._version_lock = threading.Lock()
+
+    def _connect(self):
+        # check_same_thread=False: o pool garante que cada conexão tem um único dono por vez
+        conn = sqlite3.connect(self.database, check_same_thread=False, cached_statements=256)
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        raw = None
+        with self._lock:
+            if self._idle:
+                raw = self._idle.pop()
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.in_use += 1
+        if raw is None:
+            try:
+                raw = self._connect()
+            except Exception:
+                with self._lock:
+                    self.in_use -= 1
+                raise
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        # Alterações não confirmadas são descartadas, como aconteceria no close() do sqlite3
+        if raw.in_transaction:
+            raw.rollback()
+        with self._lock:
+            self.in_use -= 1
+            if len(self._idle) < self.max_idle:
+                self._idle.append(raw)
+                return
+            self.discarded += 1
+        raw.close()
+
+    def bump_write_generation(self):
+        with self._lock:
+            self.write_generation += 1
+
+    def data_version(self):
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(self.database, check_same_thread=False)
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def data_generation(self):
+        """Identifica o estado atual dos dados. Muda sempre que alguém confirma uma escrita."""
+        with self._lock:
+            write_generation = self.write_generation
+        return (write_generation, self.data_version())
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "discarded": self.discarded,
+                "write_generation": self.write_generation,
+            }
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for raw in idle:
+            raw.close()
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+def set_database_path(path):
+    """Passa a usar outro arquivo de banco (p.ex. um gerado para benchmark). Fecha o pool atual
+    e esquece o que foi lido do esquema do banco anterior (FTS5, colunas NOT NULL)."""
+    global DB_PATH, _fts_available, _not_null_columns
+    close_pool()
+    DB_PATH = path
+    _fts_available = None
+    _not_null_columns = None
+
+def database_path():
+    """Arquivo de banco em uso, lido na hora da chamada (acompanha set_database_path)."""
+    return DB_PATH
 
 def create_connection():
-    conn = sqlite3.connect('animal_shelter.db')
-    return conn
+    return get_pool().acquire()
+
+def create_read_only_connection(database=None):
+    """Conexão avulsa somente leitura (fora do pool), para processos de trabalho.
+    Sem database, abre o banco em uso."""
+    from pathlib import Path
+    if database is None:
+        database = DB_PATH
+    return sqlite3.connect(Path(database).resolve().as_uri() + "?mode=ro", uri=True)
+
+def pool_stats():
+    return get_pool().stats()
+
+def data_generation():
+    return get_pool().data_generation()
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
+
+# Conjunto versionado de índices secundários. Ao alterar a lista, incremente
+# INDEX_SET_VERSION para que create_tables() remova os índices obsoletos e
+# atualize as estatísticas do planejador.
+INDEX_SET_VERSION = 1
+INDEXES = (
+    ("idx_animals_status", "animals", "status"),
+    ("idx_animals_type", "animals", "type"),
+    ("idx_animals_name", "animals", "name"),
+    ("idx_animals_breed", "animals", "breed"),
+    ("idx_animals_created_at", "animals", "created_at"),
+    ("idx_persons_name", "persons", "name"),
+    ("idx_adopters_person_id", "adopters", "person_id"),
+    ("idx_adopters_created_at", "adopters", "created_at"),
+    ("idx_volunteers_person_id", "volunteers", "person_id"),
+    ("idx_volunteers_created_at", "volunteers", "created_at"),
+    ("idx_adoptions_adopter_id", "adoptions", "adopter_id"),
+    ("idx_adoptions_animal_id", "adoptions", "animal_id"),
+    ("idx_adoptions_date", "adoptions", "date"),
+    ("idx_adoptions_created_at", "adoptions", "created_at"),
+    ("idx_donations_volunteer_id", "donations", "volunteer_id"),
+    ("idx_donations_date", "donations", "date"),
+    ("idx_donations_created_at", "donations", "created_at"),
+)
+
+def indexed_columns():
+    """Colunas ("tabela.coluna") com índice próprio no conjunto INDEXES."""
+    return {f"{table}.{columns}" for _, table, columns in INDEXES}
+
+def create_indexes(cursor):
+    for name, table, columns in INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+    installed_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if installed_version != INDEX_SET_VERSION:
+        # Remove índices de versões anteriores que saíram do conjunto
+        wanted = {name for name, _, _ in INDEXES}
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'")
+        for (name,) in cursor.fetchall():
+            if name not in wanted:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute("ANALYZE")
+        cursor.execute(f"PRAGMA user_version = {INDEX_SET_VERSION}")
+
+def missing_indexes(cursor):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    installed = {row[0] for row in cursor.fetchall()}
+    return [name for name, _, _ in INDEXES if name not in installed]
+
+# Início do período de cada granularidade das séries temporais, como data 'YYYY-MM-DD'.
+# A semana começa na segunda-feira.
+TIME_BUCKETS = {
+    "day": "date({column})",
+    "week": "date({column}, '-6 days', 'weekday 1')",
+    "month": "strftime('%Y-%m-01', {column})",
+    "year": "strftime('%Y-01-01', {column})",
+}
+
+def time_series_query(table, date_column, granularity="month", value="COUNT(*)",
+                      start_date=None, end_date=None):
+    """Monta (sql, parâmetros) de uma série temporal agregada no SQLite: uma linha
+    (início do período, valor) por período, em ordem cronológica. Datas inválidas são ignoradas."""
+    bucket = TIME_BUCKETS[granularity].format(column=date_column)
+    query = f"SELECT {bucket} AS bucket, {value} FROM {table}"
+    params = []
+    if start_date and end_date:
+        # Intervalo sobre a coluna (usa o índice) em vez de DATE(coluna) BETWEEN ...
+        query += f" WHERE {date_column} >= ? AND {date_column} < date(?, '+1 day')"
+        params = [start_date, end_date]
+    query += " GROUP BY bucket HAVING bucket IS NOT NULL ORDER BY bucket"
+    return query, params
+
+# Agregados mensais mantidos por gatilhos: métrica -> (tabela, coluna de data,
+# coluna de tipo, coluna de status, coluna de valor). As colunas opcionais são None.
+ROLLUP_SOURCES = {
+    "adoptions": ("adoptions", "date", None, None, None),
+    "donations": ("donations", "date", None, None, "amount"),
+    "adopters": ("adopters", "created_at", None, None, None),
+    "volunteers": ("volunteers", "created_at", None, None, None),
+    "animals": ("animals", "created_at", "type", "status", None),
+}
+
+def _rollup_values(metric, row):
+    """Expressões (mês, tipo, status, valor) da linha row ('new' ou 'old') para os gatilhos."""
+    _, date_column, type_column, status_column, amount_column = ROLLUP_SOURCES[metric]
+    return (
+        f"strftime('%Y-%m', {row}.{date_column})",
+        f"COALESCE({row}.{type_column}, '')" if type_column else "''",
+        f"COALESCE({row}.{status_column}, '')" if status_column else "''",
+        f"COALESCE({row}.{amount_column}, 0)" if amount_column else "0",
+    )
+
+def _rollup_add(metric, row):
+    month, type_value, status_value, amount = _rollup_values(metric, row)
+    return f"""
+        INSERT INTO monthly_rollups (month, metric, type, status, count, total)
+        SELECT {month}, '{metric}', {type_value}, {status_value}, 1, {amount}
+        WHERE {month} IS NOT NULL
+        ON CONFLICT (month, metric, type, status)
+        DO UPDATE SET count = count + 1, total = total + excluded.total;
+    """
+
+def _rollup_remove(metric, row):
+    month, type_value, status_value, amount = _rollup_values(metric, row)
+    return f"""
+        UPDATE monthly_rollups SET count = count - 1, total = total - {amount}
+        WHERE month = {month} AND metric = '{metric}' AND type = {type_value} AND status = {status_value};
+    """
+
+def create_rollups(cursor):
+    """Cria a tabela monthly_rollups e os gatilhos que a mantêm. Uma tabela nova é reconstruída."""
+    existed = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'monthly_rollups'"
+    ).fetchone() is not None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_rollups (
+            month TEXT NOT NULL,  -- 'YYYY-MM'
+            metric TEXT NOT NULL,
+            type TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, month, type, status)
+        ) WITHOUT ROWID
+    ''')
+    for metric, (table, date_column, type_column, status_column, amount_column) in ROLLUP_SOURCES.items():
+        watched = ", ".join(c for c in (date_column, type_column, status_column, amount_column) if c)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS rollup_{table}_ai AFTER INSERT ON {table} BEGIN
+                {_rollup_add(metric, "new")}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS rollup_{table}_ad AFTER DELETE ON {table} BEGIN
+                {_rollup_remove(metric, "old")}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS rollup_{table}_au AFTER UPDATE OF {watched} ON {table} BEGIN
+                {_rollup_remove(metric, "old")}
+                {_rollup_add(metric, "new")}
+            END
+        """)
+    if not existed:
+        rebuild_rollups(cursor)
+
+# Tabelas cujo total de linhas é mantido em table_counts pelos gatilhos count_*: a contagem
+# das listagens sem filtro sai de uma linha, sem percorrer a tabela
+COUNTED_TABLES = ("animals", "persons", "adopters", "volunteers", "adoptions", "donations")
+
+def create_table_counts(cursor):
+    """Cria a tabela table_counts e os gatilhos que a mantêm. Uma tabela nova é reconstruída."""
+    existed = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'table_counts'"
+    ).fetchone() is not None
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_counts (
+            name TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    for table in COUNTED_TABLES:
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS count_{table}_ai AFTER INSERT ON {table} BEGIN
+                UPDATE table_counts SET count = count + 1 WHERE name = '{table}';
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS count_{table}_ad AFTER DELETE ON {table} BEGIN
+                UPDATE table_counts SET count = count - 1 WHERE name = '{table}';
+            END
+        """)
+    if not existed:
+        rebuild_table_counts(cursor)
+
+def rebuild_table_counts(cursor):
+    for table in COUNTED_TABLES:
+        cursor.execute(f"""
+            INSERT INTO table_counts (name, count) VALUES (?, (SELECT COUNT(*) FROM {table}))
+            ON CONFLICT(name) DO UPDATE SET count = excluded.count
+        """, (table,))
+
+def table_count(cursor, table):
+    """Total de linhas de table mantido pelos gatilhos, ou None se a tabela não é contada."""
+    row = cursor.execute("SELECT count FROM table_counts WHERE name = ?", (table,)).fetchone()
+    return row[0] if row else None
+
+def check_table_counts(cursor):
+    """[(tabela, esperado, contador)] dos contadores que divergem de COUNT(*)."""
+    mismatches = []
+    for table in COUNTED_TABLES:
+        expected = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        actual = table_count(cursor, table)
+        if actual != expected:
+            mismatches.append((table, expected, actual))
+    return mismatches
+
+def _rollup_source_query(metric):
+    """Agregação completa da métrica a partir da tabela de origem, no formato de monthly_rollups."""
+    table, date_column, type_column, status_column, amount_column = ROLLUP_SOURCES[metric]
+    type_value = f"COALESCE({type_column}, '')" if type_column else "''"
+    status_value = f"COALESCE({status_column}, '')" if status_column else "''"
+    total = f"COALESCE(SUM({amount_column}), 0)" if amount_column else "0"
+    return f"""
+        SELECT strftime('%Y-%m', {date_column}) AS month, '{metric}', {type_value}, {status_value}, COUNT(*), {total}
+        FROM {table}
+        WHERE month IS NOT NULL
+        GROUP BY month, 3, 4
+    """
+
+def rebuild_rollups(cursor):
+    """Recalcula monthly_rollups do zero (usar quando check_rollups() apontar divergências)."""
+    cursor.execute("DELETE FROM monthly_rollups")
+    for metric in ROLLUP_SOURCES:
+        cursor.execute("INSERT INTO monthly_rollups (month, metric, type, status, count, total) "
+                       + _rollup_source_query(metric))
+
+def check_rollups(cursor):
+    """Compara monthly_rollups com as tabelas de origem. Retorna [(métrica, mês, tipo, status, esperado, atual)]."""
+    drift = []
+    for metric in ROLLUP_SOURCES:
+        expected = {row[0:1] + row[2:4]: (row[4], round(row[5], 2))
+                    for row in cursor.execute(_rollup_source_query(metric))}
+        actual = {row[0:3]: (row[3], round(row[4], 2)) for row in cursor.execute(
+            "SELECT month, type, status, count, total FROM monthly_rollups WHERE metric = ? AND count != 0",
+            (metric,))}
+        for key in sorted(expected.keys() | actual.keys()):
+            if expected.get(key) != actual.get(key):
+                drift.append((metric, *key, expected.get(key), actual.get(key)))
+    return drift
+
+def _month_start(day):
+    return day.replace(day=1)
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def split_period(start_date=None, end_date=None):
+    """Divide [start_date, end_date] (None = sem limite) em meses inteiros, lidos de
+    monthly_rollups, e pontas lidas das tabelas de origem. Retorna (meses, pontas):
+    meses é (primeiro mês, mês final exclusivo) como 'YYYY-MM' (None = sem limite) ou None
+    se não houver mês inteiro; pontas é [(início, fim exclusivo)] como 'YYYY-MM-DD'."""
+    start = date.fromisoformat(start_date) if start_date else None
+    stop = date.fromisoformat(end_date) + timedelta(days=1) if end_date else None  # exclusivo
+    full_from = None if start is None else (start if start.day == 1 else _next_month(start))
+    full_to = None if stop is None else _month_start(stop)  # exclusivo
+    if full_from is not None and full_to is not None and full_from >= full_to:
+        return None, [(start.isoformat(), stop.isoformat())]
+    edges = []
+    if start is not None and start < full_from:
+        edges.append((start.isoformat(), full_from.isoformat()))
+    if stop is not None and full_to < stop:
+        edges.append((full_to.isoformat(), stop.isoformat()))
+    months = (full_from.strftime("%Y-%m") if full_from else None,
+              full_to.strftime("%Y-%m") if full_to else None)
+    return months, edges
+
+def rollup_totals(cursor, metric, start_date=None, end_date=None, group_by=None,
+                  type=None, status=None, exclude_status=None):
+    """Soma count e total da métrica no período, agrupando por 'month', 'year' ou 'type'
+    (ou sem agrupar, chave None). Meses inteiros vêm de monthly_rollups; os dias das pontas
+    que não cobrem um mês inteiro são somados direto da tabela de origem.
+    Retorna {chave: [count, total]}."""
+    table, date_column, type_column, status_column, amount_column = ROLLUP_SOURCES[metric]
+
+    months, edges = split_period(start_date, end_date)
+
+    rollup_keys = {"month": "month || '-01'", "year": "substr(month, 1, 4) || '-01-01'", "type": "type", None: "NULL"}
+    # Nas tabelas de origem, tipo e status NULL valem '' como em monthly_rollups
+    raw_type = f"COALESCE({type_column}, '')" if type_column else None
+    raw_status = f"COALESCE({status_column}, '')" if status_column else None
+    raw_keys = {"month": f"strftime('%Y-%m-01', {date_column})", "year": f"strftime('%Y-01-01', {date_column})",
+                "type": raw_type, None: "NULL"}
+    raw_total = f"COALESCE(SUM({amount_column}), 0)" if amount_column else "0"
+
+    results = {}
+    def accumulate(rows):
+        for key, count, total in rows:
+            # Linhas com data inválida ficam sem período (chave None) e são ignoradas
+            if count and (key is not None or group_by is None):
+                entry = results.setdefault(key, [0, 0.0])
+                entry[0] += count
+                entry[1] += total
+
+    if months is not None:
+        first_month, stop_month = months
+        query = f"SELECT {rollup_keys[group_by]} AS key, SUM(count), SUM(total) FROM monthly_rollups WHERE metric = ?"
+        params = [metric]
+        if first_month is not None:
+            query += " AND month >= ?"
+            params.append(first_month)
+        if stop_month is not None:
+            query += " AND month < ?"
+            params.append(stop_month)
+        for column, operator, value in (("type", "=", type), ("status", "=", status), ("status", "!=", exclude_status)):
+            if value is not None:
+                query += f" AND {column} {operator} ?"
+                params.append(value)
+        accumulate(cursor.execute(query + " GROUP BY key", params).fetchall())
+
+    for range_start, range_stop in edges:
+        query = f"SELECT {raw_keys[group_by]} AS key, COUNT(*), {raw_total} FROM {table}"
+        query += f" WHERE {date_column} >= ? AND {date_column} < ?"
+        params = [range_start, range_stop]
+        for column, operator, value in ((raw_type, "=", type), (raw_status, "=", status),
+                                        (raw_status, "!=", exclude_status)):
+            if value is not None:
+                query += f" AND {column} {operator} ?"
+                params.append(value)
+        accumulate(cursor.execute(query + " GROUP BY key", params).fetchall())
+
+    return results
+
+def time_series(cursor, metric, granularity="month", start_date=None, end_date=None):
+    """[(início do período, valor)] da métrica: soma do valor (doações) ou contagem.
+    Mês e ano são lidos de monthly_rollups; dia e semana, da tabela de origem."""
+    table, date_column, _, _, amount_column = ROLLUP_SOURCES[metric]
+    if granularity in ("month", "year"):
+        totals = rollup_totals(cursor, metric, start_date, end_date, group_by=granularity)
+        return [(key, total if amount_column else count) for key, (count, total) in sorted(totals.items())]
+    value = f"SUM({amount_column})" if amount_column else "COUNT(*)"
+    query, params = time_series_query(table, date_column, granularity, value, start_date, end_date)
+    return cursor.execute(query, params).fetchall()
+
+# Tabelas FTS5 de conteúdo externo: (tabela FTS, tabela de origem, colunas indexadas).
+# O índice guarda apenas os termos; o texto continua na tabela de origem e os
+# gatilhos abaixo mantêm os dois sincronizados.
+FTS_TABLES = (
+    ("animals_fts", "animals", ("name", "breed", "description")),
+    ("persons_fts", "persons", ("name", "address")),
+    ("volunteers_fts", "volunteers", ("skills", "motivation")),
+)
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+FTS_PREFIX = "2 3"  # Índices de prefixo para buscas "gat*" com 2 e 3 letras
+
+_fts_available = None
+
+def create_fts_tables(cursor):
+    """Cria as tabelas FTS5 e seus gatilhos. Tabelas novas são populadas com 'rebuild'."""
+    global _fts_available
+    for fts, table, columns in FTS_TABLES:
+        existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+        ).fetchone() is not None
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        try:
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                    {column_list}, content='{table}', content_rowid='id',
+                    tokenize='{FTS_TOKENIZE}', prefix='{FTS_PREFIX}'
+                )
+            """)
+        except sqlite3.OperationalError:
+            # SQLite compilado sem FTS5: a busca textual fica indisponível
+            _fts_available = False
+            return
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        if not existed:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    _fts_available = True
+
+def fts_available():
+    """Indica se as tabelas FTS5 existem no banco (verificado uma vez por arquivo de banco)."""
+    global _fts_available
+    if _fts_available is None:
+        conn = create_connection()
+        installed = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        _fts_available = all(fts in installed for fts, _, _ in FTS_TABLES)
+    return _fts_available
+
+_not_null_columns = None
+
+def not_null_columns():
+    """Colunas ("tabela.coluna") que nunca são NULL: NOT NULL ou chave primária. Lido do
+    esquema uma vez por arquivo de banco."""
+    global _not_null_columns
+    if _not_null_columns is None:
+        conn = create_connection()
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'")]
+        columns = set()
+        for table in tables:
+            for _, name, _, notnull, _, pk in conn.execute(f"PRAGMA table_info({table})"):
+                if notnull or pk:
+                    columns.add(f"{table}.{name}")
+        conn.close()
+        _not_null_columns = columns
+    return _not_null_columns
+
+def _derived_triggers():
+    """Nomes dos gatilhos criados por create_fts_tables, create_rollups e create_table_counts."""
+    for fts, _, _ in FTS_TABLES:
+        yield from (f"{fts}_ai", f"{fts}_ad", f"{fts}_au")
+    for table, _, _, _, _ in ROLLUP_SOURCES.values():
+        yield from (f"rollup_{table}_ai", f"rollup_{table}_ad", f"rollup_{table}_au")
+    for table in COUNTED_TABLES:
+        yield from (f"count_{table}_ai", f"count_{table}_ad")
+
+@contextmanager
+def bulk_load(conn):
+    """Carga em massa numa única transação. Durante a carga não há fsync, o diário fica em
+    memória e os índices secundários e gatilhos (FTS, agregados, contadores) são removidos;
+    no fim tudo é recriado a partir dos dados. Um erro desfaz a carga inteira.
+
+    conn deve ser uma conexão própria (sqlite3.connect), sem outras abertas no mesmo banco."""
+    cursor = conn.cursor()
+    conn.commit()
+    cursor.execute("PRAGMA synchronous = OFF")
+    cursor.execute("PRAGMA journal_mode = MEMORY")
+    cursor.execute("PRAGMA cache_size = -200000")
+    try:
+        cursor.execute("BEGIN")
+        for name in _derived_triggers():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name, _, _ in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        yield cursor
+
+        create_indexes(cursor)
+        installed = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if all(fts in installed for fts, _, _ in FTS_TABLES):
+            create_fts_tables(cursor)
+            for fts, _, _ in FTS_TABLES:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        create_rollups(cursor)
+        rebuild_rollups(cursor)
+        create_table_counts(cursor)
+        rebuild_table_counts(cursor)
+        cursor.execute("ANALYZE")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+
+# Consultas fixas verificadas junto com as das listagens: exclusões, CPF, períodos dos
+# relatórios e agregados mensais. As das listagens vêm de list_query_plan_probes().
+# allow_outer_scan indica que percorrer a tabela principal é esperado; qualquer outro
+# SCAN é tratado como falha.
+QUERY_PLAN_PROBES = (
+    ("adotantes: adoções associadas", "SELECT COUNT(*) FROM adoptions WHERE adopter_id = ?", (1,), False),
+    ("adotantes: pessoa", "SELECT COUNT(*) FROM adopters WHERE person_id = ?", (1,), False),
+    ("voluntários: doações associadas", "SELECT COUNT(*) FROM donations WHERE volunteer_id = ?", (1,), False),
+    ("voluntários: pessoa", "SELECT COUNT(*) FROM volunteers WHERE person_id = ?", (1,), False),
+    ("pessoas: CPF", "SELECT id FROM persons WHERE cpf = ?", ("00000000000",), False),
+    ("adoções: período", "SELECT COUNT(*) FROM adoptions WHERE date >= ? AND date < date(?, '+1 day')", ("2024-01-01", "2024-12-31"), False),
+    ("doações: período", "SELECT SUM(amount) FROM donations WHERE date >= ? AND date < date(?, '+1 day')", ("2024-01-01", "2024-12-31"), False),
+    ("animais: cadastrados no período", "SELECT COUNT(*) FROM animals WHERE created_at >= ? AND created_at < date(?, '+1 day')", ("2024-01-01", "2024-12-31"), False),
+    ("adotantes: cadastrados no período", "SELECT COUNT(*) FROM adopters WHERE created_at >= ? AND created_at < date(?, '+1 day')", ("2024-01-01", "2024-12-31"), False),
+    ("voluntários: cadastrados no período", "SELECT COUNT(*) FROM volunteers WHERE created_at >= ? AND created_at < date(?, '+1 day')", ("2024-01-01", "2024-12-31"), False),
+    ("agregados mensais: período", "SELECT SUM(count), SUM(total) FROM monthly_rollups WHERE metric = ? AND month >= ? AND month < ?", ("donations", "2024-01", "2024-12"), False),
+)
+
+# Listagens cujas consultas entram na verificação de planos: (módulo, classe)
+LIST_WIDGETS = (
+    ("animal_module", "AnimalListWidget"),
+    ("adopter_module", "AdopterListWidget"),
+    ("volunteer_module", "VolunteerListWidget"),
+    ("adoption_module", "AdoptionListWidget"),
+    ("donation_module", "DonationsListWidget"),
+)
+
+def list_query_plan_probes():
+    """Consultas reais das listagens, montadas pelo build_record_query() de cada uma
+    (BaseListWidget.query_plan_probes). Exige uma QApplication já criada."""
+    import importlib
+    probes = []
+    for module_name, class_name in LIST_WIDGETS:
+        widget = getattr(importlib.import_module(module_name), class_name)()
+        probes.extend(widget.query_plan_probes())
+        widget.deleteLater()
+    return probes
+
+def explain_query_plan(cursor, query, params=()):
+    cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+    return cursor.fetchall()
+
+def find_table_scans(plan, allow_outer_scan=False):
+    """Retorna os passos SCAN do plano, ignorando o laço externo quando permitido.
+
+    Subconsultas em CO-ROUTINE/MATERIALIZE (p.ex. a contagem limitada) são blocos à parte,
+    cada um com o seu laço externo."""
+    scans = []
+    blocks = {0} | {node for node, _, _, detail in plan if detail.startswith(("CO-ROUTINE", "MATERIALIZE"))}
+    outer_seen = set()
+    for _, parent, _, detail in plan:
+        is_loop = detail.startswith("SCAN ") or detail.startswith("SEARCH ")
+        is_outer = is_loop and parent in blocks and parent not in outer_seen
+        if is_outer:
+            outer_seen.add(parent)
+        # Tabelas FTS5 aparecem como "SCAN ... VIRTUAL TABLE INDEX", mas usam o índice invertido;
+        # "SCAN (subquery-N)" lê o resultado de uma subconsulta já limitada, não uma tabela
+        if "VIRTUAL TABLE INDEX" in detail or detail.startswith("SCAN ("):
+            continue
+        if detail.startswith("SCAN ") and not (is_outer and allow_outer_scan):
+            scans.append(detail)
+    return scans
+
+def check_query_plans(probes=QUERY_PLAN_PROBES):
+    """Executa EXPLAIN QUERY PLAN nas consultas e retorna [(rótulo, [SCANs])] das que caíram em SCAN."""
+    failures = []
+    conn = create_connection()
+    cursor = conn.cursor()
+    for label, query, params, allow_outer_scan in probes:
+        scans = find_table_scans(explain_query_plan(cursor, query, params), allow_outer_scan)
+        if scans:
+            failures.append((label, scans))
+    conn.close()
+    return failures
 
 def create_tables():
     conn = create_connection()
@@ -83,8 +1057,60 @@ def create_tables():
         )
     ''')
 
+    create_indexes(cursor)
+    create_fts_tables(cursor)
+    create_rollups(cursor)
+    create_table_counts(cursor)
     conn.commit()
+
+    missing = missing_indexes(cursor)
     conn.close()
+    if missing:
+        raise RuntimeError(f"Índices ausentes após a criação das tabelas: {', '.join(missing)}")
 
 if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Cria e verifica o banco de dados do abrigo.")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="falha se alguma consulta das listagens usar SCAN em vez de índice")
+    parser.add_argument("--check-rollups", action="store_true",
+                        help="falha se os agregados mensais ou os contadores divergirem das tabelas de origem")
+    parser.add_argument("--rebuild-rollups", action="store_true",
+                        help="recalcula os agregados mensais e os contadores do zero")
+    args = parser.parse_args()
+
     create_tables()
+    if args.rebuild_rollups:
+        conn = create_connection()
+        rebuild_rollups(conn.cursor())
+        rebuild_table_counts(conn.cursor())
+        conn.commit()
+        conn.close()
+        print("Agregados mensais e contadores reconstruídos.")
+    if args.check_rollups:
+        conn = create_connection()
+        drift = check_rollups(conn.cursor())
+        count_drift = check_table_counts(conn.cursor())
+        conn.close()
+        for metric, month, type_value, status_value, expected, actual in drift:
+            print(f"[DIVERGÊNCIA] {metric} {month} {type_value}/{status_value}: esperado {expected}, atual {actual}")
+        for table, expected, actual in count_drift:
+            print(f"[DIVERGÊNCIA] contador {table}: esperado {expected}, atual {actual}")
+        if drift or count_drift:
+            print("Execute 'python database.py --rebuild-rollups' para corrigir.")
+            sys.exit(1)
+        print("Agregados mensais e contadores consistentes.")
+    if args.check_plans:
+        # As consultas das listagens são montadas pelos próprios widgets, sem exibir janelas
+        import os
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication(sys.argv[:1])
+        failures = check_query_plans(QUERY_PLAN_PROBES + tuple(list_query_plan_probes()))
+        for label, scans in failures:
+            print(f"[SCAN] {label}: {'; '.join(scans)}")
+        if failures:
+            sys.exit(1)
+        print("Todas as consultas das listagens usam índices.")
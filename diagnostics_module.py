@@ -0,0 +1,395 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox, QPlainTextEdit, QSpinBox,
+    QComboBox, QFileDialog, QMessageBox, QApplication
+)
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from PyQt6.QtGui import QFontDatabase, QWindow
+from collections import Counter, deque
+from datetime import datetime
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+from base_list_widget import shared_count_cache, shared_page_cache
+from database import pool_stats, query_log
+
+# Intervalo de atualização da tela enquanto ela está visível
+REFRESH_INTERVAL_MS = 1000
+# Consultas recentes mostradas por tela (padrão do campo) e formas de consulta mais custosas
+RECENT_QUERIES = 10
+TOP_QUERY_SHAPES = 10
+# Perfis de interação guardados e funções mostradas no resumo de cada um
+PROFILE_HISTORY = 10
+PROFILE_TOP_FUNCTIONS = 25
+
+def process_rss():
+    """Memória residente do processo em bytes, ou None se não for possível ler.
+
+    Usa /proc no Linux e GetProcessMemoryInfo no Windows; nos demais sistemas retorna o
+    pico de memória (ru_maxrss)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_info.argtypes = (wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD)
+        if get_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # bytes no macOS
+
+
+def format_stats(stats):
+    """Resumo de duration_stats() em uma linha."""
+    if not stats["samples"]:
+        return "sem amostras"
+    return (f"{stats['samples']} amostras, média {stats['mean_ms']:.1f} ms, "
+            f"p95 {stats['p95_ms']:.1f} ms, máx {stats['max_ms']:.1f} ms")
+
+
+def format_hit_rate(stats):
+    return f"{stats['hit_rate']:.0%} de {stats['hits'] + stats['misses']} acessos"
+
+
+class InteractionProfiler(QObject):
+    """Perfil (cProfile) das últimas interações na thread da interface.
+
+    A cada clique ou tecla o perfil em andamento é encerrado e guardado em history como o da
+    interação anterior (descrição, início, duração, Profile), e um novo começa; cada perfil
+    cobre o tratamento da interação e tudo o que a interface fez até a seguinte."""
+
+    INPUT_EVENTS = (QEvent.Type.MouseButtonPress, QEvent.Type.KeyPress)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.history = deque(maxlen=PROFILE_HISTORY)
+        self.profile = None
+        self.description = None
+        self.started = None
+
+    def start(self):
+        if self.profile is None:
+            QApplication.instance().installEventFilter(self)
+            self.begin("Início da gravação")
+
+    def stop(self):
+        if self.profile is not None:
+            QApplication.instance().removeEventFilter(self)
+            self.finish()
+
+    def begin(self, description):
+        self.description = description
+        self.started = time.time()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def finish(self):
+        profile, self.profile = self.profile, None
+        profile.disable()
+        self.history.append((self.description, self.started, time.time() - self.started, profile))
+
+    def eventFilter(self, obj, event):
+        # O evento de entrada chega primeiro à janela (QWindow) e depois é repassado aos widgets:
+        # filtrar pela janela conta cada clique ou tecla uma única vez
+        if event.type() in self.INPUT_EVENTS and isinstance(obj, QWindow) and self.profile is not None:
+            self.finish()
+            self.begin(self.describe(event))
+        return False
+
+    def describe(self, event):
+        if event.type() == QEvent.Type.KeyPress:
+            widget = QApplication.focusWidget()
+            action = f"Tecla {event.text()!r}" if event.text().isprintable() and event.text() else "Tecla"
+        else:
+            widget = QApplication.widgetAt(event.globalPosition().toPoint())
+            action = "Clique"
+        if widget is None:
+            return action
+        text = widget.text() if hasattr(widget, "text") and callable(widget.text) else ""
+        if isinstance(text, str) and text:
+            return f"{action} em {type(widget).__name__} '{text[:40]}'"
+        return f"{action} em {type(widget).__name__}"
+
+    def summary(self, profile, limit=PROFILE_TOP_FUNCTIONS):
+        """As limit funções com maior tempo acumulado, no formato do pstats."""
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return output.getvalue()
+
+
+class DiagnosticsWidget(QWidget):
+    """Tela oculta (Ctrl+Shift+D) com métricas de desempenho da aplicação em execução.
+
+    module_widgets() retorna [(nome, widget)] das telas já criadas pela janela principal."""
+
+    def __init__(self, module_widgets):
+        super().__init__()
+        self.module_widgets = module_widgets
+        self.profiler = InteractionProfiler(self)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.initUI()
+        self.set_styles()
+
+    def set_styles(self):
+        style = (
+            "QWidget {"
+            "    background-color: #f4f6fb;"
+            "}"
+            "QPushButton {"
+            "    border: 1px solid #eef1f6;"
+            "    border-radius: 15px;"
+            "    background-color: #ffffff;"
+            "    color: black;"
+            "    padding: 5px 10px;"
+            "    font-size: 14px;"
+            "}"
+            "QPushButton:hover {"
+            "    background-color: #eaeaea;"
+            "}"
+            "QPushButton:disabled {"
+            "    background-color: #d3d3d3;"
+            "    color: #a9a9a9;"
+            "}"
+            "QPlainTextEdit {"
+            "    background-color: #fff;"
+            "    border: 1px solid #eef1f6;"
+            "    border-radius: 5px;"
+            "}"
+            "QLabel {"
+            "    font-size: 14px;"
+            "    color: #333333;"
+            "}"
+        )
+        self.setStyleSheet(style)
+
+    def initUI(self):
+        layout = QVBoxLayout()
+        fixed_font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+
+        title = QLabel("<h2>Diagnóstico de Desempenho</h2>")
+        layout.addWidget(title)
+
+        # Atualização das métricas
+        controls_layout = QHBoxLayout()
+        refresh_button = QPushButton("Atualizar")
+        refresh_button.clicked.connect(self.refresh)
+        controls_layout.addWidget(refresh_button)
+        self.auto_refresh_checkbox = QCheckBox("Atualizar automaticamente")
+        self.auto_refresh_checkbox.setChecked(True)
+        self.auto_refresh_checkbox.toggled.connect(self.update_refresh_timer)
+        controls_layout.addWidget(self.auto_refresh_checkbox)
+        controls_layout.addWidget(QLabel("Consultas por tela:"))
+        self.query_limit_input = QSpinBox()
+        self.query_limit_input.setRange(1, 100)
+        self.query_limit_input.setValue(RECENT_QUERIES)
+        self.query_limit_input.valueChanged.connect(self.refresh)
+        controls_layout.addWidget(self.query_limit_input)
+        clear_button = QPushButton("Limpar registro de consultas")
+        clear_button.clicked.connect(self.clear_query_log)
+        controls_layout.addWidget(clear_button)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+
+        self.metrics_text = QPlainTextEdit()
+        self.metrics_text.setReadOnly(True)
+        self.metrics_text.setFont(fixed_font)
+        self.metrics_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.metrics_text, 3)
+
+        # Perfil das últimas interações
+        profile_layout = QHBoxLayout()
+        self.profile_checkbox = QCheckBox("Gravar perfil das interações")
+        self.profile_checkbox.toggled.connect(self.set_profiling)
+        profile_layout.addWidget(self.profile_checkbox)
+        self.profile_combo = QComboBox()
+        self.profile_combo.currentIndexChanged.connect(self.show_profile_summary)
+        profile_layout.addWidget(self.profile_combo, 1)
+        self.export_profile_button = QPushButton("Exportar perfil...")
+        self.export_profile_button.setEnabled(False)
+        self.export_profile_button.clicked.connect(self.export_profile)
+        profile_layout.addWidget(self.export_profile_button)
+        layout.addLayout(profile_layout)
+
+        self.profile_text = QPlainTextEdit()
+        self.profile_text.setReadOnly(True)
+        self.profile_text.setFont(fixed_font)
+        self.profile_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.profile_text.setPlaceholderText(
+            "Marque \"Gravar perfil das interações\", repita a ação lenta e escolha a interação acima.")
+        layout.addWidget(self.profile_text, 2)
+
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.update_refresh_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def update_refresh_timer(self):
+        if self.auto_refresh_checkbox.isChecked() and self.isVisible():
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+
+    def refresh(self):
+        scroll = self.metrics_text.verticalScrollBar().value()
+        self.metrics_text.setPlainText(self.build_report())
+        self.metrics_text.verticalScrollBar().setValue(scroll)
+        self.update_profile_list()
+
+    def clear_query_log(self):
+        query_log.clear()
+        self.refresh()
+
+    def build_report(self):
+        """Texto com as métricas atuais, uma seção por assunto."""
+        widgets = self.module_widgets()
+        names = {type(widget).__name__: name for name, widget in widgets}
+        lines = [f"Atualizado em {datetime.now():%H:%M:%S}", ""]
+
+        rss = process_rss()
+        lines.append("Processo")
+        lines.append(f"  Memória residente: {rss / 1024 / 1024:.1f} MB" if rss is not None
+                     else "  Memória residente: indisponível")
+        all_widgets = QApplication.allWidgets()
+        lines.append(f"  Widgets: {len(all_widgets)} no total")
+        for name, widget in widgets:
+            lines.append(f"    {name:<24} {len(widget.findChildren(QWidget)) + 1}")
+        top_classes = Counter(type(widget).__name__ for widget in all_widgets).most_common(5)
+        lines.append("  Classes mais numerosas: " + ", ".join(f"{name} {count}" for name, count in top_classes))
+        lines.append("")
+
+        pool = pool_stats()
+        lines.append("Pool de conexões")
+        lines.append(f"  {pool['in_use']} em uso, {pool['idle']} ociosas, {pool['discarded']} descartadas; "
+                     f"reaproveitamento {format_hit_rate(pool)}; geração de escrita {pool['write_generation']}")
+        lines.append("")
+
+        pages = shared_page_cache.stats()
+        counts = shared_count_cache.stats()
+        lines.append("Caches")
+        lines.append(f"  Páginas: {format_hit_rate(pages)}, {pages['entries']} páginas, "
+                     f"{pages['bytes'] / 1024 / 1024:.1f} de {pages['max_bytes'] / 1024 / 1024:.0f} MB, "
+                     f"{pages['prefetched']} pré-carregadas, {pages['evictions']} descartadas")
+        lines.append(f"  Totais: {format_hit_rate(counts)}, {counts['entries']} entradas")
+        for name, widget in widgets:
+            if hasattr(widget, "report_cache"):
+                reports = widget.report_cache.stats()
+                lines.append(f"  Relatórios: {format_hit_rate(reports)}, {reports['entries']} entradas")
+        lines.append("")
+
+        lines.append("Renderização das páginas (fill_table)")
+        lines.extend(f"  {name:<24} {format_stats(widget.render_time_stats())}"
+                     for name, widget in widgets if hasattr(widget, "render_time_stats"))
+        lines.append("Busca instantânea (tecla até o resultado)")
+        lines.extend(f"  {name:<24} {format_stats(widget.search_latency_stats())}"
+                     for name, widget in widgets if hasattr(widget, "search_latency_stats"))
+        lines.append("Desenho dos gráficos (matplotlib)")
+        lines.extend(f"  {name:<24} {format_stats(widget.draw_time_stats())}"
+                     for name, widget in widgets if hasattr(widget, "draw_time_stats"))
+        lines.append("")
+
+        lines.append("Consultas recentes por tela" + ("" if query_log.enabled else " (registro desligado)"))
+        # Consultas sem tela (inicialização, scripts) ficam por último
+        grouped = query_log.recent_by_context(self.query_limit_input.value())
+        for context in sorted(grouped, key=lambda context: (context == "-", context)):
+            entries = grouped[context]
+            if context == "-":
+                label = "Sem tela"
+            else:
+                label = f"{names[context]} ({context})" if context in names else context
+            lines.append(f"  {label}")
+            for moment, _, shape, params, seconds, rows in entries:
+                lines.append(f"    {datetime.fromtimestamp(moment):%H:%M:%S} {seconds * 1000:8.1f} ms "
+                             f"{rows:>6} linhas  {shape[:120]}")
+        lines.append("")
+
+        lines.append("Formas de consulta que mais consumiram tempo")
+        for shape, count, total, mean, _ in query_log.shape_stats()[:TOP_QUERY_SHAPES]:
+            lines.append(f"  {total * 1000:9.1f} ms em {count:>5} execuções (média recente "
+                         f"{mean * 1000:.1f} ms)  {shape[:120]}")
+        return "\n".join(lines)
+
+    def set_profiling(self, enabled):
+        if enabled:
+            self.profiler.start()
+        else:
+            self.profiler.stop()
+        self.update_profile_list()
+
+    def update_profile_list(self):
+        history = list(self.profiler.history)
+        if self.profile_combo.count() == len(history) and (
+                not history or self.profile_combo.itemData(0) == history[-1][1]):
+            return
+        # Mais recente primeiro; a interação em andamento (a atual) não entra na lista.
+        # A escolha feita é mantida enquanto o perfil escolhido estiver no histórico
+        selected = self.profile_combo.currentData()
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        for description, started, seconds, _ in reversed(history):
+            self.profile_combo.addItem(
+                f"{datetime.fromtimestamp(started):%H:%M:%S}  {description}  ({seconds:.2f} s)", started)
+        index = self.profile_combo.findData(selected)
+        self.profile_combo.setCurrentIndex(max(index, 0))
+        self.profile_combo.blockSignals(False)
+        if index < 0:
+            self.show_profile_summary()
+
+    def selected_profile(self):
+        started = self.profile_combo.currentData()
+        for entry in self.profiler.history:
+            if entry[1] == started:
+                return entry
+        return None
+
+    def show_profile_summary(self):
+        entry = self.selected_profile()
+        self.export_profile_button.setEnabled(entry is not None)
+        self.profile_text.setPlainText("" if entry is None else self.profiler.summary(entry[3]))
+
+    def export_profile(self):
+        entry = self.selected_profile()
+        if entry is None:
+            return
+        default_name = f"perfil_{datetime.fromtimestamp(entry[1]):%Y%m%d_%H%M%S}.prof"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar perfil", default_name, "Perfil do cProfile (*.prof)")
+        if not file_path:
+            return
+        try:
+            entry[3].dump_stats(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao exportar o perfil: {e}")
+            return
+        QMessageBox.information(
+            self, "Perfil exportado",
+            f"Perfil salvo em {file_path}.\nAbra com: python -m pstats \"{file_path}\"")
@@ -38,58 +38,22 @@ class DonationsListWidget(BaseListWidget):
         }
     
     def build_record_query(self, count_only=False):
-        base = "SELECT "
-        if count_only:
-            base += "COUNT(*)"
+        query = self.new_query(
+            "donations.id, persons.name, donations.date, donations.amount, donations.created_at, volunteers.id",
+            "donations"
+            " JOIN volunteers ON donations.volunteer_id = volunteers.id"
+            " JOIN persons ON volunteers.person_id = persons.id")
+        if self.filter_field == "donations.amount" and self.filter_value:
+            query.where_like("donations.amount", self.filter_value, cast_text=True)
         else:
-            base += "donations.id, persons.name, donations.date, donations.amount, donations.created_at, volunteers.id"
-        base += " FROM donations"
-        base += " JOIN volunteers ON donations.volunteer_id = volunteers.id"
-        base += " JOIN persons ON volunteers.person_id = persons.id"
-
-        conditions = []
-        if self.filter_field and self.filter_value:
-            field = self.filter_field
-            value = self.filter_value
-            field = field.replace("volunteers.name", "persons.name")
-
-            if field == "donations.id":
-                if value.isdigit():
-                    conditions.append("donations.id = {}".format(int(value)))
-                else:
-                    conditions.append("CAST(donations.id AS TEXT) LIKE '%{}%'".format(value))
-            elif field == "persons.name":
-                conditions.append("persons.name LIKE '%{}%'".format(value))
-            elif field == "donations.date":
-                conditions.append("donations.date LIKE '%{}%'".format(value))
-            elif field == "donations.amount":
-                conditions.append("CAST(donations.amount AS TEXT) LIKE '%{}%'".format(value))
-
-        if conditions:
-            base += " WHERE " + " AND ".join(conditions)
+            self.apply_search_filter(query)
 
         if not count_only:
             if self.order_by_column is None:
                 self.order_by_column = "donations.id"
-            base += f" ORDER BY {self.order_by_column} {self.order_direction}"
-            base += f" LIMIT {self.page_size} OFFSET {self.current_page * self.page_size}"
+            self.apply_page(query)
 
-        return base
-
-    def add_actions_to_row(self, row_idx, row_data):
-        donation_id = row_data[0]
-
-        details_button = QPushButton("Detalhes")
-        details_button.clicked.connect(lambda checked, did=donation_id: self.show_details(did))
-        self.table.setCellWidget(row_idx, 5, details_button)
-
-        edit_button = QPushButton("Editar")
-        edit_button.clicked.connect(lambda checked, did=donation_id: self.edit_record(did))
-        self.table.setCellWidget(row_idx, 6, edit_button)
-
-        delete_button = QPushButton("Deletar")
-        delete_button.clicked.connect(lambda checked, did=donation_id: self.delete_action(did))
-        self.table.setCellWidget(row_idx, 7, delete_button)
+        return query.build(count_only)
 
     def initFormFields(self, form_layout):
         # Campo do voluntário
@@ -308,7 +272,7 @@ class DonationsListWidget(BaseListWidget):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.delete_record(record_id)
-            self.load_data()
+            self.records_changed()
 
     def update_volunteer_info(self):
         key = self.volunteer_input.text().strip()
@@ -1,20 +1,25 @@
 import os
 import sys
+import time
+
+STARTED = time.perf_counter()
+
+# --profile-startup: reinicia o interpretador com -X importtime, que escreve no stderr o tempo
+# de cada import (próprio e cumulativo, em µs), e mostra o tempo de cada etapa da inicialização
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+if PROFILE_STARTUP and "importtime" not in sys._xoptions and not getattr(sys, "frozen", False):
+    import subprocess
+    sys.exit(subprocess.call([sys.executable, "-X", "importtime"] + sys.argv))
+
+import importlib
+import multiprocessing
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel,
     QHBoxLayout, QVBoxLayout, QListWidget, QStackedWidget, QListWidgetItem
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap, QIcon
-from database import create_tables
-
-from animal_module import AnimalListWidget
-from adoption_module import AdoptionListWidget
-from adopter_module import AdopterListWidget
-from volunteer_module import VolunteerListWidget
-from donation_module import DonationsListWidget
-from analytics_module import AnalyticsWidget
-from report_module import ReportWidget
+from PyQt6.QtCore import Qt, QEvent, QTimer
+from PyQt6.QtGui import QPixmap, QIcon, QKeySequence, QShortcut
+from database import create_tables, close_pool, query_log
 
 def resource_path(relative_path):
     """Retorna o caminho absoluto para recursos, mesmo no executável."""
@@ -22,13 +27,49 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
+# Telas dos módulos por linha da barra lateral: (atributo, nome, módulo, classe, atualizar ao exibir).
+# Módulo e widget só são carregados na primeira navegação (ou no pré-aquecimento ocioso), então
+# matplotlib e reportlab não pesam na abertura da janela.
+MODULE_WIDGETS = {
+    2: ("animals_widget", "Animais", "animal_module", "AnimalListWidget", True),
+    3: ("adopters_widget", "Adotantes", "adopter_module", "AdopterListWidget", True),
+    4: ("volunteers_widget", "Voluntários", "volunteer_module", "VolunteerListWidget", True),
+    6: ("adoptions_widget", "Adoções", "adoption_module", "AdoptionListWidget", True),
+    7: ("donations_widget", "Doações", "donation_module", "DonationsListWidget", True),
+    8: ("analytics_widget", "Análise e Insights", "analytics_module", "AnalyticsWidget", False),
+    9: ("reports_widget", "Relatório", "report_module", "ReportWidget", False),
+}
+
+# Linha da tela de diagnóstico: oculta na barra lateral até o atalho DIAGNOSTICS_SHORTCUT
+DIAGNOSTICS_ROW = 10
+DIAGNOSTICS_SHORTCUT = "Ctrl+Shift+D"
+
+# Pré-aquecimento: começa PREWARM_DELAY_MS depois de abrir a janela e só cria um widget
+# quando o usuário está há PREWARM_IDLE_MS sem usar mouse ou teclado, um a cada PREWARM_INTERVAL_MS
+PREWARM_DELAY_MS = 1500
+PREWARM_IDLE_MS = 1000
+PREWARM_INTERVAL_MS = 250
+# Eventos que contam como uso da interface
+USER_INPUT_EVENTS = {
+    QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick, QEvent.Type.Wheel,
+    QEvent.Type.KeyPress, QEvent.Type.TouchBegin,
+}
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, prewarm=False, timings=None):
         super().__init__()
+        # Tempos de inicialização por etapa/módulo, em segundos, na ordem em que ocorreram
+        self.timings = timings if timings is not None else {}
+        self.prewarm_queue = []
+        self.last_input = time.perf_counter()
+        started = time.perf_counter()
         self.setWindowTitle("Sistema de Gestão da ONG de Abrigo de Animais")
         self.setWindowIcon(QIcon(resource_path("icons/logo_amar.ico")))  # Define o ícone da janela e da barra de tarefas
         self.setGeometry(100, 100, 900, 600)
         self.initUI()
+        self.timings["Janela principal"] = time.perf_counter() - started
+        if prewarm:
+            self.start_prewarm()
 
     def initUI(self):
         # Layout principal
@@ -46,6 +87,8 @@ class MainWindow(QMainWindow):
         self.sidebar.addItem("  - Doações")
         self.sidebar.addItem(QListWidgetItem(QIcon("icons/analytics_icon.png"), "Análise e Insights"))
         self.sidebar.addItem(QListWidgetItem(QIcon("icons/report_icon.png"), "Relatório"))
+        self.sidebar.addItem("Diagnóstico")
+        self.sidebar.item(DIAGNOSTICS_ROW).setHidden(True)
         self.sidebar.currentRowChanged.connect(self.display)
         
         # Ajustando tamanho fixo para a barra lateral
@@ -80,24 +123,14 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.setup_home_widget()
 
-        # Widgets dos modulos
-        self.animals_widget = AnimalListWidget()
-        self.adoptions_widget = AdoptionListWidget()
-        self.adopters_widget = AdopterListWidget()
-        self.volunteers_widget = VolunteerListWidget()
-        self.donations_widget = DonationsListWidget()
-        self.analytics_widget = AnalyticsWidget()
-        self.reports_widget = ReportWidget()
-
-        # Widgets em pilha
-        self.stack.addWidget(self.home_container)      # Index 0
-        self.stack.addWidget(self.animals_widget)      # Index 1
-        self.stack.addWidget(self.adopters_widget)     # Index 2
-        self.stack.addWidget(self.volunteers_widget)   # Index 3
-        self.stack.addWidget(self.adoptions_widget)    # Index 4
-        self.stack.addWidget(self.donations_widget)    # Index 5
-        self.stack.addWidget(self.analytics_widget)    # Index 6
-        self.stack.addWidget(self.reports_widget)      # Index 7
+        # Widgets dos modulos: criados sob demanda por module_widget()
+        for attribute, *_ in MODULE_WIDGETS.values():
+            setattr(self, attribute, None)
+        self.diagnostics_widget = None
+        QShortcut(QKeySequence(DIAGNOSTICS_SHORTCUT), self, self.show_diagnostics)
+
+        # Widgets em pilha; os dos módulos entram na pilha quando são criados
+        self.stack.addWidget(self.home_container)
 
         # Ajustando tamanho dos elementos
         main_layout.addWidget(self.sidebar)
@@ -141,36 +174,131 @@ class MainWindow(QMainWindow):
         self.home_container = QWidget()
         self.home_container.setLayout(home_layout)
 
+    def module_widget(self, index):
+        """Retorna o widget do módulo da linha index da barra lateral, criando-o na primeira vez."""
+        attribute, name, module_name, class_name, _ = MODULE_WIDGETS[index]
+        widget = getattr(self, attribute)
+        if widget is None:
+            started = time.perf_counter()
+            factory = getattr(importlib.import_module(module_name), class_name)
+            imported = time.perf_counter()
+            widget = factory()
+            self.stack.addWidget(widget)
+            setattr(self, attribute, widget)
+            self.timings[f"{name} (import)"] = imported - started
+            self.timings[name] = time.perf_counter() - imported
+        return widget
+
+    def loaded_module_widgets(self):
+        """[(nome, widget)] dos módulos já criados, na ordem da barra lateral."""
+        widgets = []
+        for attribute, name, *_ in MODULE_WIDGETS.values():
+            if getattr(self, attribute) is not None:
+                widgets.append((name, getattr(self, attribute)))
+        return widgets
+
+    def show_diagnostics(self):
+        """Mostra a linha de diagnóstico na barra lateral e abre a tela."""
+        self.sidebar.item(DIAGNOSTICS_ROW).setHidden(False)
+        self.sidebar.setCurrentRow(DIAGNOSTICS_ROW)
+
     def display(self, index):
         if index == 0:
             self.stack.setCurrentWidget(self.home_container)
-        elif index == 2:
-            self.stack.setCurrentWidget(self.animals_widget)
-            self.animals_widget.load_data()
-        elif index == 3:
-            self.stack.setCurrentWidget(self.adopters_widget)
-            self.adopters_widget.load_data()
-        elif index == 4:
-            self.stack.setCurrentWidget(self.volunteers_widget)
-            self.volunteers_widget.load_data()
-        elif index == 6:
-            self.stack.setCurrentWidget(self.adoptions_widget)
-            self.adoptions_widget.load_data()
-        elif index == 7:
-            self.stack.setCurrentWidget(self.donations_widget)
-            self.donations_widget.load_data()
-        elif index == 8:
-            self.stack.setCurrentWidget(self.analytics_widget)
-        elif index == 9:
-            self.stack.setCurrentWidget(self.reports_widget)
+        elif index == DIAGNOSTICS_ROW:
+            if self.diagnostics_widget is None:
+                from diagnostics_module import DiagnosticsWidget
+                self.diagnostics_widget = DiagnosticsWidget(self.loaded_module_widgets)
+                self.stack.addWidget(self.diagnostics_widget)
+            self.stack.setCurrentWidget(self.diagnostics_widget)
+        elif index in MODULE_WIDGETS:
+            widget = self.module_widget(index)
+            self.stack.setCurrentWidget(widget)
+            if MODULE_WIDGETS[index][4]:
+                # Só consulta o banco se os dados mudaram desde a última vez que a tela foi exibida
+                widget.refresh_if_stale()
         else:
             pass
 
+    def start_prewarm(self):
+        """Cria os widgets ainda não usados em segundo plano, um por vez, quando a interface está ociosa."""
+        self.prewarm_queue = list(MODULE_WIDGETS)
+        # Acompanha o uso de mouse e teclado em todas as janelas enquanto houver widgets na fila
+        QApplication.instance().installEventFilter(self)
+        QTimer.singleShot(PREWARM_DELAY_MS, self.prewarm_next)
+
+    def eventFilter(self, watched, event):
+        if event.type() in USER_INPUT_EVENTS:
+            self.last_input = time.perf_counter()
+        return super().eventFilter(watched, event)
+
+    def prewarm_next(self):
+        idle_ms = (time.perf_counter() - self.last_input) * 1000
+        if idle_ms < PREWARM_IDLE_MS:
+            # Usuário interagindo: espera a interface ficar ociosa
+            QTimer.singleShot(int(PREWARM_IDLE_MS - idle_ms) + 1, self.prewarm_next)
+            return
+        while self.prewarm_queue:
+            index = self.prewarm_queue.pop(0)
+            if getattr(self, MODULE_WIDGETS[index][0]) is None:
+                self.module_widget(index)
+                break
+        if self.prewarm_queue:
+            QTimer.singleShot(PREWARM_INTERVAL_MS, self.prewarm_next)
+        else:
+            QApplication.instance().removeEventFilter(self)
+
+    def format_timings(self):
+        lines = [f"{name:<30} {seconds * 1000:8.1f} ms" for name, seconds in self.timings.items()]
+        return "\n".join(lines)
+
+
+def pop_option(args, name):
+    """Remove "name valor" de args e retorna o valor (None se a opção não foi passada)."""
+    if name not in args:
+        return None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        sys.exit(f"{name} exige um valor")
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
 
 if __name__ == '__main__':
+    # Processos de trabalho (spawn) do executável congelado não devem abrir outra janela
+    multiprocessing.freeze_support()
+
+    # --no-prewarm: não cria as telas dos módulos em segundo plano após abrir a janela
+    prewarm = "--no-prewarm" not in sys.argv
+    app_args = [arg for arg in sys.argv if arg not in ("--profile-startup", "--no-prewarm", "--explain-slow")]
+
+    # Registro de consultas lentas: --slow-query-ms N (padrão 100), --slow-query-log arquivo
+    # e --explain-slow para gravar também o plano de cada consulta lenta
+    slow_query_ms = pop_option(app_args, "--slow-query-ms")
+    if slow_query_ms is not None:
+        query_log.slow_threshold = float(slow_query_ms) / 1000
+    query_log.slow_log_path = pop_option(app_args, "--slow-query-log")
+    query_log.explain_slow = "--explain-slow" in sys.argv
+
+    timings = {"Imports": time.perf_counter() - STARTED}
+    started = time.perf_counter()
     create_tables()  # Garante que o banco de dados esteja configurado
-    app = QApplication(sys.argv)
+    timings["Banco de dados"] = time.perf_counter() - started
+    started = time.perf_counter()
+    app = QApplication(app_args)
     app.setWindowIcon(QIcon("icons/logo_amar.ico"))  # Define o ícone para a barra de tarefas
-    window = MainWindow()
+    app.aboutToQuit.connect(close_pool)  # Fecha as conexões mantidas pelo pool
+    timings["QApplication"] = time.perf_counter() - started
+    window = MainWindow(prewarm=prewarm, timings=timings)
     window.show()
+
+    if PROFILE_STARTUP:
+        def report_first_paint():
+            window.timings["Primeira pintura (total)"] = time.perf_counter() - STARTED
+            print(window.format_timings(), flush=True)
+        QTimer.singleShot(0, report_first_paint)
+        # Os módulos criados no pré-aquecimento aparecem no resumo ao sair
+        app.aboutToQuit.connect(lambda: print(window.format_timings(), flush=True))
+
     sys.exit(app.exec())
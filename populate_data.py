@@ -1,284 +1,415 @@
 import sqlite3
 from faker import Faker
+import multiprocessing
+import os
 import random
-from datetime import datetime, timedelta
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import islice
+import database
+from database import DB_PATH, bulk_load, close_pool, create_tables
 
-def create_connection(db_file='animal_shelter.db'):
+# Linhas por executemany
+BATCH_SIZE = 10000
+
+# Tamanhos nomeados: nome -> (pessoas, animais). Adotantes, voluntários, adoções e doações
+# saem das taxas abaixo (cerca de 0,5 adotante, 0,5 voluntário e 1 doação por pessoa)
+TIERS = {
+    "demo": (500, 300),
+    "1k": (1_000, 600),
+    "100k": (100_000, 60_000),
+    "1m": (1_000_000, 600_000),
+    "10m": (10_000_000, 6_000_000),
+}
+
+# Pessoas (ou animais) por tarefa. Fixo: os dados de uma semente não dependem do número de processos
+CHUNK_SIZE = 5000
+# Blocos enviados e ainda não inseridos, por processo: limita a memória dos resultados à espera
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+ADOPTER_RATE = 0.5
+VOLUNTEER_RATE = 0.5
+ADOPTED_RATE = 0.2
+# Fração das adoções feitas por quem já adotou antes
+REPEAT_ADOPTER_RATE = 0.15
+# Fração dos voluntários que doam; os doadores repetem com cauda longa (DONATION_COUNT_ALPHA)
+DONOR_RATE = 0.6
+DONATION_COUNT_ALPHA = 1.3
+MAX_DONATIONS_PER_VOLUNTEER = 200
+# Valores de doação em Pareto a partir de R$ 10: alfa 1,16 dá a regra 80/20
+DONATION_MIN_AMOUNT = 10
+DONATION_PARETO_ALPHA = 1.16
+DONATION_MAX_AMOUNT = 50_000
+# Peso de cada mês (jan..dez) nas datas de adoção: mais adoções nas férias e no fim de ano
+ADOPTION_MONTH_WEIGHTS = (1.3, 1.1, 0.8, 0.7, 0.7, 0.8, 1.2, 1.0, 0.8, 0.9, 1.1, 1.6)
+
+def create_connection(db_file=DB_PATH):
     """Cria uma conexão com o banco de dados SQLite."""
     conn = sqlite3.connect(db_file)
     return conn
 
-def generate_unique_cpfs(fake, total_cpfs):
-    """
-    Gera um conjunto de CPFs únicos usando a biblioteca Faker.
-    
-    Args:
-        fake (Faker): Instância do Faker.
-        total_cpfs (int): Número total de CPFs a serem gerados.
-        
-    Returns:
-        set: Conjunto de CPFs únicos.
-    """
-    cpfs = set()
-    while len(cpfs) < total_cpfs:
-        cpf = fake.unique.cpf()
-        cpfs.add(cpf)
-    return cpfs
+# Multiplicador da permutação dos CPFs (3^18, invertível módulo 10^9)
+CPF_MULTIPLIER = 387_420_489
+CPF_MODULUS = 1_000_000_000
 
-def generate_persons(conn, fake, total_persons):
+def cpf_from_index(index, seed=0):
     """
-    Gera e insere pessoas na tabela 'persons'.
+    CPF válido e único para a pessoa de número index: o número base é uma permutação de
+    index módulo 10^9 (a multiplicação por 3^18 é invertível), então pessoas geradas em
+    processos diferentes nunca repetem CPF. O índice é o id da pessoa menos 1, e uma nova
+    carga no mesmo banco continua a numeração.
     
     Args:
-        conn (sqlite3.Connection): Conexão com o banco de dados.
-        fake (Faker): Instância do Faker.
-        total_persons (int): Número total de pessoas a serem geradas.
+        index (int): Número da pessoa no conjunto gerado.
+        seed (int): Semente da geração.
         
     Returns:
-        list: Lista de IDs das pessoas inseridas.
+        str: CPF no formato 000.000.000-00.
     """
-    cursor = conn.cursor()
-    cpfs = generate_unique_cpfs(fake, total_persons)
-    person_ids = []
-    
-    for cpf in cpfs:
-        name = fake.name()
-        address = fake.address().replace('\n', ', ')
-        phone = fake.phone_number()
-        birth_date = fake.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d")
-        is_adopter = random.choice([0, 1])
-        is_volunteer = random.choice([0, 1])
-        created_at = fake.date_time_between(start_date='-2y', end_date='now').strftime("%Y-%m-%d %H:%M:%S")
-        
-        cursor.execute('''
-            INSERT INTO persons (name, address, phone, cpf, birth_date, isAdopter, isVolunteer, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (name, address, phone, cpf, birth_date, is_adopter, is_volunteer, created_at))
-        
-        person_ids.append(cursor.lastrowid)
-    
-    conn.commit()
-    return person_ids
+    base = f"{(index * CPF_MULTIPLIER + seed * 1_000_003) % CPF_MODULUS:09d}"
+    digits = [int(d) for d in base]
+    for length in (9, 10):
+        total = sum(d * (length + 1 - i) for i, d in enumerate(digits))
+        digits.append(total * 10 % 11 % 10)
+    number = "".join(map(str, digits))
+    return f"{number[:3]}.{number[3:6]}.{number[6:9]}-{number[9:]}"
+
+def cpf_index(cpf, seed=0):
+    """Inverso de cpf_from_index: o índice que gera cpf com a semente seed, ou None se nenhum gera."""
+    digits = cpf.replace(".", "").replace("-", "") if cpf else ""
+    if len(digits) != 11 or not digits.isdigit():
+        return None
+    index = (int(digits[:9]) - seed * 1_000_003) * pow(CPF_MULTIPLIER, -1, CPF_MODULUS) % CPF_MODULUS
+    return index if cpf_from_index(index, seed) == cpf else None
 
-def generate_adopters(conn, person_ids, fake):
+def find_cpf_collision(cursor, first_index, count, seed=0):
+    """Primeiro CPF já cadastrado que cpf_from_index geraria para os índices
+    [first_index, first_index + count), ou None. Percorre só os CPFs existentes."""
+    cursor.execute("SELECT cpf FROM persons WHERE cpf IS NOT NULL")
+    for (cpf,) in cursor.fetchall():
+        index = cpf_index(cpf, seed)
+        if index is not None and first_index <= index < first_index + count:
+            return cpf
+    return None
+
+def next_id(cursor, table):
+    """Próximo id de uma tabela AUTOINCREMENT. Os geradores numeram as linhas a partir dele,
+    então os ids são conhecidos sem consultar o banco após cada inserção."""
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    row = cursor.fetchone()
+    sequence = row[0] if row else 0
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+    return max(sequence, cursor.fetchone()[0]) + 1
+
+def insert_rows(cursor, table, columns, rows, batch_size=BATCH_SIZE):
     """
-    Gera e insere adotantes na tabela 'adopters' para pessoas marcadas como adotantes.
+    Insere as tuplas de rows com executemany, em lotes de batch_size.
     
     Args:
-        conn (sqlite3.Connection): Conexão com o banco de dados.
-        person_ids (list): Lista de IDs das pessoas.
-        fake (Faker): Instância do Faker.
+        cursor (sqlite3.Cursor): Cursor da conexão (normalmente o de bulk_load()).
+        table (str): Tabela de destino.
+        columns (tuple): Colunas, na ordem dos valores das tuplas.
+        rows (iterable): Tuplas de valores; pode ser um gerador.
+        batch_size (int): Linhas por executemany.
         
     Returns:
-        list: Lista de IDs dos adotantes inseridos.
+        int: Número de linhas inseridas.
     """
-    cursor = conn.cursor()
-    adopter_ids = []
-    
-    for person_id in person_ids:
-        # Verificar se a pessoa é um adotante
-        cursor.execute('SELECT isAdopter FROM persons WHERE id = ?', (person_id,))
-        is_adopter = cursor.fetchone()[0]
-        if is_adopter:
-            occupation = fake.job()
-            income = round(random.uniform(1500, 15000), 2)
-            created_at = fake.date_time_between(start_date='-2y', end_date='now').strftime("%Y-%m-%d %H:%M:%S")
-            
-            cursor.execute('''
-                INSERT INTO adopters (person_id, occupation, income, created_at)
-                VALUES (?, ?, ?, ?)
-            ''', (person_id, occupation, income, created_at))
-            
-            adopter_ids.append(cursor.lastrowid)
-    
-    conn.commit()
-    return adopter_ids
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return total
+        cursor.executemany(sql, batch)
+        total += len(batch)
+
+PERSON_COLUMNS = ("id", "name", "address", "phone", "cpf", "birth_date", "isAdopter", "isVolunteer", "created_at")
+ADOPTER_COLUMNS = ("id", "person_id", "occupation", "income", "created_at")
+VOLUNTEER_COLUMNS = ("id", "person_id", "availability", "skills", "experience", "motivation", "created_at")
+ANIMAL_COLUMNS = ("id", "name", "type", "breed", "vaccinated", "neutered", "description", "status", "created_at")
+ADOPTION_COLUMNS = ("id", "adopter_id", "animal_id", "date", "status", "created_at")
+DONATION_COLUMNS = ("id", "volunteer_id", "date", "amount", "created_at")
+
+ANIMAL_TYPES = ['Cachorro', 'Gato']
+ANIMAL_BREEDS = {
+    'Cachorro': ['Labrador', 'Bulldog', 'Poodle', 'Beagle', 'Pastor Alemão'],
+    'Gato': ['Persa', 'Siamês', 'Maine Coon', 'Sphynx', 'Ragdoll']
+}
+
+# Faker do processo, criado uma vez e semeado de novo a cada bloco
+_fake = None
+
+def chunk_random(seed, kind, chunk):
+    """(Faker, random.Random) semeados só por (semente, tipo, bloco), em qualquer processo."""
+    global _fake
+    if _fake is None:
+        _fake = Faker('pt_BR')
+    key = f"{seed}:{kind}:{chunk}"
+    _fake.seed_instance(key)
+    return _fake, random.Random(key)
+
+def random_day(rng, start, days):
+    return start + timedelta(days=rng.randrange(days))
+
+def random_datetime(rng, start, days):
+    moment = datetime.combine(start, datetime.min.time()) + timedelta(seconds=rng.randrange(days * 86400))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+def seasonal_day(rng, start, days, weights=ADOPTION_MONTH_WEIGHTS):
+    """Dia do período sorteado com probabilidade proporcional ao peso do seu mês."""
+    top = max(weights)
+    while True:
+        day = random_day(rng, start, days)
+        if rng.random() * top < weights[day.month - 1]:
+            return day
+
+def donation_amount(rng):
+    return round(min(DONATION_MIN_AMOUNT * rng.paretovariate(DONATION_PARETO_ALPHA), DONATION_MAX_AMOUNT), 2)
+
+def donation_count(rng):
+    """Doações de um voluntário: 0 para quem não doa; entre os doadores, poucos doam muitas vezes."""
+    if rng.random() >= DONOR_RATE:
+        return 0
+    return min(int(rng.paretovariate(DONATION_COUNT_ALPHA)), MAX_DONATIONS_PER_VOLUNTEER)
 
-def generate_volunteers(conn, person_ids, fake):
+def person_chunk(seed, start, days, chunk, first_index, count):
     """
-    Gera e insere voluntários na tabela 'volunteers' para pessoas marcadas como voluntárias.
+    Gera um bloco de pessoas com seus adotantes, voluntários e doações (roda nos processos de trabalho).
+    As linhas não têm id: referências apontam para a posição no bloco e a junção atribui os ids.
     
     Args:
-        conn (sqlite3.Connection): Conexão com o banco de dados.
-        person_ids (list): Lista de IDs das pessoas.
-        fake (Faker): Instância do Faker.
+        seed (int): Semente da geração.
+        start (date): Primeiro dia do período dos dados.
+        days (int): Dias do período.
+        chunk (int): Número do bloco.
+        first_index (int): Número da primeira pessoa do bloco no conjunto (para o CPF).
+        count (int): Pessoas no bloco.
         
     Returns:
-        list: Lista de IDs dos voluntários inseridos.
+        tuple: Listas de pessoas, adotantes (posição da pessoa, ...), voluntários (posição da
+        pessoa, ...) e doações (posição do voluntário, ...).
     """
-    cursor = conn.cursor()
-    volunteer_ids = []
-    
-    for person_id in person_ids:
-        # Verificar se a pessoa é um voluntário
-        cursor.execute('SELECT isVolunteer FROM persons WHERE id = ?', (person_id,))
-        is_volunteer = cursor.fetchone()[0]
+    fake, rng = chunk_random(seed, "persons", chunk)
+    persons, adopters, volunteers, donations = [], [], [], []
+    for position in range(count):
+        is_adopter = int(rng.random() < ADOPTER_RATE)
+        is_volunteer = int(rng.random() < VOLUNTEER_RATE)
+        birth_date = start - timedelta(days=rng.randrange(18 * 365, 80 * 365))
+        persons.append((fake.name(), fake.address().replace('\n', ', '), fake.phone_number(),
+                        cpf_from_index(first_index + position, seed), birth_date.isoformat(),
+                        is_adopter, is_volunteer, random_datetime(rng, start, days)))
+        if is_adopter:
+            adopters.append((position, fake.job(), round(rng.uniform(1500, 15000), 2),
+                             random_datetime(rng, start, days)))
         if is_volunteer:
-            availability = random.choice(['Manhã', 'Tarde', 'Noite', 'Integral'])
-            skills = ", ".join(fake.words(nb=random.randint(1, 5)))
-            experience = fake.text(max_nb_chars=100)
-            motivation = fake.text(max_nb_chars=200)
-            created_at = fake.date_time_between(start_date='-2y', end_date='now').strftime("%Y-%m-%d %H:%M:%S")
-            
-            cursor.execute('''
-                INSERT INTO volunteers (person_id, availability, skills, experience, motivation, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (person_id, availability, skills, experience, motivation, created_at))
-            
-            volunteer_ids.append(cursor.lastrowid)
-    
-    conn.commit()
-    return volunteer_ids
+            volunteers.append((position, rng.choice(['Manhã', 'Tarde', 'Noite', 'Integral']),
+                               ", ".join(fake.words(nb=rng.randint(1, 5))), fake.text(max_nb_chars=100),
+                               fake.text(max_nb_chars=200), random_datetime(rng, start, days)))
+            for _ in range(donation_count(rng)):
+                day = random_day(rng, start, days)
+                donations.append((len(volunteers) - 1, day.isoformat(), donation_amount(rng),
+                                  random_datetime(rng, day, 1)))
+    return persons, adopters, volunteers, donations
 
-def generate_animals(conn, fake, total_animals):
-    """
-    Gera e insere animais na tabela 'animals'.
-    
-    Args:
-        conn (sqlite3.Connection): Conexão com o banco de dados.
-        fake (Faker): Instância do Faker.
-        total_animals (int): Número total de animais a serem gerados.
-        
-    Returns:
-        list: Lista de IDs dos animais inseridos.
-    """
-    cursor = conn.cursor()
-    animal_ids = []
-    types = ['Cachorro', 'Gato']
-    breeds = {
-        'Cachorro': ['Labrador', 'Bulldog', 'Poodle', 'Beagle', 'Pastor Alemão'],
-        'Gato': ['Persa', 'Siamês', 'Maine Coon', 'Sphynx', 'Ragdoll']
-    }
-    
-    for _ in range(total_animals):
-        name = fake.first_name()
-        animal_type = random.choice(types)
-        breed = random.choice(breeds[animal_type])
-        vaccinated = random.choice([True, False])
-        neutered = random.choice([True, False])
-        description = fake.text(max_nb_chars=100)
-        status = random.choices(['Disponível', 'Adotado'], weights=[0.8, 0.2])[0]
-        created_at = fake.date_time_between(start_date='-2y', end_date='now').strftime("%Y-%m-%d %H:%M:%S")
-        
-        cursor.execute('''
-            INSERT INTO animals (name, type, breed, vaccinated, neutered, description, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (name, animal_type, breed, vaccinated, neutered, description, status, created_at))
-        
-        animal_ids.append(cursor.lastrowid)
-    
-    conn.commit()
-    return animal_ids
+def animal_chunk(seed, start, days, chunk, count):
+    """Gera um bloco de animais, sem id (roda nos processos de trabalho)."""
+    fake, rng = chunk_random(seed, "animals", chunk)
+    animals = []
+    for _ in range(count):
+        animal_type = rng.choice(ANIMAL_TYPES)
+        status = 'Adotado' if rng.random() < ADOPTED_RATE else 'Disponível'
+        animals.append((fake.first_name(), animal_type, rng.choice(ANIMAL_BREEDS[animal_type]),
+                        rng.random() < 0.5, rng.random() < 0.5, fake.text(max_nb_chars=100), status,
+                        random_datetime(rng, start, days)))
+    return animals
 
-def generate_adoptions(conn, adopter_ids, animal_ids, fake):
-    """
-    Gera e insere adoções na tabela 'adoptions' para animais adotados.
-    
-    Args:
-        conn (sqlite3.Connection): Conexão com o banco de dados.
-        adopter_ids (list): Lista de IDs dos adotantes.
-        animal_ids (list): Lista de IDs dos animais.
-        fake (Faker): Instância do Faker.
-        
-    Returns:
-        list: Lista de IDs das adoções inseridas.
-    """
-    cursor = conn.cursor()
-    adoption_ids = []
-    
-    # Selecionar apenas animais com status 'Adotado'
-    cursor.execute('SELECT id FROM animals WHERE status = "Adotado"')
-    adopted_animal_ids = [row[0] for row in cursor.fetchall()]
-    
-    for animal_id in adopted_animal_ids:
-        adopter_id = random.choice(adopter_ids) if adopter_ids else None
-        if adopter_id:
-            # Gerar uma data de adoção dentro do período
-            adoption_date = fake.date_between(start_date='-2y', end_date='today').strftime("%Y-%m-%d")
-            created_at = fake.date_time_between(start_date='-2y', end_date='now').strftime("%Y-%m-%d %H:%M:%S")
-            status = 'Concluída'  # Pode ajustar conforme necessidade
-            
-            cursor.execute('''
-                INSERT INTO adoptions (adopter_id, animal_id, date, status, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (adopter_id, animal_id, adoption_date, status, created_at))
-            
-            adoption_ids.append(cursor.lastrowid)
-    
-    conn.commit()
-    return adoption_ids
+def adoption_rows(rng, adopter_ids, adopted_animal_ids, start, days, first_id=1):
+    """Gera as tuplas (ADOPTION_COLUMNS) de uma adoção por animal adotado, com datas sazonais
+    e uma parte dos adotantes repetindo."""
+    if not adopter_ids:
+        return
+    repeat_adopters = []
+    for adoption_id, animal_id in enumerate(adopted_animal_ids, start=first_id):
+        if repeat_adopters and rng.random() < REPEAT_ADOPTER_RATE:
+            adopter_id = rng.choice(repeat_adopters)
+        else:
+            adopter_id = rng.choice(adopter_ids)
+            repeat_adopters.append(adopter_id)
+        day = seasonal_day(rng, start, days)
+        yield (adoption_id, adopter_id, animal_id, day.isoformat(), 'Concluída', random_datetime(rng, day, 1))
+
+def plan_chunks(total):
+    """[(bloco, primeiro índice, quantidade)] cobrindo total itens em blocos de CHUNK_SIZE."""
+    return [(chunk, first, min(CHUNK_SIZE, total - first))
+            for chunk, first in enumerate(range(0, total, CHUNK_SIZE))]
 
-def generate_donations(conn, volunteer_ids, fake, max_donations_per_volunteer=5):
+def bounded_map(executor, function, *iterables, window, in_flight=None):
+    """executor.map com resultados em ordem, mas com no máximo window blocos enviados e ainda
+    não entregues: o próximo só é enviado quando um resultado é consumido, e o future
+    entregue é esquecido. in_flight (deque) recebe os futures pendentes, para cancelá-los."""
+    in_flight = deque() if in_flight is None else in_flight
+    for args in zip(*iterables):
+        if len(in_flight) >= window:
+            yield in_flight.popleft().result()
+        in_flight.append(executor.submit(function, *args))
+    while in_flight:
+        yield in_flight.popleft().result()
+
+def default_workers():
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+def generate_dataset(conn, total_persons, total_animals, seed=0, workers=1, years=2, progress=None):
     """
-    Gera e insere doações na tabela 'donations' para voluntários.
+    Gera e insere um conjunto completo de dados. Os blocos são gerados em paralelo (o Faker
+    domina o custo) e juntados em ordem neste processo, que atribui os ids e insere tudo
+    numa única carga (bulk_load). A mesma semente produz os mesmos dados com qualquer workers.
     
     Args:
-        conn (sqlite3.Connection): Conexão com o banco de dados.
-        volunteer_ids (list): Lista de IDs dos voluntários.
-        fake (Faker): Instância do Faker.
-        max_donations_per_volunteer (int): Número máximo de doações por voluntário.
+        conn (sqlite3.Connection): Conexão exclusiva com o banco.
+        total_persons (int): Número de pessoas.
+        total_animals (int): Número de animais.
+        seed (int): Semente da geração.
+        workers (int): Processos de geração; 1 gera neste processo.
+        years (int): Anos até hoje cobertos pelas datas.
+        progress (callable): Chamado com (tabela, gerados, total) a cada bloco.
         
     Returns:
-        list: Lista de IDs das doações inseridas.
+        dict: Linhas inseridas por tabela.
     """
+    days = years * 365
+    start = date.today() - timedelta(days=days - 1)
+    counts = dict.fromkeys(("persons", "adopters", "volunteers", "donations", "animals", "adoptions"), 0)
     cursor = conn.cursor()
-    donation_ids = []
-    
-    for volunteer_id in volunteer_ids:
-        # Decidir aleatoriamente quantas doações cada voluntário fará
-        num_donations = random.randint(1, max_donations_per_volunteer)
-        for _ in range(num_donations):
-            donation_date = fake.date_between(start_date='-2y', end_date='today').strftime("%Y-%m-%d")
-            amount = round(random.uniform(10, 1000), 2)
-            created_at = fake.date_time_between(start_date='-2y', end_date='now').strftime("%Y-%m-%d %H:%M:%S")
-            
-            cursor.execute('''
-                INSERT INTO donations (volunteer_id, date, amount, created_at)
-                VALUES (?, ?, ?, ?)
-            ''', (volunteer_id, donation_date, amount, created_at))
-            
-            donation_ids.append(cursor.lastrowid)
-    
-    conn.commit()
-    return donation_ids
+    ids = {table: next_id(cursor, table) for table in counts}
+    # O CPF de cada pessoa vem do seu id: uma nova carga continua a numeração da anterior
+    first_cpf_index = ids["persons"] - 1
+    collision = find_cpf_collision(cursor, first_cpf_index, total_persons, seed)
+    if collision is not None:
+        raise ValueError(f"O CPF {collision} já está cadastrado e seria gerado de novo com a semente {seed}. "
+                         "Use outra semente (--seed).")
+    person_chunks = [(chunk, first_cpf_index + first, count) for chunk, first, count in plan_chunks(total_persons)]
+    animal_chunks = plan_chunks(total_animals)
+    executor = None
+    pending = deque()
+    if workers > 1:
+        # spawn: mesmo comportamento em todas as plataformas, sem herdar o estado do processo principal
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def run(function, *iterables):
+        """map() nos processos de trabalho, com resultados em ordem; sem processos, map() comum."""
+        if executor is None:
+            return map(function, *iterables)
+        return bounded_map(executor, function, *iterables,
+                           window=CHUNKS_IN_FLIGHT_PER_WORKER * workers, in_flight=pending)
+
+    try:
+        with bulk_load(conn) as cursor:
+            first_adopter_id = ids["adopters"]
+            results = run(partial(person_chunk, seed, start, days),
+                          *zip(*person_chunks)) if person_chunks else []
+            for persons, adopters, volunteers, donations in results:
+                person_id, volunteer_id = ids["persons"], ids["volunteers"]
+                counts["persons"] += insert_rows(cursor, 'persons', PERSON_COLUMNS,
+                    ((person_id + i,) + row for i, row in enumerate(persons)))
+                counts["adopters"] += insert_rows(cursor, 'adopters', ADOPTER_COLUMNS,
+                    ((ids["adopters"] + i, person_id + row[0]) + row[1:] for i, row in enumerate(adopters)))
+                counts["volunteers"] += insert_rows(cursor, 'volunteers', VOLUNTEER_COLUMNS,
+                    ((volunteer_id + i, person_id + row[0]) + row[1:] for i, row in enumerate(volunteers)))
+                counts["donations"] += insert_rows(cursor, 'donations', DONATION_COLUMNS,
+                    ((ids["donations"] + i, volunteer_id + row[0]) + row[1:] for i, row in enumerate(donations)))
+                ids["persons"] += len(persons)
+                ids["adopters"] += len(adopters)
+                ids["volunteers"] += len(volunteers)
+                ids["donations"] += len(donations)
+                if progress is not None:
+                    progress("persons", counts["persons"], total_persons)
+
+            adopted_animal_ids = []
+            results = run(partial(animal_chunk, seed, start, days),
+                          *zip(*((chunk, count) for chunk, _, count in animal_chunks))) if animal_chunks else []
+            for animals in results:
+                animal_id = ids["animals"]
+                adopted_animal_ids.extend(animal_id + i for i, row in enumerate(animals) if row[6] == 'Adotado')
+                counts["animals"] += insert_rows(cursor, 'animals', ANIMAL_COLUMNS,
+                    ((animal_id + i,) + row for i, row in enumerate(animals)))
+                ids["animals"] += len(animals)
+                if progress is not None:
+                    progress("animals", counts["animals"], total_animals)
+
+            rng = random.Random(f"{seed}:adoptions")
+            counts["adoptions"] = insert_rows(cursor, 'adoptions', ADOPTION_COLUMNS,
+                adoption_rows(rng, range(first_adopter_id, ids["adopters"]), adopted_animal_ids,
+                              start, days, ids["adoptions"]))
+            if progress is not None:
+                progress("adoptions", counts["adoptions"], len(adopted_animal_ids))
+    finally:
+        if executor is not None:
+            # Num erro, descarta os blocos que ainda não começaram (cancel_futures só existe no Python 3.9)
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+    return counts
+
+TABLE_LABELS = {
+    "persons": "Pessoas",
+    "adopters": "Adotantes",
+    "volunteers": "Voluntários",
+    "animals": "Animais",
+    "adoptions": "Adoções",
+    "donations": "Doações",
+}
 
 def main():
-    fake = Faker('pt_BR')
-    Faker.seed(0)
-    random.seed(0)
-    
-    conn = create_connection()
-    
-    total_persons = 500
-    total_animals = 300
-    
-    print("Gerando e inserindo pessoas...")
-    person_ids = generate_persons(conn, fake, total_persons)
-    
-    print("Gerando e inserindo adotantes...")
-    adopter_ids = generate_adopters(conn, person_ids, fake)
-    
-    print("Gerando e inserindo voluntários...")
-    volunteer_ids = generate_volunteers(conn, person_ids, fake)
-    
-    print("Gerando e inserindo animais...")
-    animal_ids = generate_animals(conn, fake, total_animals)
-    
-    print("Gerando e inserindo adoções...")
-    adoption_ids = generate_adoptions(conn, adopter_ids, animal_ids, fake)
-    
-    print("Gerando e inserindo doações...")
-    donation_ids = generate_donations(conn, volunteer_ids, fake)
-    
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos para o banco do abrigo.")
+    parser.add_argument("--tier", choices=TIERS, default="demo",
+                        help="tamanho do conjunto: " + ", ".join(f"{name} ({persons} pessoas, {animals} animais)"
+                                                             for name, (persons, animals) in TIERS.items()))
+    parser.add_argument("--persons", type=int, help="número de pessoas (substitui o da faixa)")
+    parser.add_argument("--animals", type=int, help="número de animais (substitui o da faixa)")
+    parser.add_argument("--seed", type=int, default=0, help="semente; a mesma semente gera os mesmos dados")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="processos de geração")
+    parser.add_argument("--years", type=int, default=2, help="anos até hoje cobertos pelas datas")
+    parser.add_argument("--database", default=DB_PATH, help="arquivo do banco de dados (criado se não existir)")
+    args = parser.parse_args()
+
+    total_persons, total_animals = TIERS[args.tier]
+    if args.persons is not None:
+        total_persons = args.persons
+    if args.animals is not None:
+        total_animals = args.animals
+
+    database.set_database_path(args.database)
+    create_tables()  # Garante que o banco de dados esteja configurado
+    close_pool()  # A carga usa uma conexão exclusiva
+    conn = create_connection(args.database)
+
+    def print_progress(table, done, total):
+        print(f"\r{TABLE_LABELS[table]}: {done}/{total}", end="\n" if done == total else "", flush=True)
+
+    print(f"Gerando {total_persons} pessoas e {total_animals} animais com {args.workers} processo(s), semente {args.seed}...")
+    started = time.perf_counter()
+    try:
+        counts = generate_dataset(conn, total_persons, total_animals, args.seed, args.workers, args.years,
+                                  print_progress)
+    except ValueError as e:
+        conn.close()
+        sys.exit(f"Erro: {e}")
+    elapsed = time.perf_counter() - started
     conn.close()
-    
+
     print("Geração de dados concluída com sucesso!")
-    print(f"Total de Pessoas: {total_persons}")
-    print(f"Total de Adotantes: {len(adopter_ids)}")
-    print(f"Total de Voluntários: {len(volunteer_ids)}")
-    print(f"Total de Animais: {total_animals}")
-    print(f"Total de Adoções: {len(adoption_ids)}")
-    print(f"Total de Doações: {len(donation_ids)}")
+    for table, label in TABLE_LABELS.items():
+        print(f"Total de {label}: {counts[table]}")
+    rows = sum(counts.values())
+    print(f"{rows} linhas em {elapsed:.1f} s ({rows / elapsed if elapsed > 0 else 0:.0f} linhas/s)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,160 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from database import create_connection, query_context
+
+
+class QueryTaskSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+    done = pyqtSignal(int)  # Sempre emitido ao fim de run(), inclusive se cancelada
+
+
+class QueryTask(QRunnable):
+    """Executa job(conn) em uma thread do QThreadPool usando uma conexão do pool."""
+
+    def __init__(self, request_id, job, context=None):
+        super().__init__()
+        self.request_id = request_id
+        self.job = job
+        self.context = context
+        self.signals = QueryTaskSignals()
+        self.cancelled = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        try:
+            self.execute()
+        finally:
+            self.signals.done.emit(self.request_id)
+
+    def execute(self):
+        if self.cancelled:
+            return
+        conn = create_connection()
+        with self._lock:
+            self._conn = conn
+        try:
+            with query_context(self.context):
+                result = self.job(conn)
+        except Exception as e:
+            # Consultas interrompidas por cancel() não são erros para a tela
+            if not self.cancelled:
+                self.signals.failed.emit(self.request_id, str(e))
+            return
+        finally:
+            with self._lock:
+                self._conn = None
+            conn.close()
+        if not self.cancelled:
+            self.signals.finished.emit(self.request_id, result)
+
+    def cancel(self):
+        self.cancelled = True
+        with self._lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+class QueryRunner(QObject):
+    """Envia consultas para fora da thread da interface.
+
+    Cada submit() substitui o pedido anterior: a consulta antiga é interrompida e o
+    resultado dela, se chegar, é descartado. Com asynchronous=False o job roda na hora,
+    na própria thread (útil para scripts e medições sem laço de eventos)."""
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, thread_pool=None, asynchronous=True):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.asynchronous = asynchronous
+        # Nome registrado junto das consultas no database.query_log (a classe da tela dona)
+        self.context = type(parent).__name__ if parent is not None else None
+        self.request_id = 0
+        self.current = None  # (task, on_result, on_error)
+        self._tasks = {}  # Tarefas ainda no QThreadPool, inclusive as canceladas
+
+    def submit(self, job, on_result, on_error=None):
+        self.cancel()
+        self.request_id += 1
+
+        if not self.asynchronous:
+            conn = create_connection()
+            try:
+                with query_context(self.context):
+                    result = job(conn)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(str(e))
+                return
+            finally:
+                conn.close()
+            on_result(result)
+            return
+
+        task = QueryTask(self.request_id, job, self.context)
+        task.signals.finished.connect(self._finished)
+        task.signals.failed.connect(self._failed)
+        task.signals.done.connect(self._done)
+        self._tasks[task.request_id] = task
+        self.current = (task, on_result, on_error)
+        self.busy_changed.emit(True)
+        self.thread_pool.start(task)
+
+    def cancel(self):
+        if self.current is not None:
+            self.current[0].cancel()
+            self.current = None
+            self.busy_changed.emit(False)
+
+    def is_busy(self):
+        return self.current is not None
+
+    def _take(self, request_id):
+        if self.current is None or self.current[0].request_id != request_id:
+            return None  # Pedido substituído por outro mais recente
+        current, self.current = self.current, None
+        self.busy_changed.emit(False)
+        return current
+
+    def _finished(self, request_id, result):
+        current = self._take(request_id)
+        if current is not None:
+            current[1](result)
+
+    def _failed(self, request_id, message):
+        current = self._take(request_id)
+        if current is not None and current[2] is not None:
+            current[2](message)
+
+    def _done(self, request_id):
+        self._tasks.pop(request_id, None)
+
+
+def fetch_all(query, params=()):
+    """Cria um job que executa a consulta e retorna todas as linhas."""
+    def job(conn):
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    return job
+
+
+def fetch_one(query, params=()):
+    """Cria um job que executa a consulta e retorna a primeira linha."""
+    def job(conn):
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchone()
+    return job
+
+
+def fetch_count(query, params=()):
+    """Cria um job para consultas COUNT(*): retorna o primeiro valor da primeira linha."""
+    def job(conn):
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchone()[0]
+    return job
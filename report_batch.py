@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from database import create_read_only_connection, database_path
+from report_engine import build_report
+from report_export import export_report_pdf
+
+# Conexão somente leitura de cada processo de trabalho, aberta pelo inicializador
+_worker_conn = None
+
+
+def month_periods(first_month, last_month):
+    """[(início, fim)] de cada mês entre first_month e last_month ('YYYY-MM'), inclusive."""
+    day = date.fromisoformat(first_month + "-01")
+    last = date.fromisoformat(last_month + "-01")
+    periods = []
+    while day <= last:
+        next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        periods.append((day.isoformat(), (next_month - timedelta(days=1)).isoformat()))
+        day = next_month
+    return periods
+
+
+def report_filename(output_dir, start, end):
+    return os.path.join(output_dir, f"relatorio_{start}_{end}.pdf")
+
+
+def _init_worker(database):
+    global _worker_conn
+    _worker_conn = create_read_only_connection(database)
+
+
+def _render_period(start, end, output_dir, detailed):
+    result = build_report(_worker_conn.cursor(), start, end)
+    return export_report_pdf(report_filename(output_dir, start, end), result,
+                             _worker_conn if detailed else None)
+
+
+def default_workers():
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def submit_reports(executor, periods, output_dir, detailed=False):
+    """Envia um job por período ao executor. Retorna {future: (início, fim)}."""
+    return {executor.submit(_render_period, start, end, output_dir, detailed): (start, end)
+            for start, end in periods}
+
+
+def create_executor(workers=None, database=None):
+    """Pool de processos com uma conexão somente leitura em cada um. Sem database, usa o
+    banco em uso agora; o caminho vai explícito porque os processos não herdam set_database_path."""
+    # spawn: os processos não herdam threads nem o estado do Qt do processo principal
+    if database is None:
+        database = database_path()
+    return ProcessPoolExecutor(max_workers=workers or default_workers(),
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker, initargs=(database,))
+
+
+def generate_reports(periods, output_dir, workers=None, detailed=False, database=None, progress=None):
+    """Gera um PDF por período em paralelo. progress(concluídos, total, período, caminho ou erro)
+    é chamado a cada relatório terminado. Retorna ([caminhos], [(período, erro)], segundos)."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    errors = []
+    started = time.perf_counter()
+    with create_executor(workers, database) as executor:
+        futures = submit_reports(executor, periods, output_dir, detailed)
+        for done, future in enumerate(as_completed(futures), start=1):
+            period = futures[future]
+            try:
+                outcome = future.result()
+                paths.append(outcome)
+            except Exception as e:
+                outcome = str(e)
+                errors.append((period, outcome))
+            if progress is not None:
+                progress(done, len(futures), period, outcome)
+    return paths, errors, time.perf_counter() - started
+
+
+def throughput(count, elapsed):
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    from database import create_tables
+
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Gera relatórios mensais em PDF para vários meses em paralelo.")
+    parser.add_argument("--from", dest="first_month", default=f"{today.year}-01",
+                        help="primeiro mês, no formato YYYY-MM (padrão: janeiro do ano atual)")
+    parser.add_argument("--to", dest="last_month", default=today.strftime("%Y-%m"),
+                        help="último mês, no formato YYYY-MM (padrão: mês atual)")
+    parser.add_argument("--output", default="relatorios", help="pasta de destino dos PDFs")
+    parser.add_argument("--workers", type=int, default=None, help="número de processos")
+    parser.add_argument("--detailed", action="store_true", help="inclui a lista de adoções e doações")
+    parser.add_argument("--database", default=database_path(), help="arquivo do banco de dados")
+    args = parser.parse_args()
+
+    try:
+        periods = month_periods(args.first_month, args.last_month)
+    except ValueError:
+        parser.error("Meses devem estar no formato YYYY-MM.")
+    if not periods:
+        parser.error("O mês final deve ser maior ou igual ao mês inicial.")
+
+    if args.database == database_path():
+        create_tables()  # Garante que o banco de dados esteja configurado
+
+    def print_progress(done, total, period, outcome):
+        print(f"[{done}/{total}] {period[0]} a {period[1]}: {outcome}")
+
+    paths, errors, elapsed = generate_reports(periods, args.output, args.workers, args.detailed,
+                                              args.database, print_progress)
+    print(f"{len(paths)} relatórios em {elapsed:.1f} s ({throughput(len(paths), elapsed):.1f} relatórios/s)")
+    if errors:
+        print(f"{len(errors)} relatórios com erro.")
+        sys.exit(1)
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+from database import ROLLUP_SOURCES, split_period
+
+# Métricas do período, na ordem em que aparecem no relatório
+PERIOD_METRICS = ("animals", "adoptions", "donations", "adopters", "volunteers")
+
+
+class ReportResult:
+    """Totais do relatório de um período. É a única fonte para o texto da tela e para as exportações."""
+
+    def __init__(self, start, end, available_animals=0, added_animals=0, adoptions=0,
+                 donations_total=0.0, new_adopters=0, new_volunteers=0):
+        self.start = start
+        self.end = end
+        self.available_animals = available_animals
+        self.added_animals = added_animals
+        self.adoptions = adoptions
+        self.donations_total = donations_total
+        self.new_adopters = new_adopters
+        self.new_volunteers = new_volunteers
+
+    def __eq__(self, other):
+        return isinstance(other, ReportResult) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"ReportResult({', '.join(f'{k}={v!r}' for k, v in vars(self).items())})"
+
+    @property
+    def days(self):
+        return (date.fromisoformat(self.end) - date.fromisoformat(self.start)).days + 1
+
+    @property
+    def donations_daily_average(self):
+        return self.donations_total / self.days if self.days > 0 else 0.0
+
+    def period_label(self):
+        return f"Período: {self.start} a {self.end}"
+
+    def rows(self):
+        """[(descrição, valor formatado)] na ordem do relatório."""
+        return [
+            ("1. Total de Animais Disponíveis", str(self.available_animals)),
+            ("2. Total de Animais Adicionados", str(self.added_animals)),
+            ("3. Total de Adoções Realizadas", str(self.adoptions)),
+            ("4. Doações Recebidas", f"R$ {self.donations_total:.2f}"),
+            ("5. Novos Adotantes", str(self.new_adopters)),
+            ("6. Novos Voluntários", str(self.new_volunteers)),
+            ("7. Doações Médias/Dia", f"R$ {self.donations_daily_average:.2f}"),
+        ]
+
+    def to_text(self):
+        lines = [self.period_label(), ""]
+        lines += [f"{description}: {value}" for description, value in self.rows()]
+        return "\n".join(lines) + "\n"
+
+
+def build_report(cursor, start, end):
+    """Calcula o relatório de [start, end] (datas 'YYYY-MM-DD') com duas consultas: uma sobre
+    monthly_rollups para os meses inteiros e uma sobre as tabelas de origem, só com intervalos
+    sobre colunas indexadas, para os dias das pontas."""
+    if date.fromisoformat(end) < date.fromisoformat(start):
+        raise ValueError("A data final deve ser maior ou igual à data inicial.")
+
+    months, edges = split_period(start, end)
+    stop = date.fromisoformat(end) + timedelta(days=1)  # exclusivo
+    # Os disponíveis são cumulativos: agregados antes deste mês + dias do mês final
+    boundary = stop.replace(day=1)
+    # counts[métrica] = [quantidade no período, valor no período]
+    counts = {metric: [0, 0.0] for metric in PERIOD_METRICS}
+    available = 0
+
+    # Meses inteiros do período e, para os disponíveis, todos os meses anteriores ao limite.
+    # Em monthly_rollups o status NULL vira ''; como em status != 'Adotado', ele não conta
+    in_period = "0" if months is None else "month >= ?"
+    params = [] if months is None else [months[0]] * 2
+    cursor.execute(f"""
+        SELECT metric,
+               SUM(CASE WHEN {in_period} THEN count ELSE 0 END),
+               SUM(CASE WHEN {in_period} THEN total ELSE 0 END),
+               SUM(CASE WHEN metric = 'animals' AND status NOT IN ('Adotado', '') THEN count ELSE 0 END)
+        FROM monthly_rollups
+        WHERE month < ?
+        GROUP BY metric
+    """, params + [boundary.strftime("%Y-%m")])
+    for metric, count, total, not_adopted in cursor.fetchall():
+        if metric in counts:
+            counts[metric][0] += count
+            counts[metric][1] += total
+        available += not_adopted
+
+    # Dias das pontas: um braço por tabela, todos no mesmo comando
+    if edges:
+        arms = []
+        arm_params = []
+        edge_params = [value for edge in edges for value in edge]
+        for metric in PERIOD_METRICS:
+            table, date_column, _, status_column, amount_column = ROLLUP_SOURCES[metric]
+            period = " OR ".join(f"({date_column} >= ? AND {date_column} < ?)" for _ in edges)
+            if metric == "animals":
+                # Mesma leitura serve aos adicionados (pontas) e aos disponíveis (mês final)
+                arms.append(f"""
+                    SELECT '{metric}', COALESCE(SUM(CASE WHEN {period} THEN 1 ELSE 0 END), 0), 0,
+                           COALESCE(SUM(CASE WHEN {date_column} >= ? AND {status_column} != 'Adotado' THEN 1 ELSE 0 END), 0)
+                    FROM {table}
+                    WHERE {period} OR ({date_column} >= ? AND {date_column} < ?)
+                """)
+                arm_params += edge_params + [boundary.isoformat()] + edge_params + [boundary.isoformat(), stop.isoformat()]
+            else:
+                amount = f"COALESCE(SUM({amount_column}), 0)" if amount_column else "0"
+                arms.append(f"SELECT '{metric}', COUNT(*), {amount}, 0 FROM {table} WHERE {period}")
+                arm_params += edge_params
+        cursor.execute(" UNION ALL ".join(arms), arm_params)
+        for metric, count, total, not_adopted in cursor.fetchall():
+            counts[metric][0] += count
+            counts[metric][1] += total
+            available += not_adopted
+
+    return ReportResult(
+        start, end,
+        available_animals=available,
+        added_animals=counts["animals"][0],
+        adoptions=counts["adoptions"][0],
+        donations_total=counts["donations"][1],
+        new_adopters=counts["adopters"][0],
+        new_volunteers=counts["volunteers"][0],
+    )
+
+
+class ReportCache:
+    """Cache LRU de ReportResult por período (start, end).
+
+    Cada entrada guarda a geração dos dados em que foi calculada; se a geração atual
+    for outra, a entrada é descartada e o relatório é recalculado."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (start, end) -> (geração, ReportResult)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, start, end, generation):
+        key = (start, end)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, generation, result):
+        key = (result.start, result.end)
+        self._entries[key] = (generation, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def iter_period_adoptions(cursor, start, end):
+    """Adoções de [start, end] em ordem de data: (data, adotante, animal, status). Lê sob demanda."""
+    cursor.execute("""
+        SELECT adoptions.date, persons.name, animals.name, adoptions.status
+        FROM adoptions
+        JOIN adopters ON adoptions.adopter_id = adopters.id
+        JOIN persons ON adopters.person_id = persons.id
+        JOIN animals ON adoptions.animal_id = animals.id
+        WHERE adoptions.date >= ? AND adoptions.date < date(?, '+1 day')
+        ORDER BY adoptions.date, adoptions.id
+    """, (start, end))
+    yield from cursor
+
+
+def iter_period_donations(cursor, start, end):
+    """Doações de [start, end] em ordem de data: (data, voluntário, valor). Lê sob demanda."""
+    cursor.execute("""
+        SELECT donations.date, persons.name, donations.amount
+        FROM donations
+        JOIN volunteers ON donations.volunteer_id = volunteers.id
+        JOIN persons ON volunteers.person_id = persons.id
+        WHERE donations.date >= ? AND donations.date < date(?, '+1 day')
+        ORDER BY donations.date, donations.id
+    """, (start, end))
+    yield from cursor
@@ -0,0 +1,227 @@
+import importlib.util
+import os
+import sys
+import threading
+from report_engine import iter_period_adoptions, iter_period_donations
+
+# Linhas por tabela no relatório detalhado; cada bloco vira um flowable
+DETAIL_CHUNK_ROWS = 50
+
+_pdf_available = None
+_resources = None
+_lock = threading.Lock()
+
+
+def resource_path(relative_path):
+    """Retorna o caminho absoluto para recursos, mesmo no executável."""
+    if hasattr(sys, '_MEIPASS'):  # Atributo adicionado pelo PyInstaller
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def pdf_available():
+    """Indica se o reportlab está instalado, sem importá-lo."""
+    global _pdf_available
+    if _pdf_available is None:
+        _pdf_available = importlib.util.find_spec("reportlab") is not None
+    return _pdf_available
+
+
+class PdfResources:
+    """Estilos e logo do PDF. Montados uma vez e reaproveitados entre as exportações."""
+
+    def __init__(self):
+        from reportlab.platypus import Image, Paragraph, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import cm
+        from reportlab.lib import colors
+        from reportlab import rl_config
+
+        # Streams binários em vez de ASCII85: a codificação em Python puro do logo
+        # dominava o tempo de cada exportação
+        rl_config.useA85 = 0
+
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'TitleStyle',
+            parent=styles['Title'],
+            fontName='Helvetica-Bold',
+            fontSize=20,
+            leading=24,
+            alignment=1,  # center
+            textColor=colors.black
+        )
+        self.subtitle_style = ParagraphStyle(
+            'SubtitleStyle',
+            parent=styles['Normal'],
+            fontName='Helvetica',
+            fontSize=12,
+            textColor=colors.grey,
+            alignment=1
+        )
+        self.section_header_style = ParagraphStyle(
+            'SectionHeader',
+            parent=styles['Heading2'],
+            fontName='Helvetica-Bold',
+            fontSize=14,
+            textColor=colors.black,
+            spaceAfter=10
+        )
+        self.normal_style = styles['Normal']
+
+        self.header_table_style = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),  # Vertically center
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black)
+        ])
+        self.summary_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dfe6f0')),  # Header background
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),  # Align values to right
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ])
+        self.detail_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dfe6f0')),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+        ])
+
+        logo_path = resource_path("icons/logo_amar.png")
+        if os.path.exists(logo_path):
+            self.logo = Image(logo_path, width=3*cm, height=3*cm)
+        else:
+            self.logo = Paragraph("<b>[LOGO]</b>", self.normal_style)
+
+
+def get_resources():
+    global _resources
+    if _resources is None:
+        _resources = PdfResources()
+    return _resources
+
+
+class FlowableStream(list):
+    """Lista de flowables abastecida aos poucos por um iterador.
+
+    O build() do reportlab consome a lista pela frente (len, [0] e del), então só alguns
+    flowables existem ao mesmo tempo: as linhas do banco viram tabelas à medida que as
+    páginas são montadas."""
+
+    def __init__(self, flowables, buffer=4):
+        super().__init__()
+        self._source = iter(flowables)
+        self._buffer = buffer
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._buffer:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+def summary_flowables(result, resources):
+    from reportlab.platypus import Paragraph, Spacer, Table
+    from reportlab.lib.units import cm
+
+    # Logo e título lado a lado
+    header_table = Table([[resources.logo, Paragraph("Relatório de Atividades", resources.title_style)]],
+                         colWidths=[4*cm, None])
+    header_table.setStyle(resources.header_table_style)
+    yield header_table
+    yield Spacer(1, 0.5*cm)
+
+    yield Paragraph(result.period_label(), resources.subtitle_style)
+    yield Spacer(1, 0.5*cm)
+
+    report_table = Table([['Descrição', 'Valor']] + [list(row) for row in result.rows()], colWidths=[10*cm, None])
+    report_table.setStyle(resources.summary_table_style)
+    yield report_table
+    yield Spacer(1, 1*cm)
+
+
+def detail_flowables(title, header, rows, empty_message, resources, col_widths=None):
+    """Seção do relatório detalhado: as linhas são agrupadas em tabelas de DETAIL_CHUNK_ROWS."""
+    from reportlab.platypus import Paragraph, Spacer
+
+    yield Paragraph(title, resources.section_header_style)
+    chunk = []
+    emitted = False
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == DETAIL_CHUNK_ROWS:
+            yield _detail_table(header, chunk, resources, col_widths)
+            chunk = []
+            emitted = True
+    if chunk:
+        yield _detail_table(header, chunk, resources, col_widths)
+    elif not emitted:
+        yield Paragraph(empty_message, resources.normal_style)
+    yield Spacer(1, 12)
+
+
+def _detail_table(header, rows, resources, col_widths):
+    from reportlab.platypus import Table
+
+    table = Table([header] + rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(resources.detail_table_style)
+    return table
+
+
+def report_flowables(result, resources, conn=None):
+    from reportlab.platypus import Paragraph
+
+    yield from summary_flowables(result, resources)
+
+    if conn is not None:
+        from reportlab.lib.units import cm
+
+        adoptions = ([date, adopter, animal, status or ""]
+                     for date, adopter, animal, status in iter_period_adoptions(conn.cursor(), result.start, result.end))
+        yield from detail_flowables("Adoções no Período", ["Data", "Adotante", "Animal", "Status"], adoptions,
+                                    "Nenhuma adoção no período.", resources, [3*cm, 6*cm, 4*cm, 4*cm])
+
+        donations = ([date, volunteer, f"R$ {amount or 0:.2f}"]
+                     for date, volunteer, amount in iter_period_donations(conn.cursor(), result.start, result.end))
+        yield from detail_flowables("Doações no Período", ["Data", "Voluntário", "Valor"], donations,
+                                    "Nenhuma doação no período.", resources, [3*cm, 10*cm, 4*cm])
+
+    yield Paragraph("Este relatório foi gerado automaticamente pelo sistema.", resources.normal_style)
+
+
+def export_report_pdf(filename, result, conn=None):
+    """Gera o PDF do ReportResult em filename. Com conn, inclui a lista de adoções e doações
+    do período, lida do banco à medida que as páginas são montadas. Retorna o caminho absoluto."""
+    from reportlab.platypus import SimpleDocTemplate
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+
+    # Estilos e logo são compartilhados; uma exportação por vez
+    with _lock:
+        resources = get_resources()
+        doc = SimpleDocTemplate(
+            filename,
+            pagesize=A4,
+            rightMargin=2*cm,
+            leftMargin=2*cm,
+            topMargin=2*cm,
+            bottomMargin=2*cm
+        )
+        doc.build(FlowableStream(report_flowables(result, resources, conn)))
+    return os.path.abspath(filename)
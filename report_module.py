@@ -1,30 +1,27 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QDateEdit, QTextEdit, QMessageBox,
-    QGroupBox, QFormLayout
+    QGroupBox, QFormLayout, QCheckBox, QFileDialog, QDialog, QLineEdit, QSpinBox, QProgressBar
 )
-from PyQt6.QtCore import Qt, QDate
-from database import create_connection
+from PyQt6.QtCore import Qt, QDate, pyqtSignal
+from database import data_generation
+from query_worker import QueryRunner
+from report_batch import create_executor, default_workers, month_periods, submit_reports, throughput
+from report_engine import ReportCache, build_report
+from report_export import export_report_pdf, pdf_available
 from datetime import datetime
 import os
-import sys
-
-try:
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import cm
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    
-def resource_path(relative_path):
-    """Retorna o caminho absoluto para recursos, mesmo no executável."""
-    if hasattr(sys, '_MEIPASS'):  # Atributo adicionado pelo PyInstaller
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+import time
 
 class ReportWidget(QWidget):
     def __init__(self):
         super().__init__()
+        # As consultas do relatório rodam fora da thread da interface
+        self.query_runner = QueryRunner(self)
+        self.report_result = None  # ReportResult exibido; fonte do texto e do PDF
+        # Relatórios já calculados, válidos enquanto a geração dos dados não mudar
+        self.report_cache = ReportCache()
+        # Exportações têm um executor próprio para não serem canceladas por um novo relatório
+        self.export_runner = QueryRunner(self)
         self.initUI()
         self.set_styles()
 
@@ -134,6 +131,13 @@ class ReportWidget(QWidget):
         self.export_button.setEnabled(False)
         buttons_layout.addWidget(self.export_button)
 
+        self.detailed_checkbox = QCheckBox("Incluir adoções e doações")
+        buttons_layout.addWidget(self.detailed_checkbox)
+
+        self.batch_button = QPushButton("Gerar em Lote...")
+        self.batch_button.clicked.connect(self.open_batch_dialog)
+        buttons_layout.addWidget(self.batch_button)
+
         main_layout.addLayout(buttons_layout)
 
         # Report text display
@@ -174,214 +178,214 @@ class ReportWidget(QWidget):
             QMessageBox.warning(self, "Erro", "A data final deve ser maior ou igual à data inicial.")
             return
 
-        conn = create_connection()
-        cursor = conn.cursor()
-
-        # Total animais disponíveis no final do período
-        cursor.execute('''
-            SELECT COUNT(*) FROM animals
-            WHERE DATE(created_at) <= DATE(?) AND status != 'Adotado'
-        ''', (end,))
-        total_animais_disponiveis = cursor.fetchone()[0]
-
-        # Total animais adicionados
-        cursor.execute('''
-            SELECT COUNT(*) FROM animals
-            WHERE DATE(created_at) BETWEEN DATE(?) AND DATE(?)
-        ''', (start, end))
-        total_animais_adicionados = cursor.fetchone()[0]
-
-        # Adoções realizadas
-        cursor.execute('''
-            SELECT COUNT(*) FROM adoptions
-            WHERE DATE(date) BETWEEN DATE(?) AND DATE(?)
-        ''', (start, end))
-        total_adocoes = cursor.fetchone()[0]
-
-        # Doações recebidas
-        cursor.execute('''
-            SELECT SUM(amount) FROM donations
-            WHERE DATE(date) BETWEEN DATE(?) AND DATE(?)
-        ''', (start, end))
-        doacoes_sum = cursor.fetchone()[0]
-        if doacoes_sum is None:
-            doacoes_sum = 0.0
-
-        # Novos adotantes
-        cursor.execute('''
-            SELECT COUNT(*) FROM adopters
-            WHERE DATE(created_at) BETWEEN DATE(?) AND DATE(?)
-        ''', (start, end))
-        novos_adotantes = cursor.fetchone()[0]
-
-        # Novos voluntários
-        cursor.execute('''
-            SELECT COUNT(*) FROM volunteers
-            WHERE DATE(created_at) BETWEEN DATE(?) AND DATE(?)
-        ''', (start, end))
-        novos_voluntarios = cursor.fetchone()[0]
-
-        # Média diária de doações
-        dias = (end_dt - start_dt).days + 1
-        doacoes_media_diaria = doacoes_sum / dias if dias > 0 else 0.0
-
-        conn.close()
-
-        report_str = f"Período: {start} a {end}\n\n"
-        report_str += f"1. Total de Animais Disponíveis: {total_animais_disponiveis}\n"
-        report_str += f"2. Total de Animais Adicionados: {total_animais_adicionados}\n"
-        report_str += f"3. Total de Adoções Realizadas: {total_adocoes}\n"
-        report_str += f"4. Doações Recebidas: R$ {doacoes_sum:.2f}\n"
-        report_str += f"5. Novos Adotantes: {novos_adotantes}\n"
-        report_str += f"6. Novos Voluntários: {novos_voluntarios}\n"
-        report_str += f"7. Doações Médias/Dia: R$ {doacoes_media_diaria:.2f}\n"
-
-        self.report_text.setText(report_str)
-        self.export_button.setEnabled(True)
+        cached = self.report_cache.get(start, end, data_generation())
+        if cached is not None:
+            self.query_runner.cancel()
+            self.show_report(cached)
+            return
+
+        def job(conn):
+            # A geração é lida antes das consultas: uma escrita concorrente invalida o resultado
+            generation = data_generation()
+            return generation, build_report(conn.cursor(), start, end)
+
+        self.export_button.setEnabled(False)
+        self.report_text.setText("Gerando relatório...")
+        self.query_runner.submit(job, self.on_report_built, self.show_report_error)
+
+    def on_report_built(self, built):
+        generation, result = built
+        self.report_cache.put(generation, result)
+        self.show_report(result)
+
+    def show_report(self, result):
+        self.report_result = result
+        self.report_text.setText(result.to_text())
+        self.export_button.setEnabled(not self.export_runner.is_busy())
+
+    def show_report_error(self, message):
+        self.report_result = None
+        self.report_text.clear()
+        QMessageBox.critical(self, "Erro", f"Erro ao gerar o relatório: {message}")
 
     def export_pdf(self):
-        if not PDF_AVAILABLE:
+        if not pdf_available():
             QMessageBox.warning(self, "Erro", "Biblioteca 'reportlab' não está instalada.")
             return
 
-        report_content = self.report_text.toPlainText().strip()
-        if not report_content:
+        result = self.report_result
+        if result is None:
             QMessageBox.warning(self, "Erro", "Gere o relatório primeiro.")
             return
 
-        filename = "relatorio.pdf"
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Exportar PDF", f"relatorio_{result.start}_{result.end}.pdf", "PDF (*.pdf)")
+        if not filename:
+            return
+        if not filename.lower().endswith(".pdf"):
+            filename += ".pdf"
+
+        detailed = self.detailed_checkbox.isChecked()
+
+        def job(conn):
+            # O relatório detalhado lê adoções e doações do banco enquanto monta as páginas
+            return export_report_pdf(filename, result, conn if detailed else None)
+
+        self.export_button.setEnabled(False)
+        self.export_button.setText("Exportando...")
+        self.export_runner.submit(job, self.on_pdf_exported, self.on_pdf_export_error)
+
+    def on_pdf_exported(self, path):
+        self.reset_export_button()
+        QMessageBox.information(self, "Sucesso", f"Relatório exportado para {path}")
+
+    def on_pdf_export_error(self, message):
+        self.reset_export_button()
+        QMessageBox.critical(self, "Erro", f"Ocorreu um erro ao exportar o PDF: {message}")
+
+    def reset_export_button(self):
+        self.export_button.setText("Exportar PDF")
+        self.export_button.setEnabled(self.report_result is not None)
 
+    def open_batch_dialog(self):
+        if not pdf_available():
+            QMessageBox.warning(self, "Erro", "Biblioteca 'reportlab' não está instalada.")
+            return
+        dialog = BatchReportDialog(self)
+        dialog.exec()
+
+
+class BatchReportDialog(QDialog):
+    """Gera um PDF por mês de um intervalo de meses, em processos paralelos (report_batch)."""
+
+    # Emitido pela thread do executor quando um relatório termina; entregue na thread da interface
+    report_finished = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Relatórios em Lote")
+        self.executor = None
+        self.futures = {}
+        self.done = 0
+        self.errors = []
+        self.started = 0.0
+        self.report_finished.connect(self.on_report_finished)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+        form = QFormLayout()
+
+        today = QDate.currentDate()
+        self.first_month = QDateEdit()
+        self.first_month.setDisplayFormat("MM/yyyy")
+        self.first_month.setDate(QDate(today.year(), 1, 1))
+        form.addRow("Mês Inicial:", self.first_month)
+
+        self.last_month = QDateEdit()
+        self.last_month.setDisplayFormat("MM/yyyy")
+        self.last_month.setDate(today)
+        form.addRow("Mês Final:", self.last_month)
+
+        output_layout = QHBoxLayout()
+        self.output_input = QLineEdit(os.path.abspath("relatorios"))
+        output_layout.addWidget(self.output_input)
+        browse_button = QPushButton("Escolher...")
+        browse_button.clicked.connect(self.choose_output_dir)
+        output_layout.addWidget(browse_button)
+        form.addRow("Pasta de Destino:", output_layout)
+
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_input.setValue(default_workers())
+        form.addRow("Processos:", self.workers_input)
+
+        self.detailed_checkbox = QCheckBox("Incluir adoções e doações")
+        form.addRow("", self.detailed_checkbox)
+        layout.addLayout(form)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        buttons_layout = QHBoxLayout()
+        self.start_button = QPushButton("Gerar")
+        self.start_button.clicked.connect(self.start)
+        buttons_layout.addWidget(self.start_button)
+        self.close_button = QPushButton("Fechar")
+        self.close_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(self.close_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    def choose_output_dir(self):
+        directory = QFileDialog.getExistingDirectory(self, "Pasta de Destino", self.output_input.text())
+        if directory:
+            self.output_input.setText(directory)
+
+    def start(self):
+        periods = month_periods(self.first_month.date().toString("yyyy-MM"),
+                                self.last_month.date().toString("yyyy-MM"))
+        if not periods:
+            QMessageBox.warning(self, "Erro", "O mês final deve ser maior ou igual ao mês inicial.")
+            return
+        output_dir = self.output_input.text().strip()
         try:
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import cm
-            from reportlab.lib import colors
-
-            # Parse the generated report text.
-            # The text format was something like:
-            # Período: yyyy-mm-dd a yyyy-mm-dd
-            # (line by line data)
-            lines = report_content.split("\n")
-            # First line: Period info
-            period_line = lines[0] if lines else "Período Desconhecido"
-            data_lines = lines[2:]  # Skip the blank line and the period line
-
-            # Extracting data in a structured manner:
-            # Expected lines like: "1. Total de Animais Disponíveis: X"
-            # We'll create a table with two columns: Description and Value
-            table_data = []
-            for dl in data_lines:
-                # Each line: "N. <description>: <value>"
-                parts = dl.split(":")
-                if len(parts) == 2:
-                    desc = parts[0].strip()
-                    val = parts[1].strip()
-                    table_data.append([desc, val])
-
-            # Setup document
-            doc = SimpleDocTemplate(
-                filename,
-                pagesize=A4,
-                rightMargin=2*cm,
-                leftMargin=2*cm,
-                topMargin=2*cm,
-                bottomMargin=2*cm
-            )
-
-            # Styles
-            styles = getSampleStyleSheet()
-            # Modify some default styles or add new ones
-            title_style = ParagraphStyle(
-                'TitleStyle',
-                parent=styles['Title'],
-                fontName='Helvetica-Bold',
-                fontSize=20,
-                leading=24,
-                alignment=1,  # center
-                textColor=colors.black
-            )
-
-            subtitle_style = ParagraphStyle(
-                'SubtitleStyle',
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=12,
-                textColor=colors.grey,
-                alignment=1
-            )
-
-            section_header_style = ParagraphStyle(
-                'SectionHeader',
-                parent=styles['Heading2'],
-                fontName='Helvetica-Bold',
-                fontSize=14,
-                textColor=colors.black,
-                spaceAfter=10
-            )
-
-            normal_style = styles['Normal']
-
-            # Build story
-            story = []
-
-            # Logo and title (side by side)
-            logo_path = resource_path("icons/logo_amar.png")  # Ensure this exists
-            if os.path.exists(logo_path):
-                # Adjust width/height to taste
-                logo = Image(logo_path, width=3*cm, height=3*cm)
-            else:
-                logo = Paragraph("<b>[LOGO]</b>", normal_style)
-
-            # We'll place the logo and the title side by side using a table:
-            header_data = [
-                [logo, Paragraph("Relatório de Atividades", title_style)]
-            ]
-            header_table = Table(header_data, colWidths=[4*cm, None])
-            header_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),  # Vertically center
-                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-                ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black)
-            ]))
-            story.append(header_table)
-            story.append(Spacer(1, 0.5*cm))
-
-            # Subtitle (Period)
-            story.append(Paragraph(period_line, subtitle_style))
-            story.append(Spacer(1, 0.5*cm))
-
-            # Section header
-            # story.append(Paragraph("Resumo", section_header_style))
-            # story.append(Spacer(1, 0.2*cm))
-
-            # Create table with data
-            # Add a header row
-            table_header = [['Descrição', 'Valor']]
-            final_table_data = table_header + table_data
-
-            report_table = Table(final_table_data, colWidths=[10*cm, None])
-            report_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#dfe6f0')),  # Header background
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 12),
-                ('GRID', (0,0), (-1, -1), 0.5, colors.grey),
-                ('ALIGN', (1, 1), (1, -1), 'RIGHT'),  # Align values to right
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-            ]))
-            story.append(report_table)
-            story.append(Spacer(1, 1*cm))
-
-            # A concluding paragraph or footer can be added if desired.
-            # For example, we can add a subtle note at the bottom:
-            story.append(Paragraph("Este relatório foi gerado automaticamente pelo sistema.", normal_style))
-
-            # Build the PDF
-            doc.build(story)
-
-            QMessageBox.information(self, "Sucesso", f"Relatório exportado para {os.path.abspath(filename)}")
-
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Ocorreu um erro ao exportar o PDF: {str(e)}")
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível criar a pasta de destino: {e}")
+            return
 
+        self.done = 0
+        self.errors = []
+        self.progress_bar.setRange(0, len(periods))
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Iniciando processos...")
+        self.start_button.setEnabled(False)
+
+        self.started = time.perf_counter()
+        self.executor = create_executor(self.workers_input.value())
+        self.futures = submit_reports(self.executor, periods, output_dir, self.detailed_checkbox.isChecked())
+        for future in self.futures:
+            future.add_done_callback(self.report_finished.emit)
+
+    def on_report_finished(self, future):
+        if future not in self.futures or future.cancelled():
+            return
+        self.done += 1
+        if future.exception() is not None:
+            start, end = self.futures[future]
+            self.errors.append(f"{start} a {end}: {future.exception()}")
+
+        total = len(self.futures)
+        elapsed = time.perf_counter() - self.started
+        self.progress_bar.setValue(self.done)
+        self.status_label.setText(
+            f"{self.done}/{total} relatórios ({throughput(self.done, elapsed):.1f} relatórios/s)")
+
+        if self.done == total:
+            self.shutdown()
+            self.start_button.setEnabled(True)
+            generated = total - len(self.errors)
+            message = (f"{generated} relatórios gerados em {elapsed:.1f} s "
+                       f"({throughput(generated, elapsed):.1f} relatórios/s).")
+            if self.errors:
+                QMessageBox.warning(self, "Relatórios em Lote", message + "\n\nErros:\n" + "\n".join(self.errors))
+            else:
+                QMessageBox.information(self, "Relatórios em Lote", message)
+
+    def shutdown(self):
+        if self.executor is not None:
+            executor, self.executor = self.executor, None
+            # Cancela os que ainda não começaram (shutdown(cancel_futures=True) só existe no Python 3.9)
+            for future in self.futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        self.futures = {}
+
+    def reject(self):
+        # Fechar a janela cancela os relatórios que ainda não começaram
+        self.shutdown()
+        super().reject()
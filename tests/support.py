@@ -0,0 +1,38 @@
+import os
+import shutil
+import tempfile
+import database
+
+
+class TemporaryDatabase:
+    """Banco vazio em um diretório temporário, com as tabelas criadas por create_tables().
+
+    Enquanto estiver aberto, é o banco usado pelo pool (database.set_database_path)."""
+
+    def __init__(self):
+        self.directory = None
+        self.previous_path = None
+        self.path = None
+
+    def __enter__(self):
+        self.directory = tempfile.mkdtemp(prefix="abrigo_teste_")
+        self.path = os.path.join(self.directory, "animal_shelter.db")
+        self.previous_path = database.DB_PATH
+        database.set_database_path(self.path)
+        database.create_tables()
+        return self
+
+    def __exit__(self, *exc_info):
+        database.set_database_path(self.previous_path)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def application():
+    """QApplication do processo (offscreen), para testes que criam widgets."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    global _application
+    _application = QApplication.instance() or QApplication([])
+    return _application
+
+_application = None
@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import unittest
+import database
+from support import TemporaryDatabase
+
+
+class WriteGenerationTest(unittest.TestCase):
+    def setUp(self):
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+        self.conn = database.create_connection()
+        self.addCleanup(self.conn.close)
+
+    def write_generation(self):
+        return database.pool_stats()["write_generation"]
+
+    def test_commit_without_changes_keeps_generation(self):
+        before = self.write_generation()
+        self.conn.execute("SELECT COUNT(*) FROM animals").fetchone()
+        self.conn.commit()
+        self.conn.execute("UPDATE animals SET name = name WHERE id = -1")
+        self.conn.commit()
+        self.assertEqual(self.write_generation(), before)
+
+    def test_commit_with_changes_bumps_generation(self):
+        before = self.write_generation()
+        self.conn.execute("INSERT INTO animals (name, type, breed) VALUES ('Rex', 'Cachorro', 'SRD')")
+        self.conn.commit()
+        self.assertEqual(self.write_generation(), before + 1)
+        # O commit seguinte, sem novas alterações, não conta de novo
+        self.conn.commit()
+        self.assertEqual(self.write_generation(), before + 1)
+
+    def test_generation_seen_by_other_connections(self):
+        generation = database.data_generation()
+        other = database.create_connection()
+        self.addCleanup(other.close)
+        other.execute("DELETE FROM animals")
+        other.commit()
+        self.assertEqual(database.data_generation(), generation)
+        other.execute("INSERT INTO animals (name, type, breed) VALUES ('Mia', 'Gato', 'SRD')")
+        other.commit()
+        self.assertNotEqual(database.data_generation(), generation)
+
+
+class SetDatabasePathTest(unittest.TestCase):
+    def test_schema_facts_follow_the_database_file(self):
+        with TemporaryDatabase() as full:
+            self.assertTrue(database.fts_available())
+            self.assertIn("animals.id", database.not_null_columns())
+            # Banco sem as tabelas FTS5 e com outro esquema
+            bare = os.path.join(full.directory, "sem_fts.db")
+            conn = sqlite3.connect(bare)
+            conn.execute("CREATE TABLE animals (name TEXT NOT NULL)")
+            conn.close()
+            database.set_database_path(bare)
+            self.assertFalse(database.fts_available())
+            self.assertEqual(database.not_null_columns(), {"animals.name"})
+            database.set_database_path(full.path)
+            self.assertTrue(database.fts_available())
+            self.assertIn("animals.id", database.not_null_columns())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import importlib
+import unittest
+import database
+from support import TemporaryDatabase, application
+
+ROWS = 60  # Pouco mais de duas páginas de 25
+
+
+def populate(conn):
+    """Dados com valores repetidos e NULLs nas colunas ordenáveis que aceitam NULL."""
+    cursor = conn.cursor()
+    for i in range(ROWS):
+        cursor.execute(
+            "INSERT INTO animals (name, type, breed, vaccinated, neutered, description, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (f"Animal {i % 7}", "Cachorro" if i % 2 else "Gato", f"Raça {i % 3}",
+             None if i % 4 == 0 else i % 2, None if i % 5 == 0 else 1, None,
+             None if i % 3 == 0 else ("Adotado" if i % 2 else "Disponível"),
+             None if i % 6 == 0 else f"2024-01-{1 + i % 28:02d}"))
+        cursor.execute(
+            "INSERT INTO persons (name, address, phone, cpf, birth_date, isAdopter, isVolunteer, created_at) "
+            "VALUES (?, ?, ?, ?, ?, 1, 1, ?)",
+            (f"Pessoa {i % 9}", None, None if i % 3 == 0 else f"(11) 9000-{i % 10:04d}", f"000.000.{i:03d}-00",
+             None, None if i % 4 == 0 else "2024-02-01"))
+        person_id = cursor.lastrowid
+        cursor.execute("INSERT INTO adopters (person_id, occupation, income, created_at) VALUES (?, ?, ?, ?)",
+                       (person_id, None, None, None if i % 5 == 0 else "2024-02-02"))
+        adopter_id = cursor.lastrowid
+        cursor.execute("INSERT INTO volunteers (person_id, availability, skills, experience, motivation, created_at) "
+                       "VALUES (?, ?, ?, ?, ?, ?)", (person_id, None, None, None, None, "2024-02-03"))
+        volunteer_id = cursor.lastrowid
+        cursor.execute("INSERT INTO adoptions (adopter_id, animal_id, date, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                       (adopter_id, i + 1, None if i % 7 == 0 else f"2024-03-{1 + i % 5:02d}",
+                        None if i % 4 == 1 else "Concluída", None))
+        cursor.execute("INSERT INTO donations (volunteer_id, date, amount, created_at) VALUES (?, ?, ?, ?)",
+                       (volunteer_id, f"2024-04-{1 + i % 3:02d}", None if i % 6 == 1 else float(i % 4), None))
+    conn.commit()
+
+
+class KeysetPaginationTest(unittest.TestCase):
+    """As páginas buscadas pela chave têm de ser as mesmas do LIMIT/OFFSET, inclusive com NULLs."""
+
+    def setUp(self):
+        application()
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+        conn = database.create_connection()
+        populate(conn)
+        conn.close()
+
+    def widgets(self):
+        for module_name, class_name in database.LIST_WIDGETS:
+            widget = getattr(importlib.import_module(module_name), class_name)()
+            for runner in (widget.query_runner, widget.prefetch_runner, widget.count_runner):
+                runner.cancel()
+                runner.asynchronous = False
+            widget.prefetch_pages = False
+            yield widget
+
+    def fetch(self, widget, page, seek=None):
+        widget.current_page = page
+        widget.seek = seek
+        try:
+            query, params = widget.build_record_query(count_only=False)
+        finally:
+            widget.seek = None
+        conn = database.create_connection()
+        records = conn.execute(query, params).fetchall()
+        conn.close()
+        if seek is not None and seek[0] in ("before", "last"):
+            records.reverse()
+        return records
+
+    def test_keyset_pages_match_offset_pages(self):
+        for widget in self.widgets():
+            pages = (ROWS + widget.page_size - 1) // widget.page_size
+            for index, column in widget.get_column_mapping().items():
+                for direction in ("ASC", "DESC"):
+                    with self.subTest(widget=type(widget).__name__, column=column, direction=direction):
+                        widget.order_by_column = column
+                        widget.order_direction = direction
+                        widget.pagination_mode = "offset"
+                        expected = [self.fetch(widget, page) for page in range(pages)]
+                        self.assertEqual(sum(map(len, expected)), ROWS)
+                        widget.pagination_mode = "keyset"
+
+                        # Para frente, a partir da última linha da página anterior
+                        forward = [expected[0]]
+                        for page in range(1, pages):
+                            last = forward[-1][-1]
+                            forward.append(self.fetch(widget, page, ("after", (last[index], last[0]))))
+                        self.assertEqual(forward, expected)
+
+                        # Para trás, a partir da primeira linha da página seguinte
+                        backward = [self.fetch(widget, pages - 1, ("last", ROWS - (pages - 1) * widget.page_size))]
+                        for page in range(pages - 2, -1, -1):
+                            first = backward[0][0]
+                            backward.insert(0, self.fetch(widget, page, ("before", (first[index], first[0]))))
+                        self.assertEqual(backward, expected)
+
+    def test_bounds_are_dropped_when_the_data_changes(self):
+        widget = next(self.widgets())
+        widget.order_by_column = "animals.status"
+        widget.order_direction = "ASC"
+        widget.load_data()
+        widget.go_to_page(2)
+        self.assertEqual(set(widget.page_bounds), {0, 1})
+        # Mesmo total, outros valores: as linhas das duas primeiras páginas vão para o fim
+        conn = database.create_connection()
+        conn.execute("UPDATE animals SET status = 'Zz' WHERE id IN (SELECT id FROM animals ORDER BY status, id LIMIT 50)")
+        conn.commit()
+        conn.close()
+        widget.go_to_page(3)
+        widget.pagination_mode = "offset"
+        self.assertEqual(widget.model.records, self.fetch(widget, 2))
+
+    def test_saving_reloads_once(self):
+        widget = next(self.widgets())
+        widget.load_data()
+        loads = []
+        load_data = widget.load_data
+        widget.load_data = lambda: (loads.append(1), load_data())
+        widget.collect_form_data = lambda: {"name": "Rex", "type": "Cachorro", "breed": "SRD",
+                                            "vaccinated": True, "neutered": False, "description": ""}
+        widget.save_record_action()
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(widget.total_records, ROWS + 1)
+
+    def test_continuous_scroll_reaches_every_row(self):
+        for widget in self.widgets():
+            with self.subTest(widget=type(widget).__name__):
+                widget.page_size = 25
+                # Primeira coluna ordenável que aceita NULL
+                widget.order_by_column = next(column for column in widget.get_column_mapping().values()
+                                              if column not in database.not_null_columns())
+                widget.order_direction = "DESC"
+                widget.pagination_mode = "offset"
+                expected = [row for page in range(3) for row in self.fetch(widget, page)]
+                widget.pagination_mode = "keyset"
+                widget.continuous_scroll = True
+                widget.current_page = 0
+                widget.load_data()
+                while widget.model.canFetchMore():
+                    widget.model.fetchMore()
+                self.assertEqual(widget.model.records, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
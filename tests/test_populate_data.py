@@ -0,0 +1,69 @@
+import sqlite3
+import unittest
+from collections import deque
+from concurrent.futures import Future
+import database
+from populate_data import bounded_map, cpf_from_index, cpf_index, generate_dataset
+from support import TemporaryDatabase
+
+
+class CountingExecutor:
+    """Executor síncrono que conta os blocos enviados."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, function, *args):
+        self.submitted += 1
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+class BoundedMapTest(unittest.TestCase):
+    def test_never_holds_more_than_window_futures(self):
+        executor = CountingExecutor()
+        in_flight = deque()
+        results = []
+        for consumed, value in enumerate(bounded_map(executor, pow, range(20), [2] * 20,
+                                                     window=4, in_flight=in_flight), start=1):
+            results.append(value)
+            # O bloco entregue já saiu da fila; enviados e não entregues nunca passam de window
+            self.assertLessEqual(executor.submitted - consumed, 3)
+            self.assertLessEqual(len(in_flight), 3)
+        self.assertEqual(results, [n ** 2 for n in range(20)])
+        self.assertEqual(len(in_flight), 0)
+
+
+class GenerateDatasetTest(unittest.TestCase):
+    def setUp(self):
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+        database.close_pool()  # A carga usa uma conexão exclusiva
+        self.conn = sqlite3.connect(self.database.path)
+        self.addCleanup(self.conn.close)
+
+    def test_cpf_index_inverts_cpf_from_index(self):
+        for seed in (0, 7):
+            for index in (0, 1, 499, 123_456, 999_999_999):
+                self.assertEqual(cpf_index(cpf_from_index(index, seed), seed), index)
+        self.assertIsNone(cpf_index("123.456.789-00"))
+        self.assertIsNone(cpf_index(None))
+
+    def test_rerun_continues_the_cpf_numbering(self):
+        for _ in range(2):
+            generate_dataset(self.conn, 30, 10, seed=3)
+        total, distinct = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT cpf) FROM persons").fetchone()
+        self.assertEqual((total, distinct), (60, 60))
+
+    def test_cpf_collision_fails_before_loading(self):
+        # Pessoa cadastrada com o CPF que a próxima carga daria ao id 6
+        self.conn.execute("INSERT INTO persons (name, cpf) VALUES ('Maria', ?)", (cpf_from_index(5, 3),))
+        self.conn.commit()
+        with self.assertRaisesRegex(ValueError, "já está cadastrado"):
+            generate_dataset(self.conn, 30, 10, seed=3)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM persons").fetchone()[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sqlite3
+import unittest
+from base_list_widget import QueryBuilder, escape_like, fts_query, like_contains
+
+NAMES = ("Rex", "rex_2", "100% vira-lata", "10 vira-lata", "C:\\abrigo", "C:abrigo", "Ávila", "ávila", "Mel")
+
+
+class QueryBuilderTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.conn.execute("CREATE TABLE animals (id INTEGER PRIMARY KEY, name TEXT, status TEXT)")
+        self.conn.executemany("INSERT INTO animals (name, status) VALUES (?, ?)",
+                              [(name, None if i % 3 == 0 else "Disponível") for i, name in enumerate(NAMES)])
+
+    def new_query(self):
+        return QueryBuilder("animals.id, animals.name", "animals", ["animals.id", "animals.name", "animals.status"])
+
+    def names(self, query):
+        sql, params = query.build()
+        return [row[1] for row in self.conn.execute(sql, params)]
+
+    def test_like_wildcards_are_literal(self):
+        for term, expected in (("%", ["100% vira-lata"]), ("_", ["rex_2"]), ("\\", ["C:\\abrigo"]),
+                               ("x_", ["rex_2"]), ("0%", ["100% vira-lata"])):
+            with self.subTest(term=term):
+                query = self.new_query().where_like("animals.name", term).order_by("animals.id")
+                self.assertEqual(self.names(query), expected)
+
+    def test_escape_like(self):
+        self.assertEqual(escape_like("a%b_c\\d"), "a\\%b\\_c\\\\d")
+        self.assertEqual(escape_like("texto"), "texto")
+
+    def test_like_contains_matches_sqlite_like(self):
+        for term in ("rex", "REX", "%", "_", "\\", "vira", "ávila", "ÁVILA", "Á", "", "nada"):
+            with self.subTest(term=term):
+                query = self.new_query().where_like("animals.name", term).order_by("animals.id")
+                self.assertEqual([name for name in NAMES if like_contains(name, term)], self.names(query))
+
+    def test_fts_query(self):
+        self.assertEqual(fts_query("gato preto"), '"gato"* "preto"*')
+        self.assertEqual(fts_query('  "vira-lata" '), '"vira"* "lata"*')
+        self.assertIsNone(fts_query(' "*- '))
+
+    def test_fts_query_runs_on_fts5(self):
+        try:
+            self.conn.execute("CREATE VIRTUAL TABLE animals_fts USING fts5(name, tokenize='unicode61 remove_diacritics 2')")
+        except sqlite3.OperationalError:
+            self.skipTest("SQLite sem FTS5")
+        self.conn.execute("INSERT INTO animals_fts (rowid, name) SELECT id, name FROM animals")
+        for text, expected in (("vira", [3, 4]), ("avil", [7, 8]), ('100" vira', [3]), ("OR", [])):
+            with self.subTest(text=text):
+                rows = self.conn.execute("SELECT rowid FROM animals_fts WHERE animals_fts MATCH ? ORDER BY rowid",
+                                         (fts_query(text),))
+                self.assertEqual([row[0] for row in rows], expected)
+
+    def test_unmapped_columns_are_rejected(self):
+        query = self.new_query()
+        with self.assertRaises(ValueError):
+            query.where_equals("animals.description", "x")
+        with self.assertRaises(ValueError):
+            query.where_like("name; DROP TABLE animals", "x")
+        with self.assertRaises(ValueError):
+            query.order_by("animals.created_at")
+        with self.assertRaises(ValueError):
+            query.order_by("animals.name", "ASC; DROP TABLE animals")
+        self.assertEqual(query.conditions, [])
+        self.assertEqual(query.order, [])
+
+    def test_values_are_parameters(self):
+        value = "'; DROP TABLE animals; --"
+        sql, params = self.new_query().where_equals("animals.name", value).build()
+        self.assertNotIn(value, sql)
+        self.assertEqual(params, [value])
+        self.assertEqual(self.conn.execute(sql, params).fetchall(), [])
+
+    def test_count_limit(self):
+        query = self.new_query().where("animals.id > ?", 2)
+        self.assertEqual(self.conn.execute(*query.build(count_only=True)).fetchone()[0], len(NAMES) - 2)
+        query.count_limit = 3
+        sql, params = query.build(count_only=True)
+        self.assertIn("LIMIT ?", sql)
+        self.assertEqual(params, [2, 3])
+        self.assertEqual(self.conn.execute(sql, params).fetchone()[0], 3)
+        query.count_limit = 100
+        self.assertEqual(self.conn.execute(*query.build(count_only=True)).fetchone()[0], len(NAMES) - 2)
+
+    def test_count_ignores_order_and_limit(self):
+        query = self.new_query().order_by("animals.name", "DESC").limit(2, 4)
+        sql, params = query.build(count_only=True)
+        self.assertNotIn("ORDER BY", sql)
+        self.assertEqual(params, [])
+        self.assertEqual(self.names(query), [row[0] for row in self.conn.execute(
+            "SELECT name FROM animals ORDER BY name DESC LIMIT 2 OFFSET 4")])
+
+    def test_seek_continuation_follows_the_seek_rows(self):
+        # Ordem decrescente por status: valores menores que 'Disponível' e, depois, os NULLs
+        query = self.new_query().order_by("animals.status", "DESC").order_by("animals.id", "DESC").limit(4)
+        query.seek("(animals.status, animals.id) < (?, ?)", ["Disponível", 3], ("animals.status IS NULL", []))
+        self.assertEqual([row[0] for row in self.conn.execute(*query.build())], [2, 7, 4, 1])
+        # A contagem ignora a busca pela chave
+        self.assertEqual(self.conn.execute(*query.build(count_only=True)).fetchone()[0], len(NAMES))
+
+
+if __name__ == "__main__":
+    unittest.main()
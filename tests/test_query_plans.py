@@ -0,0 +1,41 @@
+import unittest
+import database
+from support import TemporaryDatabase, application
+
+
+class QueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+
+    def test_subquery_blocks_have_their_own_outer_loop(self):
+        plan = [(2, 0, 0, "CO-ROUTINE (subquery-1)"), (5, 2, 0, "SCAN animals"),
+                (20, 0, 0, "SCAN (subquery-1)")]
+        self.assertEqual(database.find_table_scans(plan, allow_outer_scan=True), [])
+        self.assertEqual(database.find_table_scans(plan), ["SCAN animals"])
+
+    def test_inner_scan_is_reported(self):
+        plan = [(3, 0, 0, "SCAN adoptions"), (8, 0, 0, "SCAN animals")]
+        self.assertEqual(database.find_table_scans(plan, allow_outer_scan=True), ["SCAN animals"])
+
+    def test_fixed_probes_use_indexes(self):
+        self.assertEqual(database.check_query_plans(), [])
+
+    def test_list_probes_come_from_the_widgets(self):
+        application()
+        probes = database.list_query_plan_probes()
+        titles = {label.split(":")[0] for label, _, _, _ in probes}
+        self.assertEqual(len(titles), len(database.LIST_WIDGETS))
+        from animal_module import AnimalListWidget
+        widget = AnimalListWidget()
+        widget.order_by_column = "animals.name"
+        widget.current_page = 1
+        query, params = widget.build_record_query()
+        # A consulta verificada é a mesma que a listagem executa
+        self.assertIn((query, tuple(params)), {(sql, params) for _, sql, params, _ in probes})
+        self.assertEqual(widget.order_by_column, "animals.name")
+        self.assertEqual(database.check_query_plans(probes), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from support import TemporaryDatabase, application
+from query_worker import QueryRunner, fetch_count
+
+
+def failing_job(conn):
+    raise ValueError("falha no job")
+
+
+class QueryRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+
+    def wait(self, runner):
+        runner.thread_pool.waitForDone()
+        self.app.processEvents()
+
+    def test_cancelled_tasks_are_released(self):
+        runner = QueryRunner()
+        results = []
+        for _ in range(5):
+            runner.submit(fetch_count("SELECT COUNT(*) FROM animals"), results.append)
+        runner.cancel()
+        self.wait(runner)
+        self.assertEqual(runner._tasks, {})
+        self.assertEqual(results, [])
+        self.assertFalse(runner.is_busy())
+
+    def test_finished_task_is_released(self):
+        runner = QueryRunner()
+        results = []
+        runner.submit(fetch_count("SELECT COUNT(*) FROM animals"), results.append)
+        self.wait(runner)
+        self.assertEqual(results, [0])
+        self.assertEqual(runner._tasks, {})
+
+    def test_errors_reach_on_error_in_both_modes(self):
+        for asynchronous in (True, False):
+            with self.subTest(asynchronous=asynchronous):
+                runner = QueryRunner(asynchronous=asynchronous)
+                errors = []
+                runner.submit(failing_job, self.fail, errors.append)
+                self.wait(runner)
+                self.assertEqual(errors, ["falha no job"])
+                self.assertEqual(runner._tasks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import unittest
+import database
+from report_batch import generate_reports, month_periods
+from support import TemporaryDatabase
+
+
+class ReportBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+
+    def test_month_periods(self):
+        self.assertEqual(month_periods("2023-12", "2024-02"),
+                         [("2023-12-01", "2023-12-31"), ("2024-01-01", "2024-01-31"), ("2024-02-01", "2024-02-29")])
+        self.assertEqual(month_periods("2024-03", "2024-02"), [])
+
+    def test_workers_read_the_database_in_use(self):
+        # Sem database explícito, os processos abrem o banco de set_database_path, não o padrão
+        conn = database.create_connection()
+        conn.execute("INSERT INTO donations (volunteer_id, date, amount) VALUES (1, '2024-01-10', 12.5)")
+        conn.commit()
+        conn.close()
+        output_dir = os.path.join(self.database.directory, "relatorios")
+        paths, errors, _ = generate_reports(month_periods("2024-01", "2024-02"), output_dir, workers=1)
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(os.path.basename(path) for path in paths),
+                         ["relatorio_2024-01-01_2024-01-31.pdf", "relatorio_2024-02-01_2024-02-29.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from datetime import date, timedelta
+import database
+from report_engine import build_report
+from support import TemporaryDatabase
+
+# Datas (com e sem hora) nas viradas de mês e de ano
+DAYS = ("2023-12-31", "2024-01-01", "2024-01-15 08:30:00", "2024-01-31 23:59:59", "2024-02-01",
+        "2024-02-29 12:00:00", "2024-03-01", "2024-03-31", "2024-04-01 00:00:00", None)
+
+PERIODS = (("2024-01-01", "2024-03-31"), ("2024-01-15", "2024-03-01"), ("2024-01-31", "2024-02-01"),
+           ("2024-02-01", "2024-02-29"), ("2024-02-10", "2024-02-20"), ("2023-12-31", "2023-12-31"),
+           ("2023-01-01", "2025-12-31"), ("2024-02-29", "2024-04-01"), ("2024-03-31", "2024-03-31"))
+
+
+def original_report(cursor, start, end):
+    """As seis consultas do relatório antes de monthly_rollups, sobre as tabelas de origem."""
+    def value(query, *params):
+        return cursor.execute(query, params).fetchone()[0]
+    donations = value("SELECT SUM(amount) FROM donations WHERE DATE(date) BETWEEN DATE(?) AND DATE(?)", start, end)
+    return {
+        "available_animals": value(
+            "SELECT COUNT(*) FROM animals WHERE DATE(created_at) <= DATE(?) AND status != 'Adotado'", end),
+        "added_animals": value(
+            "SELECT COUNT(*) FROM animals WHERE DATE(created_at) BETWEEN DATE(?) AND DATE(?)", start, end),
+        "adoptions": value("SELECT COUNT(*) FROM adoptions WHERE DATE(date) BETWEEN DATE(?) AND DATE(?)", start, end),
+        "donations_total": donations or 0.0,
+        "new_adopters": value(
+            "SELECT COUNT(*) FROM adopters WHERE DATE(created_at) BETWEEN DATE(?) AND DATE(?)", start, end),
+        "new_volunteers": value(
+            "SELECT COUNT(*) FROM volunteers WHERE DATE(created_at) BETWEEN DATE(?) AND DATE(?)", start, end),
+    }
+
+
+class BuildReportTest(unittest.TestCase):
+    def setUp(self):
+        self.database = TemporaryDatabase().__enter__()
+        self.addCleanup(self.database.__exit__, None, None, None)
+        self.conn = database.create_connection()
+        self.addCleanup(self.conn.close)
+        self.populate(self.conn.cursor())
+
+    def populate(self, cursor):
+        for i, day in enumerate(DAYS * 3):
+            cursor.execute("INSERT INTO animals (name, type, breed, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                           (f"Animal {i}", "Gato", "SRD", ("Disponível", "Adotado", None, "Em tratamento")[i % 4], day))
+            cursor.execute("INSERT INTO adopters (person_id, created_at) VALUES (?, ?)", (i, day))
+            cursor.execute("INSERT INTO volunteers (person_id, created_at) VALUES (?, ?)", (i, day))
+            cursor.execute("INSERT INTO adoptions (adopter_id, animal_id, date, status) VALUES (?, ?, ?, ?)",
+                           (i, i, day, "Concluída"))
+            cursor.execute("INSERT INTO donations (volunteer_id, date, amount) VALUES (?, ?, ?)",
+                           (i, day, None if i % 5 == 0 else 10.5 * i))
+        # Mudanças depois da inserção passam pelos gatilhos de atualização e exclusão
+        cursor.execute("UPDATE animals SET status = 'Adotado' WHERE id % 3 = 0")
+        cursor.execute("UPDATE animals SET created_at = '2024-02-01 09:00:00' WHERE id % 7 = 0")
+        cursor.execute("DELETE FROM donations WHERE id % 6 = 0")
+        self.conn.commit()
+
+    def test_matches_original_queries(self):
+        cursor = self.conn.cursor()
+        for start, end in PERIODS:
+            with self.subTest(start=start, end=end):
+                result = build_report(cursor, start, end)
+                expected = original_report(cursor, start, end)
+                self.assertAlmostEqual(result.donations_total, expected.pop("donations_total"))
+                self.assertEqual({name: getattr(result, name) for name in expected}, expected)
+
+    def test_every_single_day_matches(self):
+        cursor = self.conn.cursor()
+        day = date(2023, 12, 30)
+        while day <= date(2024, 4, 2):
+            with self.subTest(day=day):
+                result = build_report(cursor, day.isoformat(), day.isoformat())
+                expected = original_report(cursor, day.isoformat(), day.isoformat())
+                self.assertAlmostEqual(result.donations_total, expected.pop("donations_total"))
+                self.assertEqual({name: getattr(result, name) for name in expected}, expected)
+            day += timedelta(days=1)
+
+    def test_rejects_inverted_period(self):
+        with self.assertRaises(ValueError):
+            build_report(self.conn.cursor(), "2024-02-01", "2024-01-31")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import sqlite3
+import unittest
+import database
+from database import ROLLUP_SOURCES, rollup_totals, split_period, time_series, time_series_query
+
+# Só as colunas lidas pelos gatilhos de monthly_rollups e table_counts
+SCHEMA = """
+    CREATE TABLE animals (id INTEGER PRIMARY KEY, type TEXT, status TEXT, created_at TEXT);
+    CREATE TABLE persons (id INTEGER PRIMARY KEY, created_at TEXT);
+    CREATE TABLE adopters (id INTEGER PRIMARY KEY, created_at TEXT);
+    CREATE TABLE volunteers (id INTEGER PRIMARY KEY, created_at TEXT);
+    CREATE TABLE adoptions (id INTEGER PRIMARY KEY, date TEXT);
+    CREATE TABLE donations (id INTEGER PRIMARY KEY, date TEXT, amount REAL);
+"""
+
+# Datas nas viradas de mês e de ano, além de vazias e inválidas
+DATES = ("2023-12-31", "2024-01-01", "2024-01-15", "2024-01-31", "2024-02-01", "2024-02-29",
+         "2024-03-01", "2024-03-31", "2024-04-01", None, "data inválida")
+
+PERIODS = ((None, None), ("2024-01-01", "2024-03-31"), ("2024-01-15", "2024-03-01"), ("2024-01-31", "2024-02-01"),
+           ("2024-02-01", "2024-02-29"), ("2024-02-10", "2024-02-20"), (None, "2024-01-31"), ("2024-02-29", None),
+           ("2023-12-31", "2024-01-01"))
+
+
+class RollupTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.cursor = self.conn.cursor()
+        self.cursor.executescript(SCHEMA)
+        database.create_rollups(self.cursor)
+        database.create_table_counts(self.cursor)
+        self.populate()
+
+    def populate(self):
+        cursor = self.cursor
+        for i, day in enumerate(DATES * 3):
+            cursor.execute("INSERT INTO animals (type, status, created_at) VALUES (?, ?, ?)",
+                           (("Gato", "Cachorro", None)[i % 3], ("Disponível", "Adotado", None)[i % 3 - 1], day))
+            cursor.execute("INSERT INTO persons (created_at) VALUES (?)", (day,))
+            cursor.execute("INSERT INTO adopters (created_at) VALUES (?)", (day,))
+            cursor.execute("INSERT INTO volunteers (created_at) VALUES (?)", (day,))
+            cursor.execute("INSERT INTO adoptions (date) VALUES (?)", (day,))
+            cursor.execute("INSERT INTO donations (date, amount) VALUES (?, ?)", (day, None if i % 4 == 0 else i * 2.5))
+
+        # Alterações que mudam a linha de mês, de tipo, de status e de valor, e exclusões
+        cursor.execute("UPDATE animals SET created_at = '2024-02-01' WHERE created_at = '2024-01-31'")
+        cursor.execute("UPDATE animals SET status = 'Adotado' WHERE id % 4 = 0")
+        cursor.execute("UPDATE animals SET type = 'Gato' WHERE type IS NULL AND id % 2 = 0")
+        cursor.execute("UPDATE donations SET amount = amount + 1, date = '2024-03-01' WHERE date = '2024-02-29'")
+        cursor.execute("UPDATE donations SET date = NULL WHERE id % 5 = 0")
+        cursor.execute("UPDATE adoptions SET date = '2024-01-31' WHERE date IS NULL")
+        cursor.execute("UPDATE adopters SET created_at = '2023-12-31' WHERE created_at = '2024-01-01'")
+        for table in ("animals", "persons", "adopters", "volunteers", "adoptions", "donations"):
+            cursor.execute(f"DELETE FROM {table} WHERE id % 7 = 3")
+        cursor.execute("INSERT INTO volunteers (created_at) VALUES ('2024-03-31')")
+        self.conn.commit()
+
+    def expected_totals(self, metric, start, end, group_by, status=None, exclude_status=None):
+        """rollup_totals calculado direto da tabela de origem, com um GROUP BY. Tipo e status
+        NULL contam como '', como em monthly_rollups."""
+        table, date_column, type_column, status_column, amount_column = ROLLUP_SOURCES[metric]
+        key = {"month": f"strftime('%Y-%m-01', {date_column})", "year": f"strftime('%Y-01-01', {date_column})",
+               "type": f"COALESCE({type_column}, '')", None: "NULL"}[group_by]
+        total = f"COALESCE(SUM({amount_column}), 0)" if amount_column else "0"
+        query = f"SELECT {key}, COUNT(*), {total} FROM {table} WHERE strftime('%Y-%m', {date_column}) IS NOT NULL"
+        params = []
+        for operator, value in (("=", status), ("!=", exclude_status)):
+            if value is not None:
+                query += f" AND COALESCE({status_column}, '') {operator} ?"
+                params.append(value)
+        if start:
+            query += f" AND {date_column} >= ?"
+            params.append(start)
+        if end:
+            query += f" AND {date_column} < date(?, '+1 day')"
+            params.append(end)
+        return {row[0]: [row[1], round(row[2], 2)]
+                for row in self.cursor.execute(query + " GROUP BY 1", params) if row[1]}
+
+    def test_split_period(self):
+        self.assertEqual(split_period("2024-01-15", "2024-03-10"),
+                         (("2024-02", "2024-03"), [("2024-01-15", "2024-02-01"), ("2024-03-01", "2024-03-11")]))
+        self.assertEqual(split_period("2024-02-01", "2024-02-29"), (("2024-02", "2024-03"), []))
+        self.assertEqual(split_period("2024-01-31", "2024-02-01"),
+                         (None, [("2024-01-31", "2024-02-02")]))
+        self.assertEqual(split_period("2024-02-10", "2024-02-20"), (None, [("2024-02-10", "2024-02-21")]))
+        self.assertEqual(split_period(None, "2024-01-31"), ((None, "2024-02"), []))
+        self.assertEqual(split_period("2024-12-31", None), (("2025-01", None), [("2024-12-31", "2025-01-01")]))
+        self.assertEqual(split_period(), ((None, None), []))
+
+    def test_triggers_match_source_tables(self):
+        self.assertEqual(database.check_rollups(self.cursor), [])
+        self.assertEqual(database.check_table_counts(self.cursor), [])
+        database.rebuild_rollups(self.cursor)
+        self.assertEqual(database.check_rollups(self.cursor), [])
+
+    def test_rollup_totals_match_group_by(self):
+        for metric in ROLLUP_SOURCES:
+            for start, end in PERIODS:
+                for group_by in (None, "month", "year") + (("type",) if ROLLUP_SOURCES[metric][2] else ()):
+                    with self.subTest(metric=metric, start=start, end=end, group_by=group_by):
+                        totals = rollup_totals(self.cursor, metric, start, end, group_by=group_by)
+                        rounded = {key: [count, round(total, 2)] for key, (count, total) in totals.items()}
+                        self.assertEqual(rounded, self.expected_totals(metric, start, end, group_by))
+
+    def test_status_filters_match_group_by(self):
+        for start, end in PERIODS:
+            for status, exclude_status in (("Adotado", None), ("Disponível", None), (None, "Adotado")):
+                with self.subTest(start=start, end=end, status=status, exclude_status=exclude_status):
+                    totals = rollup_totals(self.cursor, "animals", start, end, group_by="type",
+                                           status=status, exclude_status=exclude_status)
+                    rounded = {key: [count, round(total, 2)] for key, (count, total) in totals.items()}
+                    self.assertEqual(rounded, self.expected_totals("animals", start, end, "type", status, exclude_status))
+
+    def test_time_series_matches_group_by(self):
+        for metric, (table, date_column, _, _, amount_column) in ROLLUP_SOURCES.items():
+            value = f"SUM({amount_column})" if amount_column else "COUNT(*)"
+            for start, end in PERIODS:
+                if (start is None) != (end is None):
+                    continue  # time_series_query só filtra com as duas datas
+                for granularity in ("month", "year"):
+                    with self.subTest(metric=metric, start=start, end=end, granularity=granularity):
+                        query, params = time_series_query(table, date_column, granularity, value, start, end)
+                        expected = [(bucket, total or 0) for bucket, total in self.cursor.execute(query, params)]
+                        self.assertEqual(time_series(self.cursor, metric, granularity, start, end), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
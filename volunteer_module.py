@@ -39,7 +39,7 @@ class VolunteerListWidget(BaseListWidget):
             "    background-color: #d3d3d3;"
             "    color: #a9a9a9;"
             "}"
-            "QTableWidget {"
+            "QTableView {"
             "    gridline-color: transparent;"
             "    background-color: #fffefe;"  # Cor de fundo da tabela
             "    border: 2px solid #eef1f6;"
@@ -122,66 +122,34 @@ class VolunteerListWidget(BaseListWidget):
     def get_column_mapping(self):
         return self.column_mapping_local
 
-    def build_record_query(self, count_only=False):
-        base = "SELECT "
-        if count_only:
-            base += "COUNT(*)"
-        else:
-            base += "volunteers.id, persons.name, persons.phone, persons.cpf, volunteers.created_at"
-        base += " FROM volunteers JOIN persons ON volunteers.person_id = persons.id"
-
-        conditions = []
-        if self.filter_field and self.filter_value:
-            field = self.filter_field
-            value = self.filter_value
-            if field == "volunteers.id":
-                if value.isdigit():
-                    conditions.append("volunteers.id = {}".format(int(value)))
-                else:
-                    conditions.append("CAST(volunteers.id AS TEXT) LIKE '%{}%'".format(value))
-            else:
-                conditions.append(f"{field} LIKE '%{value}%'")
+    def get_text_search_sources(self):
+        # Nome e endereço da pessoa, habilidades e motivação do voluntário
+        return [("persons_fts", "persons.id"), ("volunteers_fts", "volunteers.id")]
 
-        if conditions:
-            base += " WHERE " + " AND ".join(conditions)
+    def get_count_table(self):
+        # Todo voluntário tem sua pessoa (pessoas nunca são excluídas)
+        return "volunteers"
+
+    def build_record_query(self, count_only=False):
+        query = self.new_query(
+            "volunteers.id, persons.name, persons.phone, persons.cpf, volunteers.created_at"
+            # Indica se há doações associadas (habilita/desabilita o Deletar sem consultas por linha)
+            ", EXISTS (SELECT 1 FROM donations WHERE donations.volunteer_id = volunteers.id)",
+            "volunteers JOIN persons ON volunteers.person_id = persons.id")
+        self.apply_search_filter(query)
 
         if not count_only:
             if self.order_by_column is None:
                 self.order_by_column = "volunteers.id"
-            base += f" ORDER BY {self.order_by_column} {self.order_direction}"
-            base += f" LIMIT {self.page_size} OFFSET {self.current_page * self.page_size}"
-
-        return base
-
-    def add_actions_to_row(self, row_idx, row_data):
-        volunteer_id = row_data[0]
-
-        # Botão de Detalhes
-        details_button = QPushButton("Detalhes")
-        details_button.clicked.connect(lambda checked, vid=volunteer_id: self.show_details(vid))
-        self.table.setCellWidget(row_idx, 5, details_button)
-
-        # Botão de Editar
-        edit_button = QPushButton("Editar")
-        edit_button.clicked.connect(lambda checked, vid=volunteer_id: self.edit_record(vid))
-        self.table.setCellWidget(row_idx, 6, edit_button)
-
-        # Botão de Deletar
-        delete_button = QPushButton("Deletar")
-        delete_button.clicked.connect(lambda checked, vid=volunteer_id: self.delete_action(vid))
-        self.table.setCellWidget(row_idx, 7, delete_button)
-
-        # Verificar se o voluntário possui doações associadas
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM donations WHERE volunteer_id = ?', (volunteer_id,))
-        donation_count = cursor.fetchone()[0]
-        conn.close()
+            self.apply_page(query)
 
-        # Desabilitar botão de deletar se houver doações
-        if donation_count > 0:
-            delete_button.setEnabled(False)
+        return query.build(count_only)
 
+    def get_row_actions(self, row_data):
+        # row_data[5] indica se o voluntário possui doações associadas;
+        # se houver, desabilita o botão Deletar
+        has_donations = row_data[5]
+        return [("Detalhes", True), ("Editar", True), ("Deletar", not has_donations)]
 
     def delete_action(self, record_id):
         reply = QMessageBox.question(
@@ -214,7 +182,7 @@ class VolunteerListWidget(BaseListWidget):
 
             conn.commit()
             conn.close()
-            self.load_data()
+            self.records_changed()
 
     def initFormFields(self, form_layout):
         self.person_locked = False
@@ -546,7 +514,6 @@ class VolunteerListWidget(BaseListWidget):
 
         conn.commit()
         conn.close()
-        self.load_data()
         self.stacked_layout.setCurrentWidget(self.table_widget)
 
     def update_record(self, record_id, data):
@@ -583,7 +550,6 @@ class VolunteerListWidget(BaseListWidget):
         conn.commit()
         conn.close()
 
-        self.load_data()
         self.stacked_layout.setCurrentWidget(self.table_widget)
 
     def load_record(self, record_id):